@@ -139,7 +139,8 @@ class StackController(object):
 
         con = req.context
         try:
-            stack_list = self.rpc_client.list_stacks(con)
+            stack_list = self.rpc_client.list_stacks(con,
+                                                     with_parameters=False)
         except Exception as ex:
             return exception.map_remote_error(ex)
 
@@ -93,7 +93,8 @@ class EventController(object):
                                              limit=limit,
                                              marker=marker,
                                              sort_keys=sort_keys,
-                                             sort_dir=sort_dir)
+                                             sort_dir=sort_dir,
+                                             include_rsrc_prop_data=detail)
         keys = None if detail else summary_keys
 
         return [format_event(req, e, keys) for e in events]
@@ -298,9 +298,11 @@ class StackController(object):
         if not filter_params:
             filter_params = None
 
+        # the parameters are not among the keys of a summary listing
         stacks = self.rpc_client.list_stacks(req.context,
                                              filters=filter_params,
                                              tenant_safe=tenant_safe,
+                                             with_parameters=False,
                                              **params)
 
         count = None
@@ -100,7 +100,14 @@ def do_resource_data_list():
 
 def purge_deleted():
     """Remove database records that have been previously soft deleted."""
-    utils.purge_deleted(CONF.command.age, CONF.command.granularity)
+    counts = utils.purge_deleted(CONF.command.age, CONF.command.granularity,
+                                 CONF.command.batch_size,
+                                 CONF.command.sleep)
+
+    print_format = "%-16s %-10s"
+    print(print_format % (_('Table'), _('Deleted')))
+    for table in sorted(counts):
+        print(print_format % (table, counts[table]))
 
 
 def do_crypt_parameters_and_properties():
@@ -135,6 +142,18 @@ def add_command_parsers(subparsers):
         '-g', '--granularity', default='days',
         choices=['days', 'hours', 'minutes', 'seconds'],
         help=_('Granularity to use for age argument, defaults to days.'))
+    # optional parameter, can be skipped. default=0
+    parser.add_argument(
+        '-b', '--batch_size', type=int, default=0,
+        help=_('Number of stacks to purge in each transaction. This counts '
+               'stacks, not rows: each batch also deletes the resources, '
+               'events and other rows of its stacks. Interrupted purges may '
+               'be resumed by running the command again. Defaults to 0, '
+               'which purges all stacks in one batch.'))
+    # optional parameter, can be skipped. default=0
+    parser.add_argument(
+        '--sleep', type=float, default=0,
+        help=_('Seconds to wait between batches, defaults to 0.'))
 
     # update_params parser
     parser = subparsers.add_parser('update_params')
@@ -27,6 +27,30 @@ from heat.common import wsgi
 
 
 LOG = logging.getLogger(__name__)
+
+
+def _resource_type_limits(value):
+    """Parse a list of resource types and their limits.
+
+    Resource type names contain colons, so each entry is split at its last
+    colon rather than its first, as the generic dict option type would.
+    """
+    if isinstance(value, dict):
+        items = value.items()
+    else:
+        items = (entry.strip().rpartition(':')[::2]
+                 for entry in value.split(',') if entry.strip())
+    limits = {}
+    for rsrc_type, limit in items:
+        limit = int(limit)
+        if not rsrc_type or limit < 0:
+            msg = _('Invalid resource type limit "%(type)s:%(limit)s"') % {
+                'type': rsrc_type, 'limit': limit}
+            raise ValueError(msg)
+        limits[rsrc_type] = limit
+    return limits
+
+
 paste_deploy_group = cfg.OptGroup('paste_deploy')
 paste_deploy_opts = [
     cfg.StrOpt('flavor',
@@ -80,6 +104,13 @@ service_opts = [
     cfg.IntOpt('max_template_size',
                default=524288,
                help=_('Maximum raw byte size of any template.')),
+    cfg.IntOpt('template_parse_cache_size',
+               default=64,
+               min=0,
+               help=_('Maximum number of parsed templates to cache in each '
+                      'process, so that the same template (e.g. a nested '
+                      'template used by many stacks) is not parsed '
+                      'repeatedly. Set to 0 to disable the cache.')),
     cfg.IntOpt('max_nested_stack_depth',
                default=5,
                help=_('Maximum depth allowed when using nested stacks.')),
@@ -142,7 +173,9 @@ engine_opts = [
                help=_("Controls how many events will be pruned whenever a "
                       "stack's events exceed max_events_per_stack. Set this "
                       "lower to keep more events at the expense of more "
-                      "frequent purges.")),
+                      "frequent purges. The number of events stored for a "
+                      "stack is checked on average once for every half of "
+                      "this many events created.")),
     cfg.IntOpt('max_events_per_stack',
                default=1000,
                help=_('Maximum events that will be available per stack. Older'
@@ -156,6 +189,29 @@ engine_opts = [
                default=240,
                help=_('Error wait time in seconds for stack action (ie. create'
                       ' or update).')),
+    cfg.IntOpt('max_concurrent_resource_actions',
+               default=0,
+               min=0,
+               help=_('Maximum number of resource actions that each engine '
+                      'process runs at once, across all of the stacks it is '
+                      'acting on without the convergence engine. Further '
+                      'resources wait until a running action completes. '
+                      'Resources with nested stacks are not counted. Set to '
+                      '0 for unlimited.')),
+    cfg.IntOpt('max_concurrent_resource_actions_per_stack',
+               default=0,
+               min=0,
+               help=_('Maximum number of resource actions in each stack that '
+                      'run at once without the convergence engine. Set to 0 '
+                      'for unlimited.')),
+    cfg.Opt('max_concurrent_resource_actions_per_type',
+            type=_resource_type_limits,
+            default={},
+            help=_('Maximum number of actions on resources of each of the '
+                   'given types that each engine process runs at once '
+                   'without the convergence engine, e.g. '
+                   '"OS::Nova::Server:10,OS::Neutron::Port:20". Resources '
+                   'that wait for a signal are not counted.')),
     cfg.IntOpt('engine_life_check_timeout',
                default=2,
                help=_('RPC timeout for the engine liveness check that is used'
@@ -331,6 +387,16 @@ revision_opts = [
                       'separately, you can move this section to a different '
                       'file and add it as another config option.'))]
 
+upgrade_levels_group = cfg.OptGroup('upgrade_levels')
+upgrade_levels_opts = [
+    cfg.StrOpt('worker',
+               help=_('The highest version of the worker RPC API that '
+                      'messages are sent with, e.g. "1.2". Set this while '
+                      'engines that have not been upgraded are still '
+                      'running, so that they can handle every message. '
+                      'By default messages are sent with the latest '
+                      'version.'))]
+
 
 def startup_sanity_check():
     if (not cfg.CONF.stack_user_domain_id and
@@ -364,6 +430,7 @@ def list_opts():
     yield paste_deploy_group.name, paste_deploy_opts
     yield auth_password_group.name, auth_password_opts
     yield revision_group.name, revision_opts
+    yield upgrade_levels_group.name, upgrade_levels_opts
     yield profiler.list_opts()[0]
     yield 'clients', default_clients_opts
 
@@ -382,6 +449,7 @@ def list_opts():
 cfg.CONF.register_group(paste_deploy_group)
 cfg.CONF.register_group(auth_password_group)
 cfg.CONF.register_group(revision_group)
+cfg.CONF.register_group(upgrade_levels_group)
 profiler.set_defaults(cfg.CONF)
 
 for group, opts in list_opts():
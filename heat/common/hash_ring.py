@@ -0,0 +1,50 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import bisect
+import hashlib
+
+from oslo_utils import encodeutils
+
+
+class HashRing(object):
+    """Map keys onto a set of hosts by consistent hashing.
+
+    Each host is placed at a number of pseudo-random points on the ring, and
+    a key belongs to the host at the first point following the hash of the
+    key. When a host is added to or removed from the set, only the keys that
+    belonged to that host move.
+    """
+
+    def __init__(self, hosts, replicas=32):
+        self.hosts = frozenset(hosts)
+        ring = sorted((self._hash('%s-%d' % (host, r)), host)
+                      for host in self.hosts
+                      for r in range(replicas))
+        self._hashes = [h for h, host in ring]
+        self._hosts = [host for h, host in ring]
+
+    @staticmethod
+    def _hash(key):
+        digest = hashlib.md5(encodeutils.safe_encode(key)).hexdigest()
+        return int(digest[:8], 16)
+
+    def get_host(self, key):
+        """Return the host that the given key belongs to.
+
+        Returns None if there are no hosts.
+        """
+        if not self._hashes:
+            return None
+        index = bisect.bisect(self._hashes, self._hash(key))
+        return self._hosts[index % len(self._hosts)]
@@ -116,12 +116,13 @@ def get_rpc_server(target, endpoint):
                                          serializer=serializer)
 
 
-def get_rpc_client(**kwargs):
+def get_rpc_client(version_cap=None, **kwargs):
     """Return a configured oslo_messaging RPCClient."""
     target = oslo_messaging.Target(**kwargs)
     serializer = RequestContextSerializer(JsonPayloadSerializer())
     return oslo_messaging.RPCClient(TRANSPORT, target,
-                                    serializer=serializer)
+                                    serializer=serializer,
+                                    version_cap=version_cap)
 
 
 def get_notifier(publisher_id):
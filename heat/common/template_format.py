@@ -11,17 +11,23 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import hashlib
 import itertools
 import re
 
 from oslo_config import cfg
+from oslo_log import log as logging
 from oslo_serialization import jsonutils
+from oslo_utils import encodeutils
 import six
 import yaml
 
 from heat.common import exception
 from heat.common.i18n import _
 
+LOG = logging.getLogger(__name__)
+
 if hasattr(yaml, 'CSafeLoader'):
     yaml_loader = yaml.CSafeLoader
 else:
@@ -47,25 +53,65 @@ yaml_loader.add_constructor(u'tag:yaml.org,2002:timestamp',
                             _construct_yaml_str)
 
 
-def simple_parse(tmpl_str):
+def _is_json(tmpl_str):
+    """Return True if the string looks like a JSON object or array.
+
+    Every other document is left to the YAML loader, which also understands
+    the JSON scalars.
+    """
+    return tmpl_str.lstrip()[:1] in ('{', '[', b'{', b'[')
+
+
+def _error_with_snippets(yea, tmpl_str):
+    """Add the template snippets to an error from the C YAML loader.
+
+    Unlike the pure-Python loader, the C loader does not record the source
+    text in the marks of its errors, so they show only the line and column
+    at which the error occurred.
+    """
+    buf = None
+    for attr in ('context_mark', 'problem_mark'):
+        mark = getattr(yea, attr, None)
+        if mark is None or mark.buffer is not None:
+            continue
+        if buf is None:
+            buf = encodeutils.safe_decode(tmpl_str, errors='replace')
+        setattr(yea, attr, yaml.Mark(mark.name, mark.index, mark.line,
+                                     mark.column, buf, mark.index))
+    return yea
+
+
+def _load_yaml(tmpl_str):
     try:
-        tpl = jsonutils.loads(tmpl_str)
-    except ValueError:
+        return yaml.load(tmpl_str, Loader=yaml_loader)
+    except yaml.YAMLError as yea:
+        error = _error_with_snippets(yea, tmpl_str)
+
+    if (LOG.isEnabledFor(logging.DEBUG) and
+            yaml_loader is not yaml.SafeLoader):
+        # NOTE(prazumovsky): the SafeLoader reports the error in its own
+        # (more detailed) terms, so use it to parse the template again.
         try:
-            tpl = yaml.load(tmpl_str, Loader=yaml_loader)
-        except yaml.YAMLError:
-            # NOTE(prazumovsky): we need to return more informative error for
-            # user, so use SafeLoader, which return error message with template
-            # snippet where error has been occurred.
-            try:
-                tpl = yaml.load(tmpl_str, Loader=yaml.SafeLoader)
-            except yaml.YAMLError as yea:
-                yea = six.text_type(yea)
-                msg = _('Error parsing template: %s') % yea
-                raise ValueError(msg)
-        else:
-            if tpl is None:
-                tpl = {}
+            return yaml.load(tmpl_str, Loader=yaml.SafeLoader)
+        except yaml.YAMLError as yea:
+            error = yea
+
+    msg = _('Error parsing template: %s') % six.text_type(error)
+    raise ValueError(msg)
+
+
+def simple_parse(tmpl_str):
+    tpl = None
+    if _is_json(tmpl_str):
+        try:
+            tpl = jsonutils.loads(tmpl_str)
+        except ValueError:
+            # Flow-style YAML may look like JSON
+            pass
+    if tpl is None:
+        tpl = _load_yaml(tmpl_str)
+        if tpl is None:
+            tpl = {}
 
     if not isinstance(tpl, dict):
         raise ValueError(_('The template is not a JSON object '
@@ -88,23 +134,112 @@ def validate_template_limit(contain_str):
         raise exception.RequestLimitExceeded(message=msg)
 
 
+CacheInfo = collections.namedtuple('CacheInfo',
+                                   ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class _ParseCache(object):
+    """A least-recently-used cache of parsed templates.
+
+    Entries are keyed by a digest of the template contents, so the same
+    template is found regardless of where it came from. Callers are free to
+    modify the templates they are given, so the cached structures are never
+    handed out; each lookup returns a copy instead.
+    """
+
+    def __init__(self):
+        self._entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(tmpl_str):
+        return hashlib.sha256(encodeutils.safe_encode(tmpl_str)).hexdigest()
+
+    def get(self, key):
+        try:
+            tpl = self._entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self._entries[key] = tpl
+        self.hits += 1
+        return _copy(tpl)
+
+    def put(self, key, tpl, maxsize):
+        self._entries[key] = _copy(tpl)
+        while len(self._entries) > maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses,
+                         cfg.CONF.template_parse_cache_size,
+                         len(self._entries))
+
+
+def _copy(data):
+    """Copy a parsed template.
+
+    Parsing produces only dicts, lists and immutable scalars, so this is
+    equivalent to (and much faster than) copy.deepcopy().
+    """
+    if isinstance(data, dict):
+        return dict((k, _copy(v)) for k, v in data.items())
+    if isinstance(data, list):
+        return [_copy(v) for v in data]
+    return data
+
+
+_parse_cache = _ParseCache()
+
+
+def parse_cache_info():
+    """Return the hits, misses, maximum and current size of the parse cache.
+
+    The statistics are those of the current process.
+    """
+    return _parse_cache.info()
+
+
+def clear_parse_cache():
+    """Empty the parse cache and reset its statistics."""
+    _parse_cache.clear()
+
+
 def parse(tmpl_str):
     """Takes a string and returns a dict containing the parsed structure.
 
     This includes determination of whether the string is using the
-    JSON or YAML format.
+    JSON or YAML format. The results are cached, so that a template that has
+    been parsed recently is not parsed again.
     """
 
     # TODO(ricolin): Move this validation to api side.
     # Validate nested stack template.
     validate_template_limit(six.text_type(tmpl_str))
 
+    cache_size = cfg.CONF.template_parse_cache_size
+    if cache_size > 0:
+        key = _parse_cache.key(tmpl_str)
+        tpl = _parse_cache.get(key)
+        if tpl is not None:
+            return tpl
+
     tpl = simple_parse(tmpl_str)
     # Looking for supported version keys in the loaded template
     if not ('HeatTemplateFormatVersion' in tpl
             or 'heat_template_version' in tpl
             or 'AWSTemplateFormatVersion' in tpl):
         raise ValueError(_("Template format version not found."))
+
+    if cache_size > 0:
+        _parse_cache.put(key, tpl, cache_size)
     return tpl
 
 
@@ -46,6 +46,10 @@ def raw_template_get(context, template_id):
     return IMPL.raw_template_get(context, template_id)
 
 
+def raw_template_get_templates(context, template_ids):
+    return IMPL.raw_template_get_templates(context, template_ids)
+
+
 def raw_template_create(context, values):
     return IMPL.raw_template_create(context, values)
 
@@ -109,6 +113,10 @@ def resource_create(context, values):
     return IMPL.resource_create(context, values)
 
 
+def resource_create_many(context, values_list):
+    return IMPL.resource_create_many(context, values_list)
+
+
 def resource_exchange_stacks(context, resource_id1, resource_id2):
     return IMPL.resource_exchange_stacks(context, resource_id1, resource_id2)
 
@@ -151,11 +159,17 @@ def stack_get_all(context, limit=None, sort_keys=None, marker=None,
                   sort_dir=None, filters=None, tenant_safe=True,
                   show_deleted=False, show_nested=False, show_hidden=False,
                   tags=None, tags_any=None, not_tags=None,
-                  not_tags_any=None):
+                  not_tags_any=None, eager_load=False, load_template=True):
     return IMPL.stack_get_all(context, limit, sort_keys,
                               marker, sort_dir, filters, tenant_safe,
                               show_deleted, show_nested, show_hidden,
-                              tags, tags_any, not_tags, not_tags_any)
+                              tags, tags_any, not_tags, not_tags_any,
+                              eager_load=eager_load,
+                              load_template=load_template)
+
+
+def stack_get_identities(context, stack_ids):
+    return IMPL.stack_get_identities(context, stack_ids)
 
 
 def stack_get_all_by_owner_id(context, owner_id):
@@ -239,23 +253,29 @@ def event_get_all(context):
 
 
 def event_get_all_by_tenant(context, limit=None, marker=None,
-                            sort_keys=None, sort_dir=None, filters=None):
-    return IMPL.event_get_all_by_tenant(context,
-                                        limit=limit,
-                                        marker=marker,
-                                        sort_keys=sort_keys,
-                                        sort_dir=sort_dir,
-                                        filters=filters)
+                            sort_keys=None, sort_dir=None, filters=None,
+                            include_rsrc_prop_data=True):
+    return IMPL.event_get_all_by_tenant(
+        context,
+        limit=limit,
+        marker=marker,
+        sort_keys=sort_keys,
+        sort_dir=sort_dir,
+        filters=filters,
+        include_rsrc_prop_data=include_rsrc_prop_data)
 
 
 def event_get_all_by_stack(context, stack_id, limit=None, marker=None,
-                           sort_keys=None, sort_dir=None, filters=None):
-    return IMPL.event_get_all_by_stack(context, stack_id,
-                                       limit=limit,
-                                       marker=marker,
-                                       sort_keys=sort_keys,
-                                       sort_dir=sort_dir,
-                                       filters=filters)
+                           sort_keys=None, sort_dir=None, filters=None,
+                           include_rsrc_prop_data=True):
+    return IMPL.event_get_all_by_stack(
+        context, stack_id,
+        limit=limit,
+        marker=marker,
+        sort_keys=sort_keys,
+        sort_dir=sort_dir,
+        filters=filters,
+        include_rsrc_prop_data=include_rsrc_prop_data)
 
 
 def event_count_all_by_stack(context, stack_id):
@@ -266,6 +286,10 @@ def event_create(context, values):
     return IMPL.event_create(context, values)
 
 
+def event_create_many(context, values_list):
+    return IMPL.event_create_many(context, values_list)
+
+
 def watch_rule_get(context, watch_rule_id):
     return IMPL.watch_rule_get(context, watch_rule_id)
 
@@ -417,6 +441,12 @@ def sync_point_update_input_data(context, entity_id,
                                              atomic_key, input_data)
 
 
+def sync_point_add_input(context, entity_id, traversal_id, is_update,
+                         sender, input_data):
+    return IMPL.sync_point_add_input(context, entity_id, traversal_id,
+                                     is_update, sender, input_data)
+
+
 def db_sync(engine, version=None):
     """Migrate the database to `version` or the most recent version."""
     return IMPL.db_sync(engine, version=version)
@@ -12,11 +12,17 @@
 #    under the License.
 
 """Implementation of SQLAlchemy backend."""
+import collections
 import datetime
+import hashlib
+import random
 import sys
+import time
+import uuid
 
 from oslo_config import cfg
 from oslo_db import api as oslo_db_api
+from oslo_db import exception as db_exception
 from oslo_db.sqlalchemy import session as db_session
 from oslo_db.sqlalchemy import utils
 from oslo_serialization import jsonutils
@@ -97,7 +103,97 @@ def _session(context):
     return (context and context.session) or get_session()
 
 
-def raw_template_get(context, template_id):
+# The fields of a raw template that may be stored in a RawTemplateBlob, and
+# the columns holding the IDs of their blobs
+_RAW_TEMPLATE_BLOBS = (('template', 'template_blob_id'),
+                       ('files', 'files_blob_id'))
+
+
+def _raw_template_blob_id(data):
+    blob = jsonutils.dumps(data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encodeutils.safe_encode(blob)).hexdigest()
+
+
+def _raw_template_blob_ref(session, data):
+    """Add a reference to the blob containing data and return its ID.
+
+    The blob is created if it does not already exist.
+    """
+    blob_id = _raw_template_blob_id(data)
+    rows_updated = session.query(models.RawTemplateBlob).filter_by(
+        id=blob_id).update(
+            {'ref_count': models.RawTemplateBlob.ref_count + 1},
+            synchronize_session=False)
+    if not rows_updated:
+        blob_ref = models.RawTemplateBlob()
+        blob_ref.update({'id': blob_id, 'data': data, 'ref_count': 1})
+        session.add(blob_ref)
+        session.flush()
+    return blob_id
+
+
+def _raw_template_blob_unref(session, blob_id):
+    """Remove a reference to a blob, deleting it if it is no longer used."""
+    query = session.query(models.RawTemplateBlob).filter_by(id=blob_id)
+    query.update({'ref_count': models.RawTemplateBlob.ref_count - 1},
+                 synchronize_session=False)
+    query.filter(models.RawTemplateBlob.ref_count <= 0).delete(
+        synchronize_session=False)
+
+
+def _raw_template_load_blobs(session, raw_templates, only=None):
+    """Fill in the fields of raw templates that are stored in blobs.
+
+    Each raw template gets its own copy of the data, even when the blob is
+    shared, so that templates can be modified independently. If only is
+    given, just the fields named in it are filled in.
+    """
+    fields = [(raw_template, field, getattr(raw_template, blob_field))
+              for raw_template in raw_templates
+              for field, blob_field in _RAW_TEMPLATE_BLOBS
+              if ((only is None or field in only) and
+                  getattr(raw_template, blob_field) is not None and
+                  getattr(raw_template, field) is None)]
+    if not fields:
+        return
+
+    # fetch the serialised data, to decode it separately for each template
+    data = sqlalchemy.type_coerce(models.RawTemplateBlob.data,
+                                  sqlalchemy.Text)
+    blobs = dict(session.query(models.RawTemplateBlob.id, data).filter(
+        models.RawTemplateBlob.id.in_(set(b for rt, f, b in fields))))
+    for raw_template, field, blob_id in fields:
+        value = blobs.get(blob_id)
+        if value is not None:
+            value = jsonutils.loads(value)
+        # don't mark the field as modified, or it would be written back
+        orm.attributes.set_committed_value(raw_template, field, value)
+
+
+def _raw_template_store_blobs(session, values, old_blob_ids=None):
+    """Move the fields in values that can be shared into blobs.
+
+    Returns a dict of the data moved, after replacing it in values with the
+    ID of its blob. The blobs in old_blob_ids, if any, are released.
+    """
+    blob_data = {}
+    for field, blob_field in _RAW_TEMPLATE_BLOBS:
+        if field not in values:
+            continue
+        data = values[field]
+        if data:
+            values[blob_field] = _raw_template_blob_ref(session, data)
+            values[field] = None
+            blob_data[field] = data
+        else:
+            values[blob_field] = None
+        old_blob_id = (old_blob_ids or {}).get(blob_field)
+        if old_blob_id is not None:
+            _raw_template_blob_unref(session, old_blob_id)
+    return blob_data
+
+
+def _raw_template_get(context, template_id):
     result = model_query(context, models.RawTemplate).get(template_id)
 
     if not result:
@@ -106,28 +202,82 @@ def raw_template_get(context, template_id):
     return result
 
 
+def raw_template_get(context, template_id):
+    result = _raw_template_get(context, template_id)
+    _raw_template_load_blobs(_session(context), [result])
+    return result
+
+
+def raw_template_get_templates(context, template_ids):
+    """Return a dict of the template data of the given raw templates.
+
+    Only the template itself is read, not the files or the environment.
+    Raw templates that do not exist are left out.
+    """
+    if not template_ids:
+        return {}
+    query = model_query(context, models.RawTemplate).filter(
+        models.RawTemplate.id.in_(template_ids)).options(
+            orm.load_only('id', 'template', 'template_blob_id'))
+    raw_templates = query.all()
+    _raw_template_load_blobs(_session(context), raw_templates,
+                             only=('template',))
+    return dict((rt.id, rt.template) for rt in raw_templates)
+
+
+def _is_duplicate_entry(exc):
+    return isinstance(exc, db_exception.DBDuplicateEntry)
+
+
+@oslo_db_api.wrap_db_retry(max_retries=3, retry_on_deadlock=True,
+                           retry_interval=0.5, inc_retry_interval=True,
+                           exception_checker=_is_duplicate_entry)
 def raw_template_create(context, values):
-    raw_template_ref = models.RawTemplate()
-    raw_template_ref.update(values)
-    raw_template_ref.save(_session(context))
+    values = dict(values)
+    session = _session(context)
+    with session.begin(subtransactions=True):
+        blob_data = _raw_template_store_blobs(session, values)
+        raw_template_ref = models.RawTemplate()
+        raw_template_ref.update(values)
+        raw_template_ref.save(session)
+
+    for field, data in blob_data.items():
+        orm.attributes.set_committed_value(raw_template_ref, field, data)
     return raw_template_ref
 
 
+@oslo_db_api.wrap_db_retry(max_retries=3, retry_on_deadlock=True,
+                           retry_interval=0.5, inc_retry_interval=True,
+                           exception_checker=_is_duplicate_entry)
 def raw_template_update(context, template_id, values):
-    raw_template_ref = raw_template_get(context, template_id)
-    # get only the changed values
-    values = dict((k, v) for k, v in values.items()
-                  if getattr(raw_template_ref, k) != v)
-
-    if values:
-        raw_template_ref.update_and_save(values)
-
+    session = _session(context)
+    with session.begin(subtransactions=True):
+        raw_template_ref = raw_template_get(context, template_id)
+        # get only the changed values
+        values = dict((k, v) for k, v in values.items()
+                      if getattr(raw_template_ref, k) != v)
+
+        old_blob_ids = dict((blob_field, getattr(raw_template_ref,
+                                                 blob_field))
+                            for field, blob_field in _RAW_TEMPLATE_BLOBS)
+        blob_data = _raw_template_store_blobs(session, values, old_blob_ids)
+        if values:
+            raw_template_ref.update_and_save(values)
+
+    for field, data in blob_data.items():
+        orm.attributes.set_committed_value(raw_template_ref, field, data)
     return raw_template_ref
 
 
 def raw_template_delete(context, template_id):
-    raw_template = raw_template_get(context, template_id)
-    raw_template.delete()
+    session = _session(context)
+    with session.begin(subtransactions=True):
+        raw_template = _raw_template_get(context, template_id)
+        for field, blob_field in _RAW_TEMPLATE_BLOBS:
+            blob_id = getattr(raw_template, blob_field)
+            if blob_id is not None:
+                _raw_template_blob_unref(session, blob_id)
+        raw_template.delete()
 
 
 def resource_get(context, resource_id):
@@ -308,6 +458,36 @@ def resource_create(context, values):
     return resource_ref
 
 
+def resource_create_many(context, values_list):
+    """Create many resources in a single transaction.
+
+    The rows are written with one multi-row insert and read back with one
+    query, instead of a round trip (and a commit) per resource. Every dict
+    in values_list must have the same keys; as with resource_create(), keys
+    that do not correspond to a column are ignored. The resources are
+    returned in the same order as values_list.
+    """
+    if not values_list:
+        return []
+
+    columns = models.Resource.__table__.c
+    rows = [dict((k, v) for k, v in six.iteritems(values) if k in columns)
+            for values in values_list]
+    for row in rows:
+        row.setdefault('uuid', str(uuid.uuid4()))
+    uuids = [row['uuid'] for row in rows]
+
+    session = _session(context)
+    with session.begin(subtransactions=True):
+        session.execute(models.Resource.__table__.insert(), rows)
+        results = session.query(models.Resource).filter(
+            models.Resource.uuid.in_(uuids)).options(
+                orm.joinedload('data')).all()
+
+    by_uuid = dict((r.uuid, r) for r in results)
+    return [by_uuid[u] for u in uuids]
+
+
 def resource_get_all_by_stack(context, stack_id, key_id=False, filters=None):
     query = model_query(
         context, models.Resource
@@ -379,6 +559,12 @@ def stack_get_status(context, stack_id):
             result.updated_at)
 
 
+def stack_get_identities(context, stack_ids):
+    query = model_query(context, models.Stack.id, models.Stack.name,
+                        models.Stack.tenant)
+    return query.filter(models.Stack.id.in_(stack_ids)).all()
+
+
 def stack_get_all_by_owner_id(context, owner_id):
     results = soft_delete_aware_query(
         context, models.Stack).filter_by(owner_id=owner_id).all()
@@ -475,15 +661,31 @@ def stack_get_all(context, limit=None, sort_keys=None, marker=None,
                   sort_dir=None, filters=None, tenant_safe=True,
                   show_deleted=False, show_nested=False, show_hidden=False,
                   tags=None, tags_any=None, not_tags=None,
-                  not_tags_any=None):
+                  not_tags_any=None, eager_load=False, load_template=True):
     query = _query_stack_get_all(context, tenant_safe,
                                  show_deleted=show_deleted,
                                  show_nested=show_nested,
                                  show_hidden=show_hidden, tags=tags,
                                  tags_any=tags_any, not_tags=not_tags,
                                  not_tags_any=not_tags_any)
-    return _filter_and_page_query(context, query, limit, sort_keys,
-                                  marker, sort_dir, filters).all()
+    if eager_load:
+        # Fetch the tags of the whole page together rather than one stack at
+        # a time, and skip the potentially large convergence graph, which
+        # listings never need.
+        query = query.options(orm.subqueryload("tags"),
+                              orm.defer("current_deps"),
+                              orm.defer("current_deps_delta"))
+        if load_template:
+            # Likewise for the templates and their blobs; raw_template_get()
+            # is then served from the session.
+            query = query.options(orm.joinedload("raw_template"))
+    results = _filter_and_page_query(context, query, limit, sort_keys,
+                                     marker, sort_dir, filters).all()
+    if eager_load and load_template:
+        _raw_template_load_blobs(_session(context),
+                                 [s.raw_template for s in results
+                                  if s.raw_template is not None])
+    return results
 
 
 def _filter_and_page_query(context, query, limit=None, sort_keys=None,
@@ -710,9 +912,18 @@ def event_get_all(context):
     return results
 
 
-def event_get_all_by_tenant(context, limit=None, marker=None,
-                            sort_keys=None, sort_dir=None, filters=None):
+def _events_query(context, include_rsrc_prop_data=True):
     query = model_query(context, models.Event)
+    if not include_rsrc_prop_data:
+        query = query.options(orm.defer(models.Event.rsrc_prop_data),
+                              orm.defer(models.Event._resource_properties))
+    return query
+
+
+def event_get_all_by_tenant(context, limit=None, marker=None,
+                            sort_keys=None, sort_dir=None, filters=None,
+                            include_rsrc_prop_data=True):
+    query = _events_query(context, include_rsrc_prop_data)
     query = db_filters.exact_filter(query, models.Event, filters)
     query = query.join(
         models.Event.stack
@@ -722,14 +933,15 @@ def event_get_all_by_tenant(context, limit=None, marker=None,
                                          sort_keys, sort_dir, filters).all()
 
 
-def _query_all_by_stack(context, stack_id):
-    query = model_query(context, models.Event).filter_by(stack_id=stack_id)
-    return query
+def _query_all_by_stack(context, stack_id, include_rsrc_prop_data=True):
+    query = _events_query(context, include_rsrc_prop_data)
+    return query.filter_by(stack_id=stack_id)
 
 
 def event_get_all_by_stack(context, stack_id, limit=None, marker=None,
-                           sort_keys=None, sort_dir=None, filters=None):
-    query = _query_all_by_stack(context, stack_id)
+                           sort_keys=None, sort_dir=None, filters=None,
+                           include_rsrc_prop_data=True):
+    query = _query_all_by_stack(context, stack_id, include_rsrc_prop_data)
     return _events_filter_and_page_query(context, query, limit, marker,
                                          sort_keys, sort_dir, filters).all()
 
@@ -790,7 +1002,8 @@ def _delete_event_rows(context, stack_id, limit):
     # So we must manually supply the IN() values.
     # pgsql SHOULD work with the pure DELETE/JOIN below but that must be
     # confirmed via integration tests.
-    query = _query_all_by_stack(context, stack_id)
+    query = _query_all_by_stack(context, stack_id,
+                                include_rsrc_prop_data=False)
     session = _session(context)
     ids = [r.id for r in query.order_by(
         models.Event.id).limit(limit).all()]
@@ -799,19 +1012,78 @@ def _delete_event_rows(context, stack_id, limit):
     return q.delete(synchronize_session='fetch')
 
 
+def _event_prune_due():
+    """Return whether to check for events to prune on this insert.
+
+    Counting a stack's events on every insert would double the work done on
+    this hot path, so the check is only made on average once for every half
+    of event_purge_batch_size events inserted. The number of events stored
+    may therefore briefly exceed max_events_per_stack by a small margin.
+    """
+    return (2.0 / max(cfg.CONF.event_purge_batch_size, 1) >
+            random.uniform(0, 1))
+
+
+def _prune_events(context, stack_id, new_events=1):
+    """Prune a stack's oldest events if it is about to have too many."""
+    if not (cfg.CONF.max_events_per_stack and
+            any(_event_prune_due() for i in range(new_events))):
+        return
+    excess = (event_count_all_by_stack(context, stack_id) + new_events - 1 -
+              cfg.CONF.max_events_per_stack)
+    if excess >= 0:
+        # prune
+        _delete_event_rows(context, stack_id,
+                           excess + cfg.CONF.event_purge_batch_size)
+
+
 def event_create(context, values):
-    if 'stack_id' in values and cfg.CONF.max_events_per_stack:
-        if ((event_count_all_by_stack(context, values['stack_id']) >=
-             cfg.CONF.max_events_per_stack)):
-            # prune
-            _delete_event_rows(
-                context, values['stack_id'], cfg.CONF.event_purge_batch_size)
+    if 'stack_id' in values:
+        _prune_events(context, values['stack_id'])
     event_ref = models.Event()
     event_ref.update(values)
     event_ref.save(_session(context))
     return event_ref
 
 
+def event_create_many(context, values_list):
+    """Create many events with a single multi-row insert.
+
+    The events are inserted, and so numbered, in the order of values_list
+    and are returned in the same order. Every dict in values_list must have
+    the same keys.
+    """
+    if not values_list:
+        return []
+
+    rows = []
+    stack_events = collections.OrderedDict()
+    for values in values_list:
+        row = dict(values)
+        row.setdefault('uuid', str(uuid.uuid4()))
+        if 'resource_properties' in row:
+            row['rsrc_prop_data'] = row.pop('resource_properties')
+        reason = row.get('resource_status_reason')
+        if 'resource_status_reason' in row:
+            row['resource_status_reason'] = reason and reason[:255] or ''
+        rows.append(row)
+        stack_id = row['stack_id']
+        stack_events[stack_id] = stack_events.get(stack_id, 0) + 1
+    uuids = [row['uuid'] for row in rows]
+
+    for stack_id, count in six.iteritems(stack_events):
+        _prune_events(context, stack_id, count)
+
+    session = _session(context)
+    with session.begin(subtransactions=True):
+        session.execute(models.Event.__table__.insert(), rows)
+        results = session.query(models.Event).filter(
+            models.Event.uuid.in_(uuids)).all()
+
+    by_uuid = dict((e.uuid, e) for e in results)
+    return [by_uuid[u] for u in uuids]
+
+
 def watch_rule_get(context, watch_rule_id):
     result = model_query(context, models.WatchRule).get(watch_rule_id)
     return result
@@ -1058,7 +1330,15 @@ def service_get_all_by_args(context, host, binary, hostname):
             filter_by(hostname=hostname).all())
 
 
-def purge_deleted(age, granularity='days'):
+def purge_deleted(age, granularity='days', batch_size=0, sleep_time=0):
+    """Purge stacks that were soft-deleted more than age ago.
+
+    If batch_size is non-zero, no more than batch_size stacks are purged in
+    each transaction, with a pause of sleep_time seconds between batches.
+    The batch size counts stacks, not rows: each batch also deletes all of
+    the rows (resources, events and so on) that belong to its stacks.
+    Returns a dict mapping each table name to the number of rows deleted.
+    """
     try:
         age = int(age)
     except ValueError:
@@ -1070,6 +1350,13 @@ def purge_deleted(age, granularity='days'):
         raise exception.Error(
             _("granularity should be days, hours, minutes, or seconds"))
 
+    try:
+        batch_size = int(batch_size or 0)
+    except ValueError:
+        raise exception.Error(_("batch_size should be an integer"))
+    if batch_size < 0:
+        raise exception.Error(_("batch_size should be a positive integer"))
+
     if granularity == 'days':
         age = age * 86400
     elif granularity == 'hours':
@@ -1082,87 +1369,135 @@ def purge_deleted(age, granularity='days'):
     meta = sqlalchemy.MetaData()
     meta.bind = engine
 
+    for table in ('stack_lock', 'stack_tag', 'resource', 'resource_data',
+                  'event', 'raw_template', 'raw_template_blob', 'user_creds',
+                  'sync_point', 'sync_point_input'):
+        sqlalchemy.Table(table, meta, autoload=True)
     stack = sqlalchemy.Table('stack', meta, autoload=True)
-    stack_lock = sqlalchemy.Table('stack_lock', meta, autoload=True)
-    stack_tag = sqlalchemy.Table('stack_tag', meta, autoload=True)
-    resource = sqlalchemy.Table('resource', meta, autoload=True)
-    resource_data = sqlalchemy.Table('resource_data', meta, autoload=True)
-    event = sqlalchemy.Table('event', meta, autoload=True)
-    raw_template = sqlalchemy.Table('raw_template', meta, autoload=True)
-    user_creds = sqlalchemy.Table('user_creds', meta, autoload=True)
     service = sqlalchemy.Table('service', meta, autoload=True)
-    syncpoint = sqlalchemy.Table('sync_point', meta, autoload=True)
 
     # find the soft-deleted stacks that are past their expiry
     stack_where = sqlalchemy.select([stack.c.id, stack.c.raw_template_id,
                                      stack.c.prev_raw_template_id,
                                      stack.c.user_creds_id]).where(
                                          stack.c.deleted_at < time_line)
-    stacks = list(engine.execute(stack_where))
-    if stacks:
-        stack_ids = [i[0] for i in stacks]
-        # delete stack locks (just in case some got stuck)
-        stack_lock_del = stack_lock.delete().where(
-            stack_lock.c.stack_id.in_(stack_ids))
-        engine.execute(stack_lock_del)
-        # delete stack tags
-        stack_tag_del = stack_tag.delete().where(
-            stack_tag.c.stack_id.in_(stack_ids))
-        engine.execute(stack_tag_del)
-        # delete resource_data
-        res_where = sqlalchemy.select([resource.c.id]).where(
-            resource.c.stack_id.in_(stack_ids))
-        res_data_del = resource_data.delete().where(
-            resource_data.c.resource_id.in_(res_where))
-        engine.execute(res_data_del)
-        # delete resources
-        res_del = resource.delete().where(resource.c.stack_id.in_(stack_ids))
-        engine.execute(res_del)
-        # delete events
-        event_del = event.delete().where(event.c.stack_id.in_(stack_ids))
-        engine.execute(event_del)
-        # clean up any sync_points that may have lingered
-        sync_del = syncpoint.delete().where(
-            syncpoint.c.stack_id.in_(stack_ids))
-        engine.execute(sync_del)
-        # delete the stacks
-        stack_del = stack.delete().where(stack.c.id.in_(stack_ids))
-        engine.execute(stack_del)
-        # delete orphaned raw templates
-        raw_template_ids = [i[1] for i in stacks if i[1] is not None]
-        raw_template_ids.extend(i[2] for i in stacks if i[2] is not None)
-        if raw_template_ids:
-            # keep those still referenced
-            raw_tmpl_sel = sqlalchemy.select([stack.c.raw_template_id]).where(
-                stack.c.raw_template_id.in_(raw_template_ids))
-            raw_tmpl = [i[0] for i in engine.execute(raw_tmpl_sel)]
-            raw_template_ids = set(raw_template_ids) - set(raw_tmpl)
-            raw_tmpl_sel = sqlalchemy.select(
-                [stack.c.prev_raw_template_id]).where(
-                stack.c.prev_raw_template_id.in_(raw_template_ids))
-            raw_tmpl = [i[0] for i in engine.execute(raw_tmpl_sel)]
-            raw_template_ids = raw_template_ids - set(raw_tmpl)
-            raw_templ_del = raw_template.delete().where(
-                raw_template.c.id.in_(raw_template_ids))
-            engine.execute(raw_templ_del)
-        # purge any user creds that are no longer referenced
-        user_creds_ids = [i[3] for i in stacks if i[3] is not None]
-        if user_creds_ids:
-            # keep those still referenced
-            user_sel = sqlalchemy.select([stack.c.user_creds_id]).where(
-                stack.c.user_creds_id.in_(user_creds_ids))
-            users = [i[0] for i in engine.execute(user_sel)]
-            user_creds_ids = set(user_creds_ids) - set(users)
-            usr_creds_del = user_creds.delete().where(
-                user_creds.c.id.in_(user_creds_ids))
-            engine.execute(usr_creds_del)
+    if batch_size:
+        # fetch one extra stack to find out whether another batch follows
+        stack_where = stack_where.order_by(stack.c.id).limit(batch_size + 1)
+
+    counts = collections.defaultdict(int)
+    while True:
+        # each batch is committed separately, so an interrupted purge simply
+        # resumes with the stacks that remain when it is next run
+        with engine.begin() as conn:
+            stacks = list(conn.execute(stack_where))
+            more = batch_size and len(stacks) > batch_size
+            if more:
+                stacks = stacks[:batch_size]
+            if stacks:
+                _purge_stacks(stacks, conn, meta, counts)
+        if not more:
+            break
+        if sleep_time:
+            time.sleep(sleep_time)
+
     # Purge deleted services
     srvc_del = service.delete().where(service.c.deleted_at < time_line)
-    engine.execute(srvc_del)
+    counts['service'] += engine.execute(srvc_del).rowcount
+    return dict(counts)
+
+
+def _purge_stacks(stacks, conn, meta, counts):
+    """Delete the given stacks and all of the rows that belong to them.
+
+    The number of rows deleted from each table is added to counts.
+    """
+    stack = meta.tables['stack']
+    stack_lock = meta.tables['stack_lock']
+    stack_tag = meta.tables['stack_tag']
+    resource = meta.tables['resource']
+    resource_data = meta.tables['resource_data']
+    event = meta.tables['event']
+    raw_template = meta.tables['raw_template']
+    raw_template_blob = meta.tables['raw_template_blob']
+    user_creds = meta.tables['user_creds']
+    syncpoint = meta.tables['sync_point']
+    syncpoint_input = meta.tables['sync_point_input']
+
+    def delete(table, where):
+        result = conn.execute(table.delete().where(where))
+        counts[table.name] += result.rowcount
+
+    stack_ids = [i[0] for i in stacks]
+    # delete stack locks (just in case some got stuck)
+    delete(stack_lock, stack_lock.c.stack_id.in_(stack_ids))
+    # delete stack tags
+    delete(stack_tag, stack_tag.c.stack_id.in_(stack_ids))
+    # delete resource_data
+    res_where = sqlalchemy.select([resource.c.id]).where(
+        resource.c.stack_id.in_(stack_ids))
+    delete(resource_data, resource_data.c.resource_id.in_(res_where))
+    # delete resources
+    delete(resource, resource.c.stack_id.in_(stack_ids))
+    # delete events
+    delete(event, event.c.stack_id.in_(stack_ids))
+    # clean up any sync_points that may have lingered
+    sp_where = sqlalchemy.select([syncpoint.c.traversal_id]).where(
+        syncpoint.c.stack_id.in_(stack_ids))
+    delete(syncpoint_input, syncpoint_input.c.traversal_id.in_(sp_where))
+    delete(syncpoint, syncpoint.c.stack_id.in_(stack_ids))
+    # delete the stacks
+    delete(stack, stack.c.id.in_(stack_ids))
+    # delete orphaned raw templates
+    raw_template_ids = [i[1] for i in stacks if i[1] is not None]
+    raw_template_ids.extend(i[2] for i in stacks if i[2] is not None)
+    if raw_template_ids:
+        # keep those still referenced
+        raw_tmpl_sel = sqlalchemy.select([stack.c.raw_template_id]).where(
+            stack.c.raw_template_id.in_(raw_template_ids))
+        raw_tmpl = [i[0] for i in conn.execute(raw_tmpl_sel)]
+        raw_template_ids = set(raw_template_ids) - set(raw_tmpl)
+        raw_tmpl_sel = sqlalchemy.select(
+            [stack.c.prev_raw_template_id]).where(
+            stack.c.prev_raw_template_id.in_(raw_template_ids))
+        raw_tmpl = [i[0] for i in conn.execute(raw_tmpl_sel)]
+        raw_template_ids = raw_template_ids - set(raw_tmpl)
+        blob_sel = sqlalchemy.select(
+            [raw_template.c.template_blob_id,
+             raw_template.c.files_blob_id]).where(
+            raw_template.c.id.in_(raw_template_ids))
+        blob_refs = collections.Counter(
+            blob_id for row in conn.execute(blob_sel)
+            for blob_id in row if blob_id is not None)
+        delete(raw_template, raw_template.c.id.in_(raw_template_ids))
+        if blob_refs:
+            # release the blobs of the raw templates, one update for each
+            # distinct number of references dropped
+            blob_ids_by_refs = collections.defaultdict(list)
+            for blob_id, refs in blob_refs.items():
+                blob_ids_by_refs[refs].append(blob_id)
+            for refs, blob_ids in blob_ids_by_refs.items():
+                conn.execute(raw_template_blob.update().where(
+                    raw_template_blob.c.id.in_(blob_ids)).values(
+                    ref_count=raw_template_blob.c.ref_count - refs))
+            delete(raw_template_blob, sqlalchemy.and_(
+                raw_template_blob.c.id.in_(list(blob_refs)),
+                raw_template_blob.c.ref_count <= 0))
+    # purge any user creds that are no longer referenced
+    user_creds_ids = [i[3] for i in stacks if i[3] is not None]
+    if user_creds_ids:
+        # keep those still referenced
+        user_sel = sqlalchemy.select([stack.c.user_creds_id]).where(
+            stack.c.user_creds_id.in_(user_creds_ids))
+        users = [i[0] for i in conn.execute(user_sel)]
+        user_creds_ids = set(user_creds_ids) - set(users)
+        delete(user_creds, user_creds.c.id.in_(user_creds_ids))
 
 
 def sync_point_delete_all_by_stack_and_traversal(context, stack_id,
                                                  traversal_id):
+    model_query(context, models.SyncPointInput).filter_by(
+        traversal_id=traversal_id).delete()
     rows_deleted = model_query(context, models.SyncPoint).filter_by(
         stack_id=stack_id, traversal_id=traversal_id).delete()
     return rows_deleted
@@ -1198,6 +1533,48 @@ def sync_point_update_input_data(context, entity_id,
     return rows_updated
 
 
+@oslo_db_api.wrap_db_retry(max_retries=3, retry_on_deadlock=True,
+                           retry_interval=0.5, inc_retry_interval=True)
+def sync_point_add_input(context, entity_id, traversal_id, is_update,
+                         sender, input_data):
+    """Record the input of one predecessor to a sync point.
+
+    Returns the input data received so far, as a list of the serialised
+    input data of the sync point itself followed by that of each sender,
+    or None if the sync point does not exist.
+    """
+    entity_id = str(entity_id)
+    key = {'entity_id': entity_id,
+           'traversal_id': traversal_id,
+           'is_update': is_update}
+    session = _session(context)
+    with session.begin():
+        # Bumping the counter locks the sync point row until the end of the
+        # transaction, so that senders are serialised and exactly one of
+        # them will see the input from all of the others.
+        rows_updated = session.query(models.SyncPoint).filter_by(
+            **key).update({'atomic_key': models.SyncPoint.atomic_key + 1})
+        if not rows_updated:
+            return None
+
+        rows_updated = session.query(models.SyncPointInput).filter_by(
+            sender=sender, **key).update({'input_data': input_data})
+        if not rows_updated:
+            input_ref = models.SyncPointInput()
+            input_ref.update(key)
+            input_ref.update({'sender': sender, 'input_data': input_data})
+            session.add(input_ref)
+            session.flush()
+
+        # Input data may also have been stored on the sync point itself
+        # by an engine that predates the sync_point_input table.
+        sync_point = session.query(models.SyncPoint.input_data).filter_by(
+            **key).one()
+        inputs = session.query(models.SyncPointInput.input_data).filter_by(
+            **key)
+        return [sync_point.input_data] + [i.input_data for i in inputs]
+
+
 def db_sync(engine, version=None):
     """Migrate the database to `version` or the most recent version."""
     if version is not None and int(version) < db_version(engine):
@@ -1228,6 +1605,7 @@ def db_encrypt_parameters_and_properties(ctxt, encryption_key, batch_size=50):
         for raw_template in _get_batch(
                 session=session, ctxt=ctxt, query=query,
                 model=models.RawTemplate, batch_size=batch_size):
+            _raw_template_load_blobs(session, [raw_template])
             tmpl = template.Template.load(ctxt, raw_template.id, raw_template)
             param_schemata = tmpl.param_schemata()
             env = raw_template.environment
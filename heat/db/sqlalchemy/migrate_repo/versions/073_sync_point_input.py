@@ -0,0 +1,51 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import sqlalchemy
+
+from heat.db.sqlalchemy import types as heat_db_types
+
+
+def upgrade(migrate_engine):
+    meta = sqlalchemy.MetaData()
+    meta.bind = migrate_engine
+
+    sqlalchemy.Table('sync_point', meta, autoload=True)
+
+    sync_point_input = sqlalchemy.Table(
+        'sync_point_input', meta,
+        sqlalchemy.Column('entity_id', sqlalchemy.String(36)),
+        sqlalchemy.Column('traversal_id', sqlalchemy.String(36)),
+        sqlalchemy.Column('is_update', sqlalchemy.Boolean),
+        sqlalchemy.Column('sender', sqlalchemy.String(64)),
+        sqlalchemy.Column('input_data', heat_db_types.Json),
+        sqlalchemy.Column('created_at', sqlalchemy.DateTime),
+        sqlalchemy.Column('updated_at', sqlalchemy.DateTime),
+
+        sqlalchemy.PrimaryKeyConstraint('entity_id',
+                                        'traversal_id',
+                                        'is_update',
+                                        'sender'),
+        sqlalchemy.ForeignKeyConstraint(['entity_id',
+                                         'traversal_id',
+                                         'is_update'],
+                                        ['sync_point.entity_id',
+                                         'sync_point.traversal_id',
+                                         'sync_point.is_update'],
+                                        name='fk_sync_point'),
+        sqlalchemy.Index('ix_sync_point_input_traversal_id', 'traversal_id'),
+
+        mysql_engine='InnoDB',
+        mysql_charset='utf8'
+    )
+    sync_point_input.create()
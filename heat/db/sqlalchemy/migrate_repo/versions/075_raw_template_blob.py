@@ -0,0 +1,39 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import sqlalchemy
+
+from heat.db.sqlalchemy import types
+
+
+def upgrade(migrate_engine):
+    meta = sqlalchemy.MetaData(bind=migrate_engine)
+
+    raw_template_blob = sqlalchemy.Table(
+        'raw_template_blob', meta,
+        sqlalchemy.Column('id', sqlalchemy.String(64), primary_key=True),
+        sqlalchemy.Column('data', types.Json),
+        sqlalchemy.Column('ref_count', sqlalchemy.Integer, nullable=False),
+        sqlalchemy.Column('created_at', sqlalchemy.DateTime),
+        sqlalchemy.Column('updated_at', sqlalchemy.DateTime),
+        mysql_engine='InnoDB',
+        mysql_charset='utf8'
+    )
+    raw_template_blob.create()
+
+    raw_template = sqlalchemy.Table('raw_template', meta, autoload=True)
+    template_blob_id = sqlalchemy.Column('template_blob_id',
+                                         sqlalchemy.String(64))
+    template_blob_id.create(raw_template)
+    files_blob_id = sqlalchemy.Column('files_blob_id', sqlalchemy.String(64))
+    files_blob_id.create(raw_template)
@@ -90,14 +90,32 @@ class StateAware(object):
     status_reason = sqlalchemy.Column('status_reason', sqlalchemy.Text)
 
 
+class RawTemplateBlob(BASE, HeatBase):
+    """Template contents shared by all of the raw templates that contain them.
+
+    The ID is a digest of the (JSON-serialised) data.
+    """
+
+    __tablename__ = 'raw_template_blob'
+    id = sqlalchemy.Column(sqlalchemy.String(64), primary_key=True)
+    data = sqlalchemy.Column(types.Json)
+    ref_count = sqlalchemy.Column(sqlalchemy.Integer, nullable=False)
+
+
 class RawTemplate(BASE, HeatBase):
-    """Represents an unparsed template which should be in JSON format."""
+    """Represents an unparsed template which should be in JSON format.
+
+    The template and files may be stored in RawTemplateBlobs instead, in
+    which case their columns are empty in the database.
+    """
 
     __tablename__ = 'raw_template'
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
     template = sqlalchemy.Column(types.Json)
     files = sqlalchemy.Column(types.Json)
     environment = sqlalchemy.Column('environment', types.Json)
+    template_blob_id = sqlalchemy.Column(sqlalchemy.String(64))
+    files_blob_id = sqlalchemy.Column(sqlalchemy.String(64))
 
 
 class StackTag(BASE, HeatBase):
@@ -137,6 +155,33 @@ class SyncPoint(BASE, HeatBase):
     input_data = sqlalchemy.Column(types.Json)
 
 
+class SyncPointInput(BASE, HeatBase):
+    """Represents the input to a syncpoint from one of its predecessors."""
+
+    __tablename__ = 'sync_point_input'
+    __table_args__ = (
+        sqlalchemy.PrimaryKeyConstraint('entity_id',
+                                        'traversal_id',
+                                        'is_update',
+                                        'sender'),
+        sqlalchemy.ForeignKeyConstraint(['entity_id',
+                                         'traversal_id',
+                                         'is_update'],
+                                        ['sync_point.entity_id',
+                                         'sync_point.traversal_id',
+                                         'sync_point.is_update'],
+                                        name='fk_sync_point'),
+        sqlalchemy.Index('ix_sync_point_input_traversal_id', 'traversal_id')
+    )
+
+    entity_id = sqlalchemy.Column(sqlalchemy.String(36))
+    traversal_id = sqlalchemy.Column(sqlalchemy.String(36))
+    is_update = sqlalchemy.Column(sqlalchemy.Boolean)
+    # serialised key of the predecessor that sent the input
+    sender = sqlalchemy.Column(sqlalchemy.String(64))
+    input_data = sqlalchemy.Column(types.Json)
+
+
 class Stack(BASE, HeatBase, SoftDelete, StateAware):
     """Represents a stack created by the heat engine."""
 
@@ -179,6 +224,7 @@ class Stack(BASE, HeatBase, SoftDelete, StateAware):
     current_traversal = sqlalchemy.Column('current_traversal',
                                           sqlalchemy.String(36))
     current_deps = sqlalchemy.Column('current_deps', types.Json)
+    current_deps_delta = sqlalchemy.Column('current_deps_delta', types.Json)
 
     # Override timestamp column to store the correct value: it should be the
     # time the create/update call was issued, not the time the DB entry is
@@ -239,7 +285,10 @@ class Event(BASE, HeatBase):
     _resource_status_reason = sqlalchemy.Column(
         'resource_status_reason', sqlalchemy.String(255))
     resource_type = sqlalchemy.Column(sqlalchemy.String(255))
-    resource_properties = sqlalchemy.Column(sqlalchemy.PickleType)
+    # Only events stored before rsrc_prop_data was added use this column
+    _resource_properties = sqlalchemy.Column('resource_properties',
+                                             sqlalchemy.PickleType)
+    rsrc_prop_data = sqlalchemy.Column('rsrc_prop_data', types.CompressedJson)
 
     @property
     def resource_status_reason(self):
@@ -249,6 +298,16 @@ class Event(BASE, HeatBase):
     def resource_status_reason(self, reason):
         self._resource_status_reason = reason and reason[:255] or ''
 
+    @property
+    def resource_properties(self):
+        if self.rsrc_prop_data is not None:
+            return self.rsrc_prop_data
+        return self._resource_properties
+
+    @resource_properties.setter
+    def resource_properties(self, properties):
+        self.rsrc_prop_data = properties
+
 
 class ResourceData(BASE, HeatBase):
     """Key/value store of arbitrary, resource-specific data."""
@@ -11,6 +11,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import zlib
+
 from oslo_serialization import jsonutils
 from sqlalchemy.dialects import mysql
 from sqlalchemy import types
@@ -33,7 +35,7 @@ class LongText(types.TypeDecorator):
 class Json(LongText):
 
     def process_bind_param(self, value, dialect):
-        return dumps(value)
+        return dumps(value, separators=(',', ':'))
 
     def process_result_value(self, value, dialect):
         if value is None:
@@ -57,3 +59,35 @@ class List(types.TypeDecorator):
         if value is None:
             return None
         return loads(value)
+
+
+class CompressedJson(types.TypeDecorator):
+    """Compact JSON, compressed with zlib when that makes it smaller.
+
+    Each value is stored as a one byte tag, followed by either the JSON
+    encoding of the value (tag 'j') or its zlib-compressed form (tag 'z').
+    """
+
+    impl = types.LargeBinary
+
+    # Values smaller than this are not worth compressing
+    compress_min_size = 256
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        data = dumps(value, separators=(',', ':')).encode('utf-8')
+        if len(data) >= self.compress_min_size:
+            compressed = zlib.compress(data)
+            if len(compressed) < len(data):
+                return b'z' + compressed
+        return b'j' + data
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        value = bytes(value)
+        data = value[1:]
+        if value[:1] == b'z':
+            data = zlib.decompress(data)
+        return loads(data.decode('utf-8'))
@@ -43,8 +43,8 @@ IMPL = LazyPluggable('backend',
                      sqlalchemy='heat.db.sqlalchemy.api')
 
 
-def purge_deleted(age, granularity='days'):
-    IMPL.purge_deleted(age, granularity)
+def purge_deleted(age, granularity='days', batch_size=0, sleep_time=0):
+    return IMPL.purge_deleted(age, granularity, batch_size, sleep_time)
 
 
 def encrypt_parameters_and_properties(ctxt, encryption_key):
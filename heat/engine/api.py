@@ -19,9 +19,11 @@ import six
 
 from heat.common.i18n import _
 from heat.common.i18n import _LE
+from heat.common import identifier
 from heat.common import param_utils
 from heat.common import template_format
 from heat.engine import constraints as constr
+from heat.engine import template
 from heat.rpc import api as rpc_api
 
 LOG = logging.getLogger(__name__)
@@ -204,31 +206,49 @@ def format_stack_output(stack, outputs, k, resolve_value=True):
     return result
 
 
-def format_stack(stack, preview=False, resolve_outputs=True):
-    """Return a representation of the given stack.
+def _format_stack_info(identity, name, created_time, updated_time,
+                       parameters, description, disable_rollback, timeout,
+                       username, owner_id, stack_user_project_id, tags):
+    """Return the items that all representations of a stack have.
 
-    Return a representation of the given stack that matches the API output
-    expectations.
+    The parameters are only included if they are not None.
     """
-    updated_time = stack.updated_time and stack.updated_time.isoformat()
-    created_time = stack.created_time or timeutils.utcnow()
+    updated_time = updated_time and updated_time.isoformat()
+    created_time = created_time or timeutils.utcnow()
     info = {
-        rpc_api.STACK_NAME: stack.name,
-        rpc_api.STACK_ID: dict(stack.identifier()),
+        rpc_api.STACK_NAME: name,
+        rpc_api.STACK_ID: dict(identity),
         rpc_api.STACK_CREATION_TIME: created_time.isoformat(),
         rpc_api.STACK_UPDATED_TIME: updated_time,
         rpc_api.STACK_NOTIFICATION_TOPICS: [],  # TODO(?) Not implemented yet
-        rpc_api.STACK_PARAMETERS: stack.parameters.map(six.text_type),
-        rpc_api.STACK_DESCRIPTION: stack.t[stack.t.DESCRIPTION],
-        rpc_api.STACK_TMPL_DESCRIPTION: stack.t[stack.t.DESCRIPTION],
+        rpc_api.STACK_DESCRIPTION: description,
+        rpc_api.STACK_TMPL_DESCRIPTION: description,
         rpc_api.STACK_CAPABILITIES: [],   # TODO(?) Not implemented yet
-        rpc_api.STACK_DISABLE_ROLLBACK: stack.disable_rollback,
-        rpc_api.STACK_TIMEOUT: stack.timeout_mins,
-        rpc_api.STACK_OWNER: stack.username,
-        rpc_api.STACK_PARENT: stack.owner_id,
-        rpc_api.STACK_USER_PROJECT_ID: stack.stack_user_project_id,
-        rpc_api.STACK_TAGS: stack.tags,
+        rpc_api.STACK_DISABLE_ROLLBACK: disable_rollback,
+        rpc_api.STACK_TIMEOUT: timeout,
+        rpc_api.STACK_OWNER: username,
+        rpc_api.STACK_PARENT: owner_id,
+        rpc_api.STACK_USER_PROJECT_ID: stack_user_project_id,
+        rpc_api.STACK_TAGS: tags,
     }
+    if parameters is not None:
+        info[rpc_api.STACK_PARAMETERS] = parameters
+    return info
+
+
+def format_stack(stack, preview=False, resolve_outputs=True):
+    """Return a representation of the given stack.
+
+    Return a representation of the given stack that matches the API output
+    expectations.
+    """
+    info = _format_stack_info(stack.identifier(), stack.name,
+                              stack.created_time, stack.updated_time,
+                              stack.parameters.map(six.text_type),
+                              stack.t[stack.t.DESCRIPTION],
+                              stack.disable_rollback, stack.timeout_mins,
+                              stack.username, stack.owner_id,
+                              stack.stack_user_project_id, stack.tags)
 
     if not preview:
         update_info = {
@@ -247,6 +267,56 @@ def format_stack(stack, preview=False, resolve_outputs=True):
     return info
 
 
+def format_stack_db_object(context, stack, template_data=None):
+    """Return a listing representation of the given stack DB object.
+
+    The result is built directly from the stack versioned object, without
+    constructing a Stack, and outputs are never resolved for a listing.
+
+    If the data of the stack's template is passed, the description is read
+    from it and the parameters are not included. Otherwise the template is
+    loaded to obtain the description and parameters, and the result is the
+    same as format_stack() gives for a stack loaded with resolve_data=False.
+    """
+    stack_identity = identifier.HeatIdentifier(
+        stack.tenant or context.tenant_id, stack.name, stack.id)
+    if template_data is not None:
+        tmpl_class = template.get_template_class(template_data)
+        description = template_data.get(tmpl_class.DESCRIPTION)
+        description = description or 'No description'
+        params = None
+    else:
+        tmpl = template.Template.load(context, stack.raw_template_id,
+                                      stack.raw_template)
+        description = tmpl[tmpl.DESCRIPTION]
+        params = tmpl.parameters(stack_identity,
+                                 user_params=tmpl.env.params,
+                                 param_defaults=tmpl.env.param_defaults)
+        params.set_stack_id(stack_identity)
+        params = params.map(six.text_type)
+
+    tags = None
+    if stack.tags:
+        tags = [t.tag for t in stack.tags]
+
+    info = _format_stack_info(stack_identity, stack.name, stack.created_at,
+                              stack.updated_at, params, description,
+                              stack.disable_rollback, stack.timeout,
+                              stack.username or context.username,
+                              stack.owner_id, stack.stack_user_project_id,
+                              tags)
+    info.update({
+        rpc_api.STACK_ACTION: stack.action or '',
+        rpc_api.STACK_STATUS: stack.status or '',
+        rpc_api.STACK_STATUS_DATA: stack.status_reason,
+    })
+
+    if stack.action != 'DELETE':
+        info[rpc_api.STACK_OUTPUTS] = []
+
+    return info
+
+
 def format_resource_attributes(resource, with_attr=None):
     resolver = resource.attributes
     if not with_attr:
@@ -369,6 +439,39 @@ def format_event(event):
     return result
 
 
+def format_event_db_object(event, stack_identifier):
+    """Return a representation of the given event DB object.
+
+    The result is the same as format_event() gives for the event loaded from
+    the database, but only the identifier of the event's stack is needed.
+    """
+    res_identifier = identifier.ResourceIdentifier(
+        resource_name=event.resource_name, **stack_identifier)
+    event_identifier = identifier.EventIdentifier(
+        event_id=str(event.uuid), **res_identifier)
+    event_timestamp = event.created_at or timeutils.utcnow()
+    try:
+        resource_properties = dict(getattr(event, 'resource_properties', {}))
+    except ValueError as ex:
+        resource_properties = {'Error': six.text_type(ex)}
+
+    result = {
+        rpc_api.EVENT_ID: dict(event_identifier),
+        rpc_api.EVENT_STACK_ID: dict(stack_identifier),
+        rpc_api.EVENT_STACK_NAME: stack_identifier.stack_name,
+        rpc_api.EVENT_TIMESTAMP: event_timestamp.isoformat(),
+        rpc_api.EVENT_RES_NAME: event.resource_name,
+        rpc_api.EVENT_RES_PHYSICAL_ID: event.physical_resource_id,
+        rpc_api.EVENT_RES_ACTION: event.resource_action,
+        rpc_api.EVENT_RES_STATUS: event.resource_status,
+        rpc_api.EVENT_RES_STATUS_DATA: event.resource_status_reason,
+        rpc_api.EVENT_RES_TYPE: event.resource_type,
+        rpc_api.EVENT_RES_PROPERTIES: resource_properties,
+    }
+
+    return result
+
+
 def format_notification_body(stack):
     # some other possibilities here are:
     # - template name
@@ -78,6 +78,13 @@ class ParamRef(function.Function):
 
         self.parameters = self.stack.parameters
 
+    @property
+    def pure(self):
+        # The values of pseudo parameters (e.g. the stack ID) can change
+        return (isinstance(self.args, six.string_types) and
+                self.args not in getattr(self.parameters,
+                                         'PSEUDO_PARAMETERS', ()))
+
     def result(self):
         param_name = function.resolve(self.args)
 
@@ -171,6 +178,10 @@ class GetAtt(function.Function):
         return itertools.chain(super(GetAtt, self).dep_attrs(resource_name),
                                attrs)
 
+    def all_dep_attrs(self):
+        attrs = [(self._resource().name, function.resolve(self._attribute))]
+        return itertools.chain(super(GetAtt, self).all_dep_attrs(), attrs)
+
     def dependencies(self, path):
         return itertools.chain(super(GetAtt, self).dependencies(path),
                                [self._resource(path)])
@@ -225,6 +236,8 @@ class Select(function.Function):
     string.
     """
 
+    pure = True
+
     def __init__(self, stack, fn_name, args):
         super(Select, self).__init__(stack, fn_name, args)
 
@@ -295,6 +308,8 @@ class Join(function.Function):
         "<string_1><delim><string_2><delim>..."
     """
 
+    pure = True
+
     def __init__(self, stack, fn_name, args):
         super(Join, self).__init__(stack, fn_name, args)
 
@@ -349,6 +364,8 @@ class Split(function.Function):
         [ "<string_1>", "<string_2>", ... ]
     """
 
+    pure = True
+
     def __init__(self, stack, fn_name, args):
         super(Split, self).__init__(stack, fn_name, args)
 
@@ -397,6 +414,8 @@ class Replace(function.Function):
     which replacements are performed is undefined.
     """
 
+    pure = True
+
     def __init__(self, stack, fn_name, args):
         super(Replace, self).__init__(stack, fn_name, args)
 
@@ -469,6 +488,8 @@ class Base64(function.Function):
     in plain text.
     """
 
+    pure = True
+
     def result(self):
         resolved = function.resolve(self.args)
         if not isinstance(resolved, six.string_types):
@@ -494,6 +515,8 @@ class MemberListToMap(function.Function):
     The first two arguments are the names of the key and value.
     """
 
+    pure = True
+
     def __init__(self, stack, fn_name, args):
         super(MemberListToMap, self).__init__(stack, fn_name, args)
 
@@ -198,6 +198,7 @@ class CfnTemplate(template.Template):
         if self.t.get(self.RESOURCES) is None:
             self.t[self.RESOURCES] = {}
         self.t[self.RESOURCES][name] = cfn_tmpl
+        self.dep_attrs_index = None
 
 
 class HeatTemplate(CfnTemplate):
@@ -22,11 +22,13 @@ from keystoneclient.auth.identity import v3
 from keystoneclient import exceptions
 from keystoneclient import session
 from oslo_config import cfg
+from oslo_utils import excutils
 import requests
 import six
 
 from heat.common import config
 from heat.common.i18n import _
+from heat.common import timeutils
 
 cfg.CONF.import_opt('client_retry_limit', 'heat.common.config')
 
@@ -88,6 +90,124 @@ class ExceptionFilter(object):
                 raise ex
 
 
+class BatchPoller(object):
+    """Poll the status of many objects of the same type together.
+
+    Resources polling for the status of an object call fetch() at each poll.
+    An object's first poll is always made individually, but once more than
+    one object is being polled, a poll for an object whose last result has
+    already been used refreshes all of them with a single call to list_func.
+    The remaining objects then use the results from that call, provided that
+    they are no more than max_age seconds old. Objects missing from the list
+    are fetched individually.
+
+    list_func generally returns every object in the tenant, or the first
+    page of them, so a list only pays off when the objects being polled make
+    up a large enough share of it. The number of objects in the tenant is
+    estimated from each list, and objects are polled individually while
+    they are fewer than 1/LIST_RATIO of that estimate. The estimate is
+    forgotten after ESTIMATE_AGE seconds, so that the tenant is listed again
+    from time to time.
+
+    Results from list_func are used for up to the longest interval between
+    two polls of an object, so a change of status is seen no later than an
+    object polled individually at that interval would see it. An object
+    that has not been polled for twice that interval, for instance because
+    its task was cancelled or timed out, is no longer counted as being
+    polled.
+
+    :param fetch_func: called with an object ID to fetch a single object
+    :param list_func: called with no arguments to fetch a list of objects,
+                      or returns None if the objects are temporarily
+                      unavailable
+    :param poll_interval: the scheduler.PollInterval policy for the polls
+    """
+
+    LIST_RATIO = 4
+    ESTIMATE_AGE = 300
+
+    def __init__(self, fetch_func, list_func, poll_interval):
+        self._fetch = fetch_func
+        self._list = list_func
+        self.max_age = poll_interval.max_delay()
+        self.stale_after = 2 * self.max_age
+        self._pending = {}
+        self._results = {}
+        self._expiry = None
+        self._tenant_size = 0
+        self._tenant_size_expiry = None
+
+    # Placeholder result for objects that must be fetched individually
+    _UNLISTED = object()
+
+    def _should_list(self):
+        if len(self._pending) < 2:
+            return False
+        if (self._tenant_size_expiry is not None and
+                self._tenant_size_expiry.expired()):
+            self._tenant_size = 0
+        return len(self._pending) * self.LIST_RATIO >= self._tenant_size
+
+    def _estimate_tenant_size(self, objs, found):
+        """Estimate the number of objects in the tenant from a list.
+
+        The list may be only the first page of the objects, in which case
+        the share of the objects being polled that it contains is taken as
+        the share of the tenant's objects that it contains.
+        """
+        if found:
+            size = len(objs) * len(self._pending) // found
+        else:
+            size = float('inf')
+        self._tenant_size = max(size, len(objs))
+        self._tenant_size_expiry = timeutils.Duration(self.ESTIMATE_AGE)
+
+    def _refresh(self):
+        for obj_id, polled in list(self._pending.items()):
+            if polled.expired():
+                self.discard(obj_id)
+
+        self._expiry = timeutils.Duration(self.max_age)
+        self._results = dict.fromkeys(self._pending, self._UNLISTED)
+        if not self._should_list():
+            return
+
+        objs = self._list()
+        if objs is None:
+            self._results = dict.fromkeys(self._pending)
+        else:
+            listed = dict((obj.id, obj) for obj in objs
+                          if obj.id in self._pending)
+            self._results.update(listed)
+            self._estimate_tenant_size(objs, len(listed))
+
+    def fetch(self, obj_id):
+        """Return an up-to-date object with the given ID.
+
+        If the object can not be fetched, it is no longer counted as being
+        polled.
+        """
+        try:
+            if obj_id in self._pending and (obj_id not in self._results or
+                                            self._expiry.expired()):
+                self._refresh()
+
+            # An object's first poll is always individual
+            obj = self._results.pop(obj_id, self._UNLISTED)
+            self._pending[obj_id] = timeutils.Duration(self.stale_after)
+            if obj is self._UNLISTED:
+                return self._fetch(obj_id)
+            return obj
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                self.discard(obj_id)
+
+    def discard(self, obj_id):
+        """Stop polling the object with the given ID."""
+        self._pending.pop(obj_id, None)
+        self._results.pop(obj_id, None)
+
+
 @six.add_metaclass(abc.ABCMeta)
 class ClientPlugin(object):
 
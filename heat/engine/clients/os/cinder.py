@@ -19,14 +19,19 @@ from oslo_log import log as logging
 from heat.common import exception
 from heat.common.i18n import _
 from heat.common.i18n import _LI
+from heat.common.i18n import _LW
 from heat.engine.clients import client_plugin
 from heat.engine import constraints
+from heat.engine import scheduler
 
 
 LOG = logging.getLogger(__name__)
 
 CLIENT_NAME = 'cinder'
 
+# The policy for polling Cinder for the status of a volume
+VOLUME_POLL_INTERVAL = scheduler.ExponentialBackoff(max_interval=15)
+
 
 class CinderClientPlugin(client_plugin.ClientPlugin):
 
@@ -34,6 +39,29 @@ class CinderClientPlugin(client_plugin.ClientPlugin):
 
     service_types = [VOLUME, VOLUME_V2] = ['volume', 'volumev2']
 
+    def __init__(self, context):
+        super(CinderClientPlugin, self).__init__(context)
+        self.volume_poller = client_plugin.BatchPoller(
+            lambda vol_id: self.client().volumes.get(vol_id),
+            self._list_volumes, VOLUME_POLL_INTERVAL)
+
+    def _list_volumes(self):
+        """Fetch a list of volumes from Cinder for polling their status.
+
+        Log warnings and return None for non-critical API errors.
+        """
+        try:
+            return self.client().volumes.list(detailed=True)
+        except exceptions.OverLimit as exc:
+            LOG.warning(_LW("Received an OverLimit response when "
+                            "listing volumes : %s"), exc)
+        except exceptions.ClientException as exc:
+            if exc.code in (500, 503):
+                LOG.warning(_LW("Received the following exception when "
+                                "listing volumes : %s"), exc)
+            else:
+                raise
+
     def get_volume_api_version(self):
         '''Returns the most recent API version.'''
 
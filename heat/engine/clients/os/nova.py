@@ -36,6 +36,7 @@ from heat.common.i18n import _LW
 from heat.engine.clients import client_plugin
 from heat.engine.clients import os as os_client
 from heat.engine import constraints
+from heat.engine import scheduler
 
 LOG = logging.getLogger(__name__)
 
@@ -43,6 +44,9 @@ LOG = logging.getLogger(__name__)
 NOVACLIENT_VERSION = "2"
 CLIENT_NAME = 'nova'
 
+# The policy for polling Nova for the status of a server
+SERVER_POLL_INTERVAL = scheduler.ExponentialBackoff(max_interval=15)
+
 
 class NovaClientPlugin(client_plugin.ClientPlugin):
 
@@ -61,6 +65,12 @@ class NovaClientPlugin(client_plugin.ClientPlugin):
 
     service_types = [COMPUTE] = ['compute']
 
+    def __init__(self, context):
+        super(NovaClientPlugin, self).__init__(context)
+        self.server_poller = client_plugin.BatchPoller(
+            lambda server_id: self.fetch_server(server_id),
+            self._list_servers, SERVER_POLL_INTERVAL)
+
     def _create(self):
         endpoint_type = self._get_client_option(CLIENT_NAME, 'endpoint_type')
         management_url = self.url_for(service_type=self.COMPUTE,
@@ -145,6 +155,24 @@ class NovaClientPlugin(client_plugin.ClientPlugin):
                 raise
         return server
 
+    def _list_servers(self):
+        """Fetch a list of servers from Nova for polling their status.
+
+        Log warnings and return None for non-critical API errors.
+        """
+        try:
+            return self.client().servers.list(detailed=True)
+        except exceptions.OverLimit as exc:
+            LOG.warning(_LW("Received an OverLimit response when "
+                            "listing servers : %s"), exc)
+        except exceptions.ClientException as exc:
+            if ((getattr(exc, 'http_status', getattr(exc, 'code', None)) in
+                 (500, 503))):
+                LOG.warning(_LW("Received the following exception when "
+                            "listing servers : %s"), exc)
+            else:
+                raise
+
     def refresh_server(self, server):
         """Refresh server's attributes.
 
@@ -194,17 +222,22 @@ class NovaClientPlugin(client_plugin.ClientPlugin):
         raises errors when server has an ERROR or unknown to Heat status,
         returns False otherwise.
 
+        Servers given by ID are polled together with any other servers whose
+        status is being checked, using the server_poller.
+
         :param res_name: name of the resource to use in the exception message
 
         """
         # not checking with is_uuid_like as most tests use strings e.g. '1234'
         if isinstance(server, six.string_types):
-            server = self.fetch_server(server)
+            server_id = server
+            server = self.server_poller.fetch(server_id)
             if server is None:
                 return False
             else:
                 status = self.get_status(server)
         else:
+            server_id = None
             status = self.get_status(server)
             if status != 'ACTIVE':
                 self.refresh_server(server)
@@ -212,7 +245,11 @@ class NovaClientPlugin(client_plugin.ClientPlugin):
 
         if status in self.deferred_server_statuses:
             return False
-        elif status == 'ACTIVE':
+
+        if server_id is not None:
+            self.server_poller.discard(server_id)
+
+        if status == 'ACTIVE':
             return True
         elif status == 'ERROR':
             fault = getattr(server, 'fault', {})
@@ -145,6 +145,13 @@ class ResourceInfo(object):
     def get_resource_info(self, resource_type=None, resource_name=None):
         return self
 
+    def bind(self, registry):
+        """Return a copy of the mapping that belongs to another registry."""
+        info = type(self).__new__(type(self), registry, self.path, self.value)
+        info.__dict__.update(self.__dict__)
+        info.registry = registry
+        return info
+
     def matches(self, resource_type):
         return False
 
@@ -252,6 +259,57 @@ class ResourceRegistry(object):
         self._registry = {'resources': {}}
         self.global_registry = global_registry
         self.environment = env
+        self._version = 0
+        self._globs = None
+        self._info_cache = {}
+        self._info_cache_version = None
+        self._shared = False
+        self._bound = None
+
+    def copy(self, env):
+        """Return a copy of the registry for a child environment.
+
+        The copy shares the contents of this registry until either of them is
+        modified. The mappings of this registry are copied into the child
+        registry only when the child uses them.
+        """
+        child = ResourceRegistry(self.global_registry, env)
+        child._registry = self._registry
+        child._shared = self._shared = True
+        child._bound = {}
+        return child
+
+    def _unshare(self):
+        """Take a private copy of the contents before modifying them."""
+        if not self._shared:
+            return
+
+        def copy_level(level):
+            return dict((k, copy_level(v) if isinstance(v, dict) else v)
+                        for k, v in six.iteritems(level))
+
+        self._registry = copy_level(self._registry)
+        self._shared = False
+
+    def _bind(self, info):
+        """Return the mapping belonging to this registry for an entry.
+
+        Entries shared with a parent registry are copied the first time they
+        are used, so that they refer to this registry.
+        """
+        if self._bound is None or info.registry is self:
+            return info
+        # The original is kept so that its id cannot be reused
+        original, bound = self._bound.get(id(info), (None, None))
+        if original is not info:
+            bound = info.bind(self)
+            self._bound[id(info)] = (info, bound)
+        return bound
+
+    def _changed(self):
+        """Discard the lookup indexes after the registry has been modified."""
+        self._version += 1
+        self._globs = None
 
     def load(self, json_snippet):
         self._load_registry([], json_snippet)
@@ -275,6 +333,7 @@ class ResourceRegistry(object):
                                     ResourceInfo(self, path + [k], v))
 
     def _register_item(self, path, item):
+        self._unshare()
         name = path[-1]
         registry = self._registry
         for key in path[:-1]:
@@ -282,12 +341,14 @@ class ResourceRegistry(object):
                 registry[key] = {}
             registry = registry[key]
         registry[name] = item
+        self._changed()
 
     def _register_info(self, path, info):
         """Place the new info in the correct location in the registry.
 
         :param path: a list of keys ['resources', 'my_srv', 'OS::Nova::Server']
         """
+        self._unshare()
         descriptive_path = '/'.join(path)
         name = path[-1]
         # create the structure if needed
@@ -313,6 +374,7 @@ class ResourceRegistry(object):
                     'item': name,
                     'path': descriptive_path})
                 registry.pop(name, None)
+            self._changed()
             return
 
         if name in registry and isinstance(registry[name], ResourceInfo):
@@ -340,6 +402,7 @@ class ResourceRegistry(object):
 
         info.user_resource = (self.global_registry is not None)
         registry[name] = info
+        self._changed()
 
     def log_resource_info(self, show_all=False, prefix=None):
         registry = self._registry
@@ -357,11 +420,13 @@ class ResourceRegistry(object):
         if not isinstance(info, TemplateResourceInfo):
             return
 
+        self._unshare()
         registry = self._registry
         for key in info.path[:-1]:
             registry = registry[key]
         if info.path[-1] in registry:
             registry.pop(info.path[-1])
+            self._changed()
 
     def get_rsrc_restricted_actions(self, resource_name):
         """Returns a set of restricted actions.
@@ -435,7 +500,13 @@ class ResourceRegistry(object):
                 new_resources.update(res)
         if resource_name in ress:
             new_resources.update(ress[resource_name])
-        self._registry['resources'] = new_resources
+        if new_resources or ress:
+            if self._shared:
+                # Only the top level is modified, so it is not necessary to
+                # copy the rest of the shared contents.
+                self._registry = dict(self._registry)
+            self._registry['resources'] = new_resources
+            self._changed()
 
     def iterable_by(self, resource_type, resource_name=None):
         is_templ_type = resource_type.endswith(('.yaml', '.template'))
@@ -447,26 +518,26 @@ class ResourceRegistry(object):
             if resource_type not in self._registry:
                 res = ResourceInfo(self, [resource_type], None)
                 self._register_info([resource_type], res)
-            yield self._registry[resource_type]
+            yield self._bind(self._registry[resource_type])
 
         # handle a specific resource mapping.
         if resource_name:
             impl = self._registry['resources'].get(resource_name)
             if impl and resource_type in impl:
-                yield impl[resource_type]
+                yield self._bind(impl[resource_type])
 
         # handle: "OS::Nova::Server" -> "Rackspace::Cloud::Server"
         impl = self._registry.get(resource_type)
         if impl:
-            yield impl
+            yield self._bind(impl)
 
         # handle: "OS::*" -> "Dreamhost::*"
-        def is_a_glob(resource_type):
-            return resource_type.endswith('*')
-        globs = six.moves.filter(is_a_glob, six.iterkeys(self._registry))
-        for pattern in globs:
-            if self._registry[pattern].matches(resource_type):
-                yield self._registry[pattern]
+        if self._globs is None:
+            self._globs = [info for name, info in six.iteritems(self._registry)
+                           if name.endswith('*')]
+        for info in self._globs:
+            if info.matches(resource_type):
+                yield self._bind(info)
 
     def get_resource_info(self, resource_type, resource_name=None,
                           registry_type=None, ignore=None):
@@ -489,6 +560,41 @@ class ResourceRegistry(object):
         # 4) as_dict() to write to the db
         #    - filter_by(is_user=True)
 
+        if ignore is not None:
+            return self._find_resource_info(resource_type, resource_name,
+                                            registry_type, ignore)
+
+        key = (resource_type, resource_name, registry_type)
+        try:
+            return self._cached_resource_info()[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # not hashable, so it can't be found anyway
+            return self._find_resource_info(resource_type, resource_name,
+                                            registry_type, ignore)
+
+        match = self._find_resource_info(resource_type, resource_name,
+                                         registry_type, ignore)
+        self._cached_resource_info()[key] = match
+        return match
+
+    def _cached_resource_info(self):
+        """Return the stored results of get_resource_info().
+
+        The results depend on the contents of both this registry and the
+        global registry, so they are discarded when either one changes.
+        """
+        version = (self._version,
+                   self.global_registry._version
+                   if self.global_registry is not None else None)
+        if version != self._info_cache_version:
+            self._info_cache = {}
+            self._info_cache_version = version
+        return self._info_cache
+
+    def _find_resource_info(self, resource_type, resource_name,
+                            registry_type, ignore):
         if self.global_registry is not None:
             giter = self.global_registry.iterable_by(resource_type,
                                                      resource_name)
@@ -621,9 +727,12 @@ class ResourceRegistry(object):
             return (version is None or
                     cls.get_class().support_status.version == version)
 
-        return [name for name, cls in six.iteritems(self._registry)
-                if (is_resource(name) and
-                    name_matches(name) and
+        resource_infos = ((name, self._bind(info))
+                          for name, info in six.iteritems(self._registry)
+                          if is_resource(name))
+
+        return [name for name, cls in resource_infos
+                if (name_matches(name) and
                     status_matches(cls) and
                     is_available(cls) and
                     is_allowed(enforcer, name) and
@@ -771,14 +880,17 @@ def get_child_environment(parent_env, child_params, item_to_remove=None,
                 return False
         return True
 
-    child_env = parent_env.user_env_as_dict()
-    child_env[env_fmt.PARAMETERS] = {}
     flat_params = is_flat_params(child_params)
     new_env = Environment()
+    # The registry and event sinks are shared with the parent rather than
+    # being reloaded from its serialised form.
+    new_env.registry = parent_env.registry.copy(new_env)
+    new_env.param_defaults.update(parent_env.param_defaults)
+    new_env._event_sinks.extend(parent_env._event_sinks)
+    new_env._built_event_sinks.extend(parent_env._built_event_sinks)
     if flat_params and child_params is not None:
-        child_env[env_fmt.PARAMETERS] = child_params
+        new_env.params.update(child_params)
 
-    new_env.load(child_env)
     if not flat_params and child_params is not None:
         new_env.load(child_params)
 
@@ -11,11 +11,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import pickle
-import six
-
 import oslo_db.exception
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
+import six
 
 from heat.common import exception
 from heat.common.i18n import _
@@ -24,7 +23,12 @@ from heat.objects import event as event_object
 
 LOG = logging.getLogger(__name__)
 
-MAX_EVENT_RESOURCE_PROPERTIES_SIZE = (1 << 16) - 1
+# The size of a BLOB, less the byte that tags how the data is encoded
+MAX_EVENT_RESOURCE_PROPERTIES_SIZE = (1 << 16) - 2
+
+
+def _json_size(value):
+    return len(jsonutils.dumps(value, separators=(',', ':')))
 
 
 class Event(object):
@@ -70,11 +74,10 @@ class Event(object):
 
         return cls(context, st, ev.resource_action, ev.resource_status,
                    ev.resource_status_reason, ev.physical_resource_id,
-                   ev.resource_properties, ev.resource_name,
+                   getattr(ev, 'resource_properties', {}), ev.resource_name,
                    ev.resource_type, ev.uuid, ev.created_at, ev.id)
 
-    def store(self):
-        """Store the Event in the database."""
+    def _db_values(self):
         ev = {
             'resource_name': self.resource_name,
             'physical_resource_id': self.physical_resource_id,
@@ -95,25 +98,40 @@ class Event(object):
         # Workaround: we don't want to attempt to store the
         # event.resource_properties column if the data is too large
         # (greater than permitted by BLOB). Otherwise, we end up with
-        # an unsightly log message.
-        rp_size = len(pickle.dumps(ev['resource_properties']))
+        # an unsightly log message. The properties are stored as compact
+        # JSON, compressed if that is smaller, so the size of the JSON is an
+        # upper bound on the stored size.
+        rp_size = _json_size(ev['resource_properties'])
         if rp_size > MAX_EVENT_RESOURCE_PROPERTIES_SIZE:
             LOG.debug('event\'s resource_properties too large to store at '
                       '%d bytes', rp_size)
             # Try truncating the largest value and see if that gets us under
             # the db column's size constraint.
-            max_key, max_val = max(ev['resource_properties'].items(),
-                                   key=lambda i: len(repr(i[1])))
+            val_sizes = dict((k, _json_size(v))
+                             for k, v in ev['resource_properties'].items())
+            max_key = max(val_sizes, key=val_sizes.get)
             err = 'Resource properties are too large to store fully'
+            ev['resource_properties'] = dict(ev['resource_properties'])
             ev['resource_properties'].update({'Error': err})
             ev['resource_properties'][max_key] = '<Deleted, too large>'
-            rp_size = len(pickle.dumps(ev['resource_properties']))
+            rp_size = _json_size(ev['resource_properties'])
             if rp_size > MAX_EVENT_RESOURCE_PROPERTIES_SIZE:
                 LOG.debug('event\'s resource_properties STILL too large '
                           'after truncating largest key at %d bytes', rp_size)
                 err = 'Resource properties are too large to attempt to store'
                 ev['resource_properties'] = {'Error': err}
 
+        return ev
+
+    def _stored(self, new_ev):
+        self.id = new_ev.id
+        self.timestamp = new_ev.created_at
+        self.uuid = new_ev.uuid
+
+    def store(self):
+        """Store the Event in the database."""
+        ev = self._db_values()
+
         # We should have worked around the issue, but let's be extra
         # careful.
         try:
@@ -124,11 +142,29 @@ class Event(object):
             ev['resource_properties'] = {'Error': err}
             new_ev = event_object.Event.create(self.context, ev)
 
-        self.id = new_ev.id
-        self.timestamp = new_ev.created_at
-        self.uuid = new_ev.uuid
+        self._stored(new_ev)
         return self.id
 
+    @staticmethod
+    def store_all(context, events):
+        """Store a list of Events in the database, in order.
+
+        The events are written with a single multi-row insert where possible.
+        """
+        if not events:
+            return
+        try:
+            new_evs = event_object.Event.create_many(
+                context, [ev._db_values() for ev in events])
+        except oslo_db.exception.DBError:
+            # Store them one at a time, so that only the properties of any
+            # offending events are dropped
+            for ev in events:
+                ev.store()
+        else:
+            for ev, new_ev in zip(events, new_evs):
+                ev._stored(new_ev)
+
     def identifier(self):
         """Return a unique identifier for the event."""
         if self.uuid is None:
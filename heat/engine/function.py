@@ -23,6 +23,13 @@ import six
 class Function(object):
     """Abstract base class for template functions."""
 
+    #: Whether the result of the function depends only on its arguments.
+    #: When all of the arguments of a pure function are constant, its result
+    #: is calculated only once.
+    pure = False
+
+    _constant = None
+
     def __init__(self, stack, fn_name, args):
         """Initialise with a Stack, the function name and the arguments.
 
@@ -62,6 +69,31 @@ class Function(object):
         """
         return {self.fn_name: self.args}
 
+    def is_constant(self):
+        """Return whether the result of the function can never change.
+
+        This is the case for pure functions whose arguments are all constant.
+        """
+        if self._constant is None:
+            self._constant = self.pure and is_constant(self.args)
+        return self._constant
+
+    def constant_result(self):
+        """Return the resolved result of a constant function.
+
+        The result is calculated the first time this is called and stored for
+        subsequent calls. Errors are not stored, so a function that fails is
+        evaluated again each time. A TypeError is raised if the function is
+        not constant.
+        """
+        if not self.is_constant():
+            raise TypeError('Function %s is not constant' % self.fn_name)
+        try:
+            return self._constant_result
+        except AttributeError:
+            self._constant_result = resolve(self.result())
+            return self._constant_result
+
     def dependencies(self, path):
         return dependencies(self.args, '.'.join([path, self.fn_name]))
 
@@ -73,6 +105,14 @@ class Function(object):
         """
         return dep_attrs(self.args, resource_name)
 
+    def all_dep_attrs(self):
+        """Return the attributes of all resources that are referenced.
+
+        Return an iterator over (resource name, attribute) pairs for the
+        attributes that this function references.
+        """
+        return all_dep_attrs(self.args)
+
     def __reduce__(self):
         """Return a representation of the function suitable for pickling.
 
@@ -128,6 +168,9 @@ class Function(object):
 
 def resolve(snippet):
     while isinstance(snippet, Function):
+        if snippet.is_constant():
+            snippet = snippet.constant_result()
+            break
         snippet = snippet.result()
 
     if isinstance(snippet, collections.Mapping):
@@ -139,6 +182,50 @@ def resolve(snippet):
     return snippet
 
 
+def is_constant(snippet):
+    """Return whether a template snippet always resolves to the same value.
+
+    The snippet should be already parsed to insert Function objects where
+    appropriate.
+    """
+    if isinstance(snippet, Function):
+        return snippet.is_constant()
+    elif isinstance(snippet, collections.Mapping):
+        return all(is_constant(v) for v in six.itervalues(snippet))
+    elif (not isinstance(snippet, six.string_types) and
+          isinstance(snippet, collections.Iterable)):
+        return all(is_constant(v) for v in snippet)
+    return True
+
+
+def live_results(snippet):
+    """Return an iterator over the results of the live parts of a snippet.
+
+    The snippet should be already parsed to insert Function objects where
+    appropriate.
+
+    The live parts are the functions whose results may change, other than
+    pure functions (whose results change only when their arguments do). The
+    snippet resolves to the same value for as long as the results of all of
+    its live parts are unchanged.
+    """
+    if isinstance(snippet, Function):
+        if snippet.is_constant():
+            return []
+        elif snippet.pure:
+            return live_results(snippet.args)
+        return [resolve(snippet)]
+
+    elif isinstance(snippet, collections.Mapping):
+        results = (live_results(value) for value in six.itervalues(snippet))
+        return itertools.chain.from_iterable(results)
+    elif (not isinstance(snippet, six.string_types) and
+          isinstance(snippet, collections.Iterable)):
+        results = (live_results(value) for value in snippet)
+        return itertools.chain.from_iterable(results)
+    return []
+
+
 def validate(snippet):
     if isinstance(snippet, Function):
         snippet.validate()
@@ -203,3 +290,26 @@ def dep_attrs(snippet, resource_name):
         attrs = (dep_attrs(value, resource_name) for value in snippet)
         return itertools.chain.from_iterable(attrs)
     return []
+
+
+def all_dep_attrs(snippet):
+    """Iterator over the dependent attrs of all resources in a snippet.
+
+    The snippet should be already parsed to insert Function objects where
+    appropriate.
+
+    :returns: an iterator over (resource name, attribute) pairs for all of
+    the attributes that are referenced in the template snippet.
+    """
+
+    if isinstance(snippet, Function):
+        return snippet.all_dep_attrs()
+
+    elif isinstance(snippet, collections.Mapping):
+        attrs = (all_dep_attrs(value) for value in snippet.items())
+        return itertools.chain.from_iterable(attrs)
+    elif (not isinstance(snippet, six.string_types) and
+          isinstance(snippet, collections.Iterable)):
+        attrs = (all_dep_attrs(value) for value in snippet)
+        return itertools.chain.from_iterable(attrs)
+    return []
@@ -45,6 +45,17 @@ class GetParam(function.Function):
 
         self.parameters = self.stack.parameters
 
+    @property
+    def pure(self):
+        param_name = self.args
+        if (not isinstance(param_name, six.string_types) and
+                isinstance(param_name, collections.Sequence) and param_name):
+            param_name = param_name[0]
+        # The values of pseudo parameters (e.g. the stack ID) can change
+        return (isinstance(param_name, six.string_types) and
+                param_name not in getattr(self.parameters,
+                                          'PSEUDO_PARAMETERS', ()))
+
     def result(self):
         args = function.resolve(self.args)
 
@@ -137,6 +148,14 @@ class GetAttThenSelect(cfn_funcs.GetAtt):
         return itertools.chain(function.dep_attrs(self.args, resource_name),
                                attrs)
 
+    def all_dep_attrs(self):
+        path = function.resolve(self._path_components)
+        attr = function.resolve(self._attribute)
+        if path:
+            attr = tuple([attr] + path)
+        return itertools.chain(function.all_dep_attrs(self.args),
+                               [(self._resource().name, attr)])
+
 
 class GetAtt(GetAttThenSelect):
     """A function for resolving resource attributes.
@@ -206,6 +225,13 @@ class GetAttAllAttributes(GetAtt):
         return itertools.chain(function.dep_attrs(self.args,
                                                   resource_name), attrs)
 
+    def all_dep_attrs(self):
+        if self._attribute is not None:
+            return super(GetAttAllAttributes, self).all_dep_attrs()
+        res = self._resource()
+        attrs = ((res.name, attr) for attr in res.attributes_schema)
+        return itertools.chain(function.all_dep_attrs(self.args), attrs)
+
     def result(self):
         if self._attribute is None:
             r = self._resource()
@@ -370,6 +396,8 @@ class JoinMultiple(function.Function):
     Optionally multiple lists may be specified, which will also be joined.
     """
 
+    pure = True
+
     def __init__(self, stack, fn_name, args):
         super(JoinMultiple, self).__init__(stack, fn_name, args)
         example = '"%s" : [ " ", [ "str1", "str2"] ...]' % fn_name
@@ -440,6 +468,8 @@ class MapMerge(function.Function):
 
     """
 
+    pure = True
+
     def __init__(self, stack, fn_name, args):
         super(MapMerge, self).__init__(stack, fn_name, args)
         example = (_('"%s" : [ { "key1": "val1" }, { "key2": "val2" } ]')
@@ -519,6 +549,9 @@ class Repeat(function.Function):
     is a copy of <body> with any occurrences of <var> replaced with the
     corresponding item of <list>.
     """
+
+    pure = True
+
     def __init__(self, stack, fn_name, args):
         super(Repeat, self).__init__(stack, fn_name, args)
 
@@ -595,6 +628,8 @@ class Digest(function.Function):
     sha224, sha256, sha384, and sha512) or any one provided by OpenSSL.
     """
 
+    pure = True
+
     def validate_usage(self, args):
         if not (isinstance(args, list) and
                 all([isinstance(a, six.string_types) for a in args])):
@@ -647,6 +682,8 @@ class StrSplit(function.Function):
     path based attributes accessing lists.
     """
 
+    pure = True
+
     def __init__(self, stack, fn_name, args):
         super(StrSplit, self).__init__(stack, fn_name, args)
         example = '"%s" : [ ",", "apples,pears", <index>]' % fn_name
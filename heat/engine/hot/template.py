@@ -284,6 +284,7 @@ class HOTemplate20130523(template.Template):
         if self.t.get(self.RESOURCES) is None:
             self.t[self.RESOURCES] = {}
         self.t[self.RESOURCES][name] = definition.render_hot()
+        self.dep_attrs_index = None
 
 
 class HOTemplate20141016(HOTemplate20130523):
@@ -12,6 +12,7 @@
 #    under the License.
 
 import collections
+import copy
 
 from oslo_serialization import jsonutils
 import six
@@ -36,6 +37,9 @@ SCHEMA_KEYS = (
     'Immutable',
 )
 
+CacheInfo = collections.namedtuple('CacheInfo',
+                                   ['hits', 'misses', 'invalidations'])
+
 
 class Schema(constr.Schema):
     """Schema class for validating resource properties.
@@ -345,6 +349,10 @@ class Properties(collections.Mapping):
         if section is not None:
             self.error_prefix.append(section)
         self.context = context
+        self._cache = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_invalidations = 0
 
     @staticmethod
     def schema_from_params(params_snippet):
@@ -408,6 +416,47 @@ class Properties(collections.Mapping):
                 message=ex.error_message
             )
 
+    def clear_cache(self):
+        """Discard the stored values of the properties.
+
+        This must be called after modifying the contents of the property data
+        in place.
+        """
+        self._cache.clear()
+
+    def cache_info(self):
+        """Return the statistics of the stored property values.
+
+        Returns the number of times a stored value was used, the number of
+        times a value was not stored and the number of times a stored value
+        was discarded because the results of the functions it depends on
+        changed.
+        """
+        return CacheInfo(self._cache_hits, self._cache_misses,
+                         self._cache_invalidations)
+
+    def _get_cached_value(self, key, unresolved_value):
+        """Return the value of a property, resolving it only when necessary.
+
+        The value is stored along with the results of the live functions
+        (e.g. get_attr and get_resource) in the property data, and is used
+        for as long as those results are unchanged.
+        """
+        live = list(function.live_results(unresolved_value))
+        try:
+            data, stored_live, value = self._cache[key]
+        except KeyError:
+            self._cache_misses += 1
+        else:
+            if data is unresolved_value and stored_live == live:
+                self._cache_hits += 1
+                return copy.deepcopy(value)
+            self._cache_invalidations += 1
+
+        value = self.props[key].get_value(self.resolve(unresolved_value))
+        self._cache[key] = (unresolved_value, live, value)
+        return copy.deepcopy(value)
+
     def _find_deps_any_in_init(self, unresolved_value):
         deps = function.dependencies(unresolved_value)
         if any(res.action == res.INIT for res in deps):
@@ -424,6 +473,8 @@ class Properties(collections.Mapping):
                 if validate:
                     if self._find_deps_any_in_init(unresolved_value):
                         validate = False
+                elif self.resolve is function.resolve:
+                    return self._get_cached_value(key, unresolved_value)
 
                 value = self.resolve(unresolved_value)
                 return prop.get_value(value, validate)
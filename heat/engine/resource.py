@@ -124,6 +124,11 @@ class Resource(object):
     # a signal to this resource
     signal_needs_metadata_updates = True
 
+    # A scheduler.PollInterval policy used to space out the calls to the
+    # check_<ACTION>_complete() methods, or None to call them at every step
+    # of the stack action
+    check_complete_interval = None
+
     def __new__(cls, name, definition, stack):
         """Create a new Resource of the appropriate class for its type."""
 
@@ -278,20 +283,25 @@ class Resource(object):
         self._stackref = weakref.ref(stack)
 
     @classmethod
-    def load(cls, context, resource_id, is_update, data):
+    def load(cls, context, resource_id, is_update, data, templates=None,
+             dep_attrs_indexes=None):
         from heat.engine import stack as stack_mod
         db_res = resource_objects.Resource.get_obj(context, resource_id)
         curr_stack = stack_mod.Stack.load(context, stack_id=db_res.stack_id,
-                                          cache_data=data)
+                                          cache_data=data,
+                                          templates=templates,
+                                          dep_attrs_indexes=dep_attrs_indexes)
 
         resource_owning_stack = curr_stack
         if db_res.current_template_id != curr_stack.t.id:
             # load stack with template owning the resource
-            db_stack = stack_objects.Stack.get_by_id(context, db_res.stack_id)
+            db_stack = stack_objects.Stack.get_by_id(context, db_res.stack_id,
+                                                     load_template=False)
             db_stack.raw_template = None
             db_stack.raw_template_id = db_res.current_template_id
-            resource_owning_stack = stack_mod.Stack.load(context,
-                                                         stack=db_stack)
+            resource_owning_stack = stack_mod.Stack.load(
+                context, stack=db_stack, templates=templates,
+                dep_attrs_indexes=dep_attrs_indexes)
 
         # Load only the resource in question; don't load all resources
         # by invoking stack.resources. Maintain light-weight stack.
@@ -437,6 +447,15 @@ class Resource(object):
     def type(self):
         return self.t.resource_type
 
+    def waits_for_signal(self):
+        """Return True if the resource's actions wait for an external signal.
+
+        Such resources are not counted against the limits on the number of
+        concurrent resource actions, since they could otherwise hold on to a
+        slot that the resource sending the signal needs.
+        """
+        return False
+
     def has_interface(self, resource_type):
         """Check if resource is mapped to resource_type or is "resource_type".
 
@@ -730,8 +749,12 @@ class Resource(object):
             handler_data = handler(*args)
             yield
             if callable(check):
+                poll_timer = scheduler.PollTimer(self.check_complete_interval)
                 while not check(handler_data):
+                    poll_timer.reset()
                     yield
+                    while not poll_timer.due():
+                        yield
 
     @scheduler.wrappertask
     def _do_action(self, action, pre_func=None, resource_data=None):
@@ -918,6 +941,8 @@ class Resource(object):
         rules = self.translation_rules(properties) or []
         for rule in rules:
             rule.execute_rule(client_resolve)
+        # The rules modify the property data in place
+        properties.clear_cache()
 
     def _get_resource_info(self, resource_data):
         if not resource_data:
@@ -1492,39 +1517,70 @@ class Resource(object):
             except Exception as ex:
                 LOG.warning(_LW('db error %s'), ex)
 
-    def _store(self, metadata=None):
-        """Create the resource in the database."""
-
+    def _store_values(self, metadata=None):
+        """Return the values with which to create the resource in the DB."""
         properties_data_encrypted, properties_data = (
             resource_objects.Resource.encrypt_properties_data(
                 self._stored_properties_data))
         if not self.root_stack_id:
             self.root_stack_id = self.stack.root_stack_id()
-        try:
-            rs = {'action': self.action,
-                  'status': self.status,
-                  'status_reason': self.status_reason,
-                  'stack_id': self.stack.id,
-                  'nova_instance': self.resource_id,
-                  'name': self.name,
-                  'rsrc_metadata': metadata,
-                  'properties_data': properties_data,
-                  'properties_data_encrypted': properties_data_encrypted,
-                  'needed_by': self.needed_by,
-                  'requires': self.requires,
-                  'replaces': self.replaces,
-                  'replaced_by': self.replaced_by,
-                  'current_template_id': self.current_template_id,
-                  'stack_name': self.stack.name,
-                  'root_stack_id': self.root_stack_id}
 
+        return {'action': self.action,
+                'status': self.status,
+                'status_reason': self.status_reason,
+                'stack_id': self.stack.id,
+                'nova_instance': self.resource_id,
+                'name': self.name,
+                'rsrc_metadata': metadata,
+                'properties_data': properties_data,
+                'properties_data_encrypted': properties_data_encrypted,
+                'needed_by': self.needed_by,
+                'requires': self.requires,
+                'replaces': self.replaces,
+                'replaced_by': self.replaced_by,
+                'current_template_id': self.current_template_id,
+                'stack_name': self.stack.name,
+                'root_stack_id': self.root_stack_id}
+
+    def _stored(self, new_rs, metadata=None):
+        """Record the result of creating the resource in the database."""
+        self.id = new_rs.id
+        self.uuid = new_rs.uuid
+        self.created_time = new_rs.created_at
+        self._rsrc_metadata = metadata
+
+    def _store(self, metadata=None):
+        """Create the resource in the database."""
+        rs = self._store_values(metadata)
+        try:
             new_rs = resource_objects.Resource.create(self.context, rs)
-            self.id = new_rs.id
-            self.uuid = new_rs.uuid
-            self.created_time = new_rs.created_at
-            self._rsrc_metadata = metadata
+            self._stored(new_rs, metadata)
+        except Exception as ex:
+            LOG.error(_LE('DB error %s'), ex)
+
+    @staticmethod
+    def _store_all(context, resources):
+        """Create many resources in the database at once.
+
+        This is equivalent to calling _store() on each resource in turn, but
+        makes only one round trip to the database.
+        """
+        if not resources:
+            return
+
+        root_stack_id = resources[0].stack.root_stack_id()
+        for res in resources:
+            if not res.root_stack_id and res.stack is resources[0].stack:
+                res.root_stack_id = root_stack_id
+
+        values = [res._store_values() for res in resources]
+        try:
+            new_rss = resource_objects.Resource.create_many(context, values)
         except Exception as ex:
             LOG.error(_LE('DB error %s'), ex)
+        else:
+            for res, new_rs in zip(resources, new_rss):
+                res._stored(new_rs)
 
     def _add_event(self, action, status, reason):
         """Add a state change event to the database."""
@@ -1532,8 +1588,7 @@ class Resource(object):
                          self.resource_id, self.properties,
                          self.name, self.type())
 
-        ev.store()
-        self.stack.dispatch_event(ev)
+        self.stack.store_event(ev)
 
     def _store_or_update(self, action, status, reason):
         prev_action = self.action
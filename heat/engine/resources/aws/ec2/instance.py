@@ -21,6 +21,7 @@ from heat.common.i18n import _
 from heat.common.i18n import _LI
 from heat.common.i18n import _LW
 from heat.engine import attributes
+from heat.engine.clients.os import nova
 from heat.engine.clients import progress
 from heat.engine import constraints
 from heat.engine import properties
@@ -346,6 +347,9 @@ class Instance(resource.Resource, sh.SchedulerHintsMixin):
 
     default_client_name = 'nova'
 
+    # Back off when polling Nova for the status of the server
+    check_complete_interval = nova.SERVER_POLL_INTERVAL
+
     def __init__(self, name, json_snippet, stack):
         super(Instance, self).__init__(name, json_snippet, stack)
         self.ipaddress = None
@@ -193,6 +193,9 @@ class SoftwareDeployment(signal_responder.SignalResponder):
     # dedicated API for changing state on signals
     signal_needs_metadata_updates = False
 
+    def waits_for_signal(self):
+        return not self._signal_transport_none()
+
     def _signal_transport_cfn(self):
         return self.properties[
             self.SIGNAL_TRANSPORT] == self.CFN_SIGNAL
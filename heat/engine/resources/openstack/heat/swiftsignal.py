@@ -211,6 +211,9 @@ class SwiftSignal(resource.Resource):
         self._obj_name = None
         self._url = None
 
+    def waits_for_signal(self):
+        return True
+
     @property
     def url(self):
         if not self._url:
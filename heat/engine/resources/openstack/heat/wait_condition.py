@@ -92,6 +92,9 @@ class HeatWaitCondition(resource.Resource):
     def __init__(self, name, definition, stack):
         super(HeatWaitCondition, self).__init__(name, definition, stack)
 
+    def waits_for_signal(self):
+        return True
+
     def _get_handle_resource(self):
         return self.stack.resource_by_refid(self.properties[self.HANDLE])
 
@@ -24,6 +24,7 @@ from heat.common import exception
 from heat.common.i18n import _
 from heat.common.i18n import _LE
 from heat.engine import attributes
+from heat.engine.clients.os import nova
 from heat.engine.clients import progress
 from heat.engine import constraints
 from heat.engine import function
@@ -566,6 +567,9 @@ class Server(stack_user.StackUser, sh.SchedulerHintsMixin,
 
     entity = 'servers'
 
+    # Back off when polling Nova for the status of the server
+    check_complete_interval = nova.SERVER_POLL_INTERVAL
+
     def translation_rules(self, props):
         rules = [
             translation.TranslationRule(
@@ -13,6 +13,7 @@
 
 from heat.common import exception
 from heat.common.i18n import _
+from heat.engine.clients.os import cinder
 from heat.engine.clients import progress
 from heat.engine import resource
 
@@ -22,6 +23,9 @@ class BaseVolume(resource.Resource):
 
     default_client_name = 'cinder'
 
+    # Back off when polling Cinder for the status of the volume
+    check_complete_interval = cinder.VOLUME_POLL_INTERVAL
+
     def handle_create(self):
         backup_id = self.properties.get(self.BACKUP_ID)
         cinder = self.client()
@@ -42,12 +46,15 @@ class BaseVolume(resource.Resource):
         return vol.id
 
     def check_create_complete(self, vol_id):
-        vol = self.client().volumes.get(vol_id)
+        poller = self.client_plugin().volume_poller
+        vol = poller.fetch(vol_id)
+
+        if vol is None or vol.status in self._volume_creating_status:
+            return False
 
+        poller.discard(vol_id)
         if vol.status == 'available':
             return True
-        if vol.status in self._volume_creating_status:
-            return False
         if vol.status == 'error':
             raise exception.ResourceInError(
                 resource_status=vol.status)
@@ -66,6 +66,7 @@ class ResourceDefinitionCore(object):
 
         self._hash = hash(self.resource_type)
         self._rendering = None
+        self._dep_attrs = None
 
         assert isinstance(self.description, six.string_types)
 
@@ -146,10 +147,22 @@ class ResourceDefinitionCore(object):
         Return an iterator over dependent attributes for specified
         resource_name in resources' properties and metadata fields.
         """
-        return itertools.chain(function.dep_attrs(self._properties,
-                                                  resource_name),
-                               function.dep_attrs(self._metadata,
-                                                  resource_name))
+        return (attr for name, attr in self.all_dep_attrs()
+                if name == resource_name)
+
+    def all_dep_attrs(self):
+        """Iterate over the attributes of all resources that this references.
+
+        Return an iterator over (resource name, attribute) pairs for the
+        attributes referenced in the resource's properties and metadata
+        fields. They are found the first time this is called, and then
+        remembered.
+        """
+        if self._dep_attrs is None:
+            self._dep_attrs = tuple(itertools.chain(
+                function.all_dep_attrs(self._properties),
+                function.all_dep_attrs(self._metadata)))
+        return iter(self._dep_attrs)
 
     def dependencies(self, stack):
         """Return the Resource objects in given stack on which this depends."""
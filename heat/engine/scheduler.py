@@ -11,6 +11,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import heapq
+import itertools
+import random
 import sys
 import types
 
@@ -129,6 +132,85 @@ class ExceptionGroup(Exception):
         return str([str(ex) for ex in self.exceptions])
 
 
+@repr_wraper
+class PollInterval(object):
+    """Policy for the interval between successive polls of a task.
+
+    The base policy polls at a fixed interval, given in seconds.
+    """
+
+    def __init__(self, interval=1):
+        self.interval = interval
+
+    def intervals(self):
+        """Return an iterator over successive poll intervals in seconds."""
+        return itertools.repeat(self.interval)
+
+    def max_delay(self):
+        """Return the longest interval in seconds between successive polls."""
+        return self.interval
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self.interval)
+
+
+class ExponentialBackoff(PollInterval):
+    """Policy that doubles the interval between polls, up to a maximum.
+
+    A random jitter of up to jitter_max seconds is added to each interval so
+    that many tasks started together do not continue to poll in lock-step.
+    """
+
+    def __init__(self, interval=1, max_interval=30, jitter_max=1.0):
+        super(ExponentialBackoff, self).__init__(interval)
+        self.max_interval = max_interval
+        self.jitter_max = jitter_max
+
+    def intervals(self):
+        attempt = 0
+        while True:
+            delay = timeutils.retry_backoff_delay(attempt,
+                                                  scale_factor=self.interval)
+            if delay < self.max_interval:
+                attempt += 1
+            else:
+                delay = self.max_interval
+            yield delay + random.random() * self.jitter_max
+
+    def max_delay(self):
+        return self.max_interval + self.jitter_max
+
+    def __repr__(self):
+        return '%s(%r, max_interval=%r, jitter_max=%r)' % (
+            type(self).__name__, self.interval, self.max_interval,
+            self.jitter_max)
+
+
+class PollTimer(object):
+    """Track when a task that is polling for completion should poll next.
+
+    Intervals are taken from a PollInterval policy. If no policy is given,
+    or sleeping is disabled, the task is due to poll at every step.
+    """
+
+    def __init__(self, interval=None):
+        if interval is not None:
+            self._intervals = interval.intervals()
+        else:
+            self._intervals = None
+        self._next = None
+
+    def reset(self):
+        """Start waiting for the next interval after a poll."""
+        if self._intervals is not None:
+            self._next = timeutils.Duration(next(self._intervals))
+
+    def due(self):
+        """Return True if the task should poll at this step."""
+        return (not ENABLE_SLEEP or self._next is None or
+                self._next.expired())
+
+
 @six.python_2_unicode_compatible
 class TaskRunner(object):
     """Wrapper for a resumable task (co-routine)."""
@@ -162,11 +244,20 @@ class TaskRunner(object):
             LOG.debug('%s sleeping' % six.text_type(self))
             eventlet.sleep(wait_time)
 
+    @staticmethod
+    def _wait_times(wait_time):
+        """Return an iterator over the times to sleep between steps."""
+        if isinstance(wait_time, PollInterval):
+            return wait_time.intervals()
+        return itertools.repeat(wait_time)
+
     def __call__(self, wait_time=1, timeout=None):
         """Start and run the task to completion.
 
         The task will first sleep for zero seconds, then sleep for `wait_time`
         seconds between steps. To avoid sleeping, pass `None` for `wait_time`.
+        A PollInterval may be passed as `wait_time` to vary the time between
+        steps.
         """
         self.start(timeout=timeout)
         # ensure that zero second sleep is applied only if task
@@ -227,10 +318,12 @@ class TaskRunner(object):
         """Run the task to completion.
 
         The task will sleep for `wait_time` seconds between steps. To avoid
-        sleeping, pass `None` for `wait_time`.
+        sleeping, pass `None` for `wait_time`. A PollInterval may be passed as
+        `wait_time` to vary the time between steps.
         """
+        wait_times = self._wait_times(wait_time)
         while not self.step():
-            self._sleep(wait_time)
+            self._sleep(next(wait_times))
 
     def cancel(self, grace_period=None):
         """Cancel the task and mark it as done."""
@@ -333,13 +426,36 @@ def wrappertask(task):
     return wrapper
 
 
+class ConcurrencyLimit(object):
+    """A limit on the number of tasks of some kind that run at once.
+
+    A DependencyTaskGroup leaves a subtask to which the limit applies queued,
+    rather than starting it, while the limit is reached. The same limit may
+    be shared by many task groups. A limit of zero or None is unlimited.
+    """
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.running = 0
+
+    def available(self):
+        """Return True if another task may be started."""
+        return not self.limit or self.running < self.limit
+
+    def acquire(self):
+        self.running += 1
+
+    def release(self):
+        self.running -= 1
+
+
 @repr_wraper
 class DependencyTaskGroup(object):
     """Task which manages group of subtasks that have ordering dependencies."""
 
     def __init__(self, dependencies, task=lambda o: o(),
                  reverse=False, name=None, error_wait_time=None,
-                 aggregate_exceptions=False):
+                 aggregate_exceptions=False, limits=None, step_func=None):
         """Initialise with the task dependencies.
 
         A task to run on each dependency may optionally be specified.  If no
@@ -356,12 +472,35 @@ class DependencyTaskGroup(object):
         will not be cancelled in the event of an error (operations downstream
         of the error will be cancelled). Once all chains are complete, any
         errors will be rolled up into an ExceptionGroup exception.
+
+        If limits is specified, it is called with each object in the
+        dependency tree to obtain a list of the ConcurrencyLimits that apply
+        to its task. A task whose dependencies are satisfied is only started
+        once none of its limits is reached, and counts towards them until it
+        is complete.
+
+        If a step_func is specified, it is called with no arguments at the
+        end of each step, once the subtasks have been started and stepped.
         """
         self._keys = list(dependencies)
         self._runners = dict((o, TaskRunner(task, o)) for o in self._keys)
         self._graph = dependencies.graph(reverse=reverse)
+        self._order = dict((k, i) for i, k in enumerate(self._keys))
+        # Subtasks whose dependencies are satisfied, as a heap of
+        # (position, key) pairs, and the keys of subtasks that have been
+        # started but are not yet complete. These are updated only as
+        # subtasks change state, so each step of the group costs time
+        # proportional to the number of active subtasks.
+        self._ready_queue = [(self._order[k], k) for k in self._keys
+                             if not self._graph[k]]
+        heapq.heapify(self._ready_queue)
+        self._deferred = []
+        self._running_keys = set()
         self.error_wait_time = error_wait_time
         self.aggregate_exceptions = aggregate_exceptions
+        self._limits = limits
+        self._held_limits = {}
+        self._step_func = step_func
 
         if name is None:
             name = '(%s) %s' % (getattr(task, '__name__',
@@ -377,28 +516,38 @@ class DependencyTaskGroup(object):
     def __call__(self):
         """Return a co-routine which runs the task group."""
         raised_exceptions = []
-        while any(six.itervalues(self._runners)):
-            try:
-                for k, r in self._ready():
-                    r.start()
-                    if not r:
-                        del self._graph[k]
-
-                yield
-
-                for k, r in self._running():
-                    if r.step():
-                        del self._graph[k]
-            except Exception:
-                exc_info = sys.exc_info()
-                if self.aggregate_exceptions:
-                    self._cancel_recursively(k, r)
-                else:
-                    self.cancel_all(grace_period=self.error_wait_time)
-                raised_exceptions.append(exc_info)
-            except:  # noqa
-                with excutils.save_and_reraise_exception():
-                    self.cancel_all()
+        try:
+            while self._active():
+                try:
+                    for k, r in self._ready():
+                        if not self._admit(k):
+                            continue
+                        self._running_keys.add(k)
+                        r.start()
+                        if not r:
+                            self._complete(k)
+
+                    if self._step_func is not None:
+                        self._step_func()
+                    yield
+
+                    for k, r in self._running():
+                        if r.step():
+                            self._complete(k)
+                except Exception:
+                    exc_info = sys.exc_info()
+                    if self.aggregate_exceptions:
+                        self._cancel_recursively(k, r)
+                        self._prune_ready()
+                    else:
+                        self.cancel_all(grace_period=self.error_wait_time)
+                    raised_exceptions.append(exc_info)
+                except:  # noqa
+                    with excutils.save_and_reraise_exception():
+                        self.cancel_all()
+        finally:
+            for k in list(self._held_limits):
+                self._release(k)
 
         if raised_exceptions:
             if self.aggregate_exceptions:
@@ -411,6 +560,32 @@ class DependencyTaskGroup(object):
         for r in six.itervalues(self._runners):
             r.cancel(grace_period=grace_period)
 
+        self._prune_ready()
+
+    def _admit(self, key):
+        """Acquire the concurrency limits of a subtask that is ready to start.
+
+        Returns False, leaving the subtask queued, if any of its limits has
+        been reached.
+        """
+        if self._limits is None:
+            return True
+
+        limits = self._limits(key)
+        if not all(limit.available() for limit in limits):
+            self._deferred.append((self._order[key], key))
+            return False
+
+        for limit in limits:
+            limit.acquire()
+        self._held_limits[key] = limits
+        return True
+
+    def _release(self, key):
+        """Release the concurrency limits held by a subtask."""
+        for limit in self._held_limits.pop(key, []):
+            limit.release()
+
     def _cancel_recursively(self, key, runner):
         runner.cancel()
         node = self._graph[key]
@@ -419,18 +594,67 @@ class DependencyTaskGroup(object):
             self._cancel_recursively(dependent_node, node_runner)
 
         del self._graph[key]
+        self._running_keys.discard(key)
+        self._release(key)
+
+    def _prune_ready(self):
+        """Drop cancelled subtasks from the queue of ready subtasks."""
+        self._ready_queue = [(i, k) for i, k in self._ready_queue
+                             if self._runners[k]]
+        heapq.heapify(self._ready_queue)
+
+    def _complete(self, key):
+        """Remove a completed subtask from the graph.
+
+        Any subtasks that were waiting only on the completed one are added
+        to the queue of ready subtasks.
+        """
+        node = self._graph[key]
+        dependents = [k for k in node.required_by()
+                      if k in self._graph and key in self._graph[k]]
+
+        del self._graph[key]
+        self._running_keys.discard(key)
+        self._release(key)
+
+        for k in dependents:
+            if not self._graph[k] and self._runners[k]:
+                heapq.heappush(self._ready_queue, (self._order[k], k))
+
+    def _active(self):
+        """Return True if any subtasks remain to be started or completed.
+
+        Only the queued and running subtasks are examined; subtasks that are
+        still waiting on their dependencies can only become ready once one of
+        those completes.
+        """
+        return (any(self._runners[k] for i, k in self._ready_queue) or
+                any(self._runners[k] for i, k in self._deferred) or
+                any(self._runners[k] for k in self._running_keys))
 
     def _ready(self):
         """Iterate over all subtasks that are ready to start.
 
         Ready subtasks are subtasks whose dependencies have all been satisfied,
-        but which have not yet been started.
+        but which have not yet been started. Subtasks are started in the order
+        of the dependency list; any that become ready during the iteration
+        but appear earlier in that order are deferred until the next pass.
         """
-        for k in self._keys:
-            if not self._graph.get(k, True):
-                runner = self._runners[k]
-                if runner and not runner.started():
-                    yield k, runner
+        for item in self._deferred:
+            heapq.heappush(self._ready_queue, item)
+        self._deferred = []
+
+        last = -1
+        while self._ready_queue:
+            i, k = heapq.heappop(self._ready_queue)
+            if i < last:
+                self._deferred.append((i, k))
+                continue
+            last = i
+
+            runner = self._runners[k]
+            if runner and not runner.started():
+                yield k, runner
 
     def _running(self):
         """Iterate over all subtasks that are currently running.
@@ -438,8 +662,9 @@ class DependencyTaskGroup(object):
         Running subtasks are subtasks have been started but have not yet
         completed.
         """
-
-        def running(k_r):
-            return k_r[0] in self._graph and k_r[1].started()
-
-        return six.moves.filter(running, six.iteritems(self._runners))
+        running = sorted(self._running_keys, key=self._order.get)
+        for k in running:
+            if k in self._graph and k in self._running_keys:
+                runner = self._runners[k]
+                if runner.started():
+                    yield k, runner
@@ -46,7 +46,6 @@ from heat.engine import attributes
 from heat.engine.cfn import template as cfntemplate
 from heat.engine import clients
 from heat.engine import environment
-from heat.engine import event as evt
 from heat.engine.hot import functions as hot_functions
 from heat.engine import parameter_groups
 from heat.engine import properties
@@ -61,6 +60,7 @@ from heat.engine import update
 from heat.engine import watchrule
 from heat.engine import worker
 from heat.objects import event as event_object
+from heat.objects import raw_template as template_object
 from heat.objects import resource as resource_objects
 from heat.objects import service as service_objects
 from heat.objects import snapshot as snapshot_object
@@ -294,7 +294,7 @@ class EngineService(service.Service):
     by the RPC caller.
     """
 
-    RPC_API_VERSION = '1.26'
+    RPC_API_VERSION = '1.28'
 
     def __init__(self, host, topic):
         super(EngineService, self).__init__()
@@ -522,7 +522,7 @@ class EngineService(service.Service):
                     sort_dir=None, filters=None, tenant_safe=True,
                     show_deleted=False, show_nested=False, show_hidden=False,
                     tags=None, tags_any=None, not_tags=None,
-                    not_tags_any=None):
+                    not_tags_any=None, with_parameters=True):
         """Returns attributes of all stacks.
 
         It supports pagination (``limit`` and ``marker``),
@@ -547,20 +547,32 @@ class EngineService(service.Service):
             multiple tags using the boolean AND expression
         :param not_tags_any: show stacks not containing these tags, combine
             multiple tags using the boolean OR expression
+        :param with_parameters: if true, include the parameters of the stacks,
+            which requires their whole templates and environments to be
+            loaded
         :returns: a list of formatted stacks
         """
         if filters is not None:
             filters = api.translate_filters(filters)
 
-        stacks = parser.Stack.load_all(cnxt, limit, marker, sort_keys,
-                                       sort_dir, filters, tenant_safe,
-                                       show_deleted, resolve_data=False,
-                                       show_nested=show_nested,
-                                       show_hidden=show_hidden,
-                                       tags=tags, tags_any=tags_any,
-                                       not_tags=not_tags,
-                                       not_tags_any=not_tags_any)
-        return [api.format_stack(stack) for stack in stacks]
+        stacks = stack_object.Stack.get_all(cnxt, limit, sort_keys, marker,
+                                            sort_dir, filters, tenant_safe,
+                                            show_deleted, show_nested,
+                                            show_hidden, tags, tags_any,
+                                            not_tags, not_tags_any,
+                                            eager_load=True,
+                                            load_template=with_parameters)
+        if with_parameters:
+            return [api.format_stack_db_object(cnxt, stack)
+                    for stack in stacks]
+
+        stacks = list(stacks)
+        templates = template_object.RawTemplate.get_templates(
+            cnxt, set(stack.raw_template_id for stack in stacks))
+        return [api.format_stack_db_object(cnxt, stack,
+                                           templates[stack.raw_template_id])
+                for stack in stacks
+                if stack.raw_template_id in templates]
 
     @context.request_context
     def count_stacks(self, cnxt, filters=None, tenant_safe=True,
@@ -1516,7 +1528,8 @@ class EngineService(service.Service):
 
     @context.request_context
     def list_events(self, cnxt, stack_identity, filters=None, limit=None,
-                    marker=None, sort_keys=None, sort_dir=None):
+                    marker=None, sort_keys=None, sort_dir=None,
+                    include_rsrc_prop_data=True):
         """Lists all events associated with a given stack.
 
         It supports pagination (``limit`` and ``marker``),
@@ -1530,6 +1543,8 @@ class EngineService(service.Service):
         :param marker: the ID of the last event in the previous page
         :param sort_keys: an array of fields used to sort the list
         :param sort_dir: the direction of the sort ('asc' or 'desc').
+        :param include_rsrc_prop_data: whether to include the resource
+                                       properties of each event
         """
 
         if stack_identity is not None:
@@ -1542,25 +1557,30 @@ class EngineService(service.Service):
                 marker=marker,
                 sort_keys=sort_keys,
                 sort_dir=sort_dir,
-                filters=filters)
+                filters=filters,
+                include_rsrc_prop_data=include_rsrc_prop_data)
         else:
             events = event_object.Event.get_all_by_tenant(
                 cnxt, limit=limit,
                 marker=marker,
                 sort_keys=sort_keys,
                 sort_dir=sort_dir,
-                filters=filters)
-
-        stacks = {}
-
-        def get_stack(stack_id):
-            if stack_id not in stacks:
-                stacks[stack_id] = parser.Stack.load(cnxt, stack_id)
-            return stacks[stack_id]
-
-        return [api.format_event(evt.Event.load(cnxt,
-                                                e.id, e,
-                                                get_stack(e.stack_id)))
+                filters=filters,
+                include_rsrc_prop_data=include_rsrc_prop_data)
+
+        events = list(events)
+
+        # Only the identity of each stack is needed to format its events,
+        # so look them all up together rather than loading every stack.
+        stack_identifiers = {}
+        stack_ids = set(e.stack_id for e in events)
+        if stack_ids:
+            for stack_id, name, tenant in stack_object.Stack.get_identities(
+                    cnxt, stack_ids):
+                stack_identifiers[stack_id] = identifier.HeatIdentifier(
+                    tenant or cnxt.tenant_id, name, stack_id)
+
+        return [api.format_event_db_object(e, stack_identifiers[e.stack_id])
                 for e in events]
 
     def _authorize_stack_user(self, cnxt, stack, resource_name):
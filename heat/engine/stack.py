@@ -11,15 +11,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import base64
 import collections
 import copy
 import datetime
 import functools
 import itertools
 import re
+import zlib
 
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 from oslo_utils import encodeutils
 from oslo_utils import excutils
 from oslo_utils import timeutils as oslo_timeutils
@@ -59,9 +62,19 @@ from heat.rpc import api as rpc_api
 from heat.rpc import worker_client as rpc_worker_client
 
 cfg.CONF.import_opt('error_wait_time', 'heat.common.config')
+cfg.CONF.import_opt('max_concurrent_resource_actions', 'heat.common.config')
+cfg.CONF.import_opt('max_concurrent_resource_actions_per_stack',
+                    'heat.common.config')
+cfg.CONF.import_opt('max_concurrent_resource_actions_per_type',
+                    'heat.common.config')
 
 LOG = logging.getLogger(__name__)
 
+# Limits on the resource actions running at once in this engine process,
+# which are shared by all of its stacks
+_engine_action_limit = scheduler.ConcurrencyLimit()
+_type_action_limits = collections.defaultdict(scheduler.ConcurrencyLimit)
+
 
 class ForcedCancel(BaseException):
     """Exception raised to cancel task execution."""
@@ -94,6 +107,101 @@ def reset_state_on_error(func):
     return handle_exceptions
 
 
+# Encoded convergence graphs larger than this are compressed
+CONVERGENCE_DEPS_COMPRESS_MIN_SIZE = 4096
+
+# Largest change to a stored convergence graph, as a fraction of its edges,
+# that is stored as a delta rather than by storing the whole graph again
+CONVERGENCE_DEPS_MAX_DELTA = 0.25
+
+
+def _convergence_node_code(node):
+    rsrc_id, is_update = node
+    if (not isinstance(rsrc_id, six.integer_types) or
+            isinstance(rsrc_id, bool) or rsrc_id < 0 or
+            not isinstance(is_update, bool)):
+        raise ValueError(node)
+    return rsrc_id * 2 + int(is_update)
+
+
+def _convergence_node(code):
+    return code // 2, bool(code % 2)
+
+
+def serialize_convergence_deps(edges):
+    """Return the stored form of the edges of a convergence graph.
+
+    Each node (resource_id, is_update) is encoded as a single integer. For
+    each requirer, in ascending order, the graph is a flat list of the
+    difference from the previous requirer, the number of its requirements,
+    and then each requirement (in ascending order) as the difference from
+    the previous one, starting from the requirer. Large graphs are also
+    compressed. Graphs with nodes that cannot be encoded this way are
+    stored as a plain list of edges.
+    """
+    edges = list(edges)
+    requirements = collections.defaultdict(set)
+    try:
+        for rqr, rqd in edges:
+            reqs = requirements[_convergence_node_code(rqr)]
+            if rqd is not None:
+                reqs.add(_convergence_node_code(rqd))
+    except ValueError:
+        return {'edges': [[rqr, rqd] for rqr, rqd in edges]}
+
+    graph = []
+    last_rqr = 0
+    for rqr in sorted(requirements):
+        reqs = sorted(requirements[rqr])
+        graph.extend((rqr - last_rqr, len(reqs)))
+        last = rqr
+        for rqd in reqs:
+            graph.append(rqd - last)
+            last = rqd
+        last_rqr = rqr
+
+    data = jsonutils.dumps(graph, separators=(',', ':')).encode('utf-8')
+    if len(data) >= CONVERGENCE_DEPS_COMPRESS_MIN_SIZE:
+        compressed = base64.b64encode(zlib.compress(data))
+        if len(compressed) < len(data):
+            return {'version': 2,
+                    'zgraph': compressed.decode('ascii')}
+    return {'version': 2, 'graph': graph}
+
+
+def deserialize_convergence_deps(current_deps):
+    """Return the list of edges of a stored convergence graph.
+
+    Both the current format and the list of edges stored by earlier
+    versions are understood.
+    """
+    if current_deps.get('version', 1) == 1:
+        return [(tuple(i), (tuple(j) if j is not None else None))
+                for i, j in current_deps['edges']]
+
+    graph = current_deps.get('graph')
+    if graph is None:
+        data = zlib.decompress(base64.b64decode(current_deps['zgraph']))
+        graph = jsonutils.loads(data.decode('utf-8'))
+
+    edges = []
+    rqr = 0
+    index = 0
+    while index < len(graph):
+        rqr += graph[index]
+        count = graph[index + 1]
+        index += 2
+        requirer = _convergence_node(rqr)
+        if not count:
+            edges.append((requirer, None))
+        rqd = rqr
+        for delta in graph[index:index + count]:
+            rqd += delta
+            edges.append((requirer, _convergence_node(rqd)))
+        index += count
+    return edges
+
+
 @six.python_2_unicode_compatible
 class Stack(collections.Mapping):
 
@@ -120,8 +228,8 @@ class Stack(collections.Mapping):
                  use_stored_context=False, username=None,
                  nested_depth=0, strict_validate=True, convergence=False,
                  current_traversal=None, tags=None, prev_raw_template_id=None,
-                 current_deps=None, cache_data=None, resource_validate=True,
-                 service_check_defer=False):
+                 current_deps=None, current_deps_delta=None, cache_data=None,
+                 resource_validate=True, service_check_defer=False):
 
         """Initialise the Stack.
 
@@ -177,10 +285,18 @@ class Stack(collections.Mapping):
         self.tags = tags
         self.prev_raw_template_id = prev_raw_template_id
         self.current_deps = current_deps
+        self.current_deps_delta = current_deps_delta
+        # The stored convergence graph, which is only written again once it
+        # has been replaced
+        self._stored_deps = (current_deps, current_deps_delta)
         self.cache_data = cache_data
         self._worker_client = None
         self._convg_deps = None
         self.thread_group_mgr = None
+        self._pending_events = None
+        # A dict shared with other stacks to keep the indexes built by
+        # dep_attrs() in, keyed by template ID
+        self.dep_attrs_indexes = None
 
         # strict_validate can be used to disable value validation
         # in the resource properties schema, this is useful when
@@ -416,6 +532,37 @@ class Stack(collections.Mapping):
                                       for out in six.itervalues(outputs)))
         return set(itertools.chain.from_iterable(attr_lists))
 
+    def dep_attrs(self, resource_name):
+        """Return the attributes of the specified resource that are referenced.
+
+        Returns the same set as get_dep_attrs() does for all of the resources
+        and outputs of the stack. The referenced attributes of every resource
+        are found in a single pass over the template the first time this is
+        called, and the index is kept with the template until its resources
+        change. If the stack has a dep_attrs_indexes dict, the index is also
+        stored there under the template's ID, and an index already stored
+        there is used instead of building a new one.
+        """
+        if self.t.dep_attrs_index is None:
+            indexes = self.dep_attrs_indexes
+            if indexes is not None and self.t.id in indexes:
+                self.t.dep_attrs_index = indexes[self.t.id]
+            else:
+                index = collections.defaultdict(set)
+                outputs = self.t.parse(self, self.t[self.t.OUTPUTS])
+                attr_lists = itertools.chain(
+                    (defn.all_dep_attrs() for defn in
+                     six.itervalues(self.t.resource_definitions(self))),
+                    (function.all_dep_attrs(out.get('Value', ''))
+                     for out in six.itervalues(outputs)))
+                for res_name, attr in itertools.chain.from_iterable(
+                        attr_lists):
+                    index[res_name].add(attr)
+                self.t.dep_attrs_index = dict(index)
+                if indexes is not None and self.t.id is not None:
+                    indexes[self.t.id] = self.t.dep_attrs_index
+        return set(self.t.dep_attrs_index.get(resource_name, ()))
+
     @staticmethod
     def _get_dependencies(resources, ignore_errors=True):
         """Return the dependency graph for a list of resources."""
@@ -439,14 +586,31 @@ class Stack(collections.Mapping):
     @classmethod
     def load(cls, context, stack_id=None, stack=None, show_deleted=True,
              use_stored_context=False, force_reload=False, cache_data=None,
-             resolve_data=True):
-        """Retrieve a Stack from the database."""
+             resolve_data=True, templates=None, dep_attrs_indexes=None):
+        """Retrieve a Stack from the database.
+
+        If a templates dict is passed, it is used as a cache of raw
+        templates keyed by template ID: a raw template found there is used
+        instead of being loaded from the database, and a raw template that
+        is loaded is added to it. A new Template is built from the cached
+        data for each stack, so the stacks never share one.
+
+        If a dep_attrs_indexes dict is passed, the stack shares the indexes
+        of referenced attributes kept in it; see dep_attrs().
+        """
         if stack is None:
-            stack = stack_object.Stack.get_by_id(
-                context,
-                stack_id,
-                show_deleted=show_deleted,
-                eager_load=True)
+            if templates is None:
+                stack = stack_object.Stack.get_by_id(
+                    context,
+                    stack_id,
+                    show_deleted=show_deleted,
+                    eager_load=True)
+            else:
+                stack = stack_object.Stack.get_by_id(
+                    context,
+                    stack_id,
+                    show_deleted=show_deleted,
+                    load_template=False)
         if stack is None:
             message = _('No stack exists with id "%s"') % str(stack_id)
             raise exception.NotFound(message)
@@ -456,7 +620,9 @@ class Stack(collections.Mapping):
 
         return cls._from_db(context, stack,
                             use_stored_context=use_stored_context,
-                            cache_data=cache_data, resolve_data=resolve_data)
+                            cache_data=cache_data, resolve_data=resolve_data,
+                            templates=templates,
+                            dep_attrs_indexes=dep_attrs_indexes)
 
     @classmethod
     def load_all(cls, context, limit=None, marker=None, sort_keys=None,
@@ -489,30 +655,48 @@ class Stack(collections.Mapping):
 
     @classmethod
     def _from_db(cls, context, stack, resolve_data=True,
-                 use_stored_context=False, cache_data=None):
-        template = tmpl.Template.load(
-            context, stack.raw_template_id, stack.raw_template)
+                 use_stored_context=False, cache_data=None, templates=None,
+                 dep_attrs_indexes=None):
+        if templates is None:
+            template = tmpl.Template.load(
+                context, stack.raw_template_id, stack.raw_template)
+        else:
+            raw_template = templates.get(stack.raw_template_id)
+            if raw_template is None:
+                raw_template = (stack.raw_template or
+                                raw_template_object.RawTemplate.get_by_id(
+                                    context, stack.raw_template_id))
+                templates[stack.raw_template_id] = raw_template
+            env = environment.Environment(
+                copy.deepcopy(raw_template.environment))
+            template = tmpl.Template(copy.deepcopy(raw_template.template),
+                                     template_id=stack.raw_template_id,
+                                     files=raw_template.files, env=env)
         tags = None
         if stack.tags:
             tags = [t.tag for t in stack.tags]
-        return cls(context, stack.name, template,
-                   stack_id=stack.id,
-                   action=stack.action, status=stack.status,
-                   status_reason=stack.status_reason,
-                   timeout_mins=stack.timeout,
-                   resolve_data=resolve_data,
-                   disable_rollback=stack.disable_rollback,
-                   parent_resource=stack.parent_resource_name,
-                   owner_id=stack.owner_id,
-                   stack_user_project_id=stack.stack_user_project_id,
-                   created_time=stack.created_at,
-                   updated_time=stack.updated_at,
-                   user_creds_id=stack.user_creds_id, tenant_id=stack.tenant,
-                   use_stored_context=use_stored_context,
-                   username=stack.username, convergence=stack.convergence,
-                   current_traversal=stack.current_traversal, tags=tags,
-                   prev_raw_template_id=stack.prev_raw_template_id,
-                   current_deps=stack.current_deps, cache_data=cache_data)
+        stk = cls(context, stack.name, template,
+                  stack_id=stack.id,
+                  action=stack.action, status=stack.status,
+                  status_reason=stack.status_reason,
+                  timeout_mins=stack.timeout,
+                  resolve_data=resolve_data,
+                  disable_rollback=stack.disable_rollback,
+                  parent_resource=stack.parent_resource_name,
+                  owner_id=stack.owner_id,
+                  stack_user_project_id=stack.stack_user_project_id,
+                  created_time=stack.created_at,
+                  updated_time=stack.updated_at,
+                  user_creds_id=stack.user_creds_id, tenant_id=stack.tenant,
+                  use_stored_context=use_stored_context,
+                  username=stack.username, convergence=stack.convergence,
+                  current_traversal=stack.current_traversal, tags=tags,
+                  prev_raw_template_id=stack.prev_raw_template_id,
+                  current_deps=stack.current_deps,
+                  current_deps_delta=stack.current_deps_delta,
+                  cache_data=cache_data)
+        stk.dep_attrs_indexes = dep_attrs_indexes
+        return stk
 
     def get_kwargs_for_cloning(self, keep_status=False, only_db=False):
         """Get common kwargs for calling Stack() for cloning.
@@ -538,7 +722,8 @@ class Stack(collections.Mapping):
             'convergence': self.convergence,
             'current_traversal': self.current_traversal,
             'prev_raw_template_id': self.prev_raw_template_id,
-            'current_deps': self.current_deps
+            'current_deps': self.current_deps,
+            'current_deps_delta': self.current_deps_delta
         }
         if keep_status:
             stack.update({
@@ -578,6 +763,13 @@ class Stack(collections.Mapping):
             if exp_trvsl is None:
                 exp_trvsl = self.current_traversal
 
+            # The convergence graph may be large, so avoid rewriting it
+            stored_deps, stored_deps_delta = self._stored_deps
+            if self.current_deps is stored_deps:
+                del s['current_deps']
+            if self.current_deps_delta is stored_deps_delta:
+                del s['current_deps_delta']
+
             if self.convergence:
                 # do things differently for convergence
                 updated = stack_object.Stack.select_and_update(
@@ -610,6 +802,8 @@ class Stack(collections.Mapping):
             self.id = new_s.id
             self.created_time = new_s.created_at
 
+        self._stored_deps = (self.current_deps, self.current_deps_delta)
+
         if self.tags:
             stack_tag_object.StackTagList.set(self.context, self.id, self.tags)
 
@@ -813,9 +1007,48 @@ class Stack(collections.Mapping):
                          self.id, {},
                          self.name, 'OS::Heat::Stack')
 
+        # Resource events must be stored before the stack changes state
+        self._flush_events()
         ev.store()
         self.dispatch_event(ev)
 
+    def store_event(self, ev):
+        """Store and dispatch a resource event.
+
+        While the stack is performing an action, events are queued and then
+        stored together at the end of each step of the action.
+        """
+        if self._pending_events is None:
+            ev.store()
+            self.dispatch_event(ev)
+        else:
+            ev.uuid = ev.uuid or uuidutils.generate_uuid()
+            ev.timestamp = ev.timestamp or oslo_timeutils.utcnow()
+            self._pending_events.append(ev)
+
+    def _flush_events(self):
+        """Store any queued resource events and dispatch them."""
+        if not self._pending_events:
+            return
+        events, self._pending_events = self._pending_events, []
+        event.Event.store_all(self.context, events)
+        for ev in events:
+            self.dispatch_event(ev)
+
+    @scheduler.wrappertask
+    def _queue_events(self, task):
+        """Run a task, queueing the resource events added while it runs.
+
+        The task must flush the queue (with _flush_events()) at the end of
+        each of its steps; whatever remains is stored once it completes.
+        """
+        self._pending_events = []
+        try:
+            yield task
+        finally:
+            self._flush_events()
+            self._pending_events = None
+
     def dispatch_event(self, ev):
         def _dispatch(ctx, sinks, ev):
             try:
@@ -869,7 +1102,8 @@ class Stack(collections.Mapping):
         """Persist stack state to database"""
         if self.id is None:
             return
-        stack = stack_object.Stack.get_by_id(self.context, self.id)
+        stack = stack_object.Stack.get_by_id(self.context, self.id,
+                                             load_template=False)
         if stack is not None:
             values = {'action': self.action,
                       'status': self.status,
@@ -898,7 +1132,8 @@ class Stack(collections.Mapping):
         """Persist stack state to database and release stack lock"""
         if self.id is None:
             return
-        stack = stack_object.Stack.get_by_id(self.context, self.id)
+        stack = stack_object.Stack.get_by_id(self.context, self.id,
+                                             load_template=False)
         if stack is not None:
             values = {'action': self.action,
                       'status': self.status,
@@ -925,9 +1160,9 @@ class Stack(collections.Mapping):
                 for resource in six.itervalues(self.resources)]
 
     def _store_resources(self):
-        for r in reversed(self.dependencies):
-            if r.action == r.INIT:
-                r._store()
+        resource.Resource._store_all(
+            self.context,
+            [r for r in reversed(self.dependencies) if r.action == r.INIT])
 
     @profiler.trace('Stack.create', hide_args=False)
     @reset_state_on_error
@@ -953,6 +1188,38 @@ class Stack(collections.Mapping):
 
         return {'resource_data': data['resources'].get(resource.name)}
 
+    def resource_action_limits(self):
+        """Return a function giving the ConcurrencyLimits of a resource.
+
+        Actions on the resources of the stack are limited in number across
+        the engine, within the stack and for each resource type as
+        configured. Resources with nested stacks are not limited, since
+        they only wait for the resources of the nested stack, which are.
+        Nor are resources that wait for a signal, since the resource that
+        sends it may need the slot they would hold to run at all.
+        """
+        from heat.engine.resources import stack_resource
+
+        _engine_action_limit.limit = cfg.CONF.max_concurrent_resource_actions
+        stack_limit = scheduler.ConcurrencyLimit(
+            cfg.CONF.max_concurrent_resource_actions_per_stack)
+        type_limits = cfg.CONF.max_concurrent_resource_actions_per_type
+
+        def limits(rsrc):
+            if (isinstance(rsrc, stack_resource.StackResource) or
+                    rsrc.waits_for_signal()):
+                return []
+
+            rsrc_limits = [_engine_action_limit, stack_limit]
+            rsrc_type = rsrc.type()
+            if rsrc_type in type_limits:
+                type_limit = _type_action_limits[rsrc_type]
+                type_limit.limit = type_limits[rsrc_type]
+                rsrc_limits.append(type_limit)
+            return rsrc_limits
+
+        return limits
+
     @scheduler.wrappertask
     def stack_task(self, action, reverse=False, post_func=None,
                    error_wait_time=None,
@@ -1008,10 +1275,12 @@ class Stack(collections.Mapping):
             resource_action,
             reverse,
             error_wait_time=error_wait_time,
-            aggregate_exceptions=aggregate_exceptions)
+            aggregate_exceptions=aggregate_exceptions,
+            limits=self.resource_action_limits(),
+            step_func=self._flush_events)
 
         try:
-            yield action_task()
+            yield self._queue_events(action_task())
         except scheduler.Timeout:
             stack_status = self.FAILED
             reason = '%s timed out' % action.title()
@@ -1181,14 +1450,37 @@ class Stack(collections.Mapping):
 
         self._converge_create_or_update()
 
+    def _set_stored_convergence_deps(self, edges):
+        """Set the stored form of the convergence graph to the given edges.
+
+        While the graph differs little from the last one that was stored in
+        full, only the edges added and removed since then are stored, so that
+        a small change to a large stack does not rewrite its whole graph.
+        """
+        edges = set(edges)
+        if (self.current_deps is not None and
+                self.current_deps.get('version', 1) > 1):
+            base = set(deserialize_convergence_deps(self.current_deps))
+            added = edges - base
+            removed = base - edges
+            if (len(added) + len(removed) <=
+                    len(base) * CONVERGENCE_DEPS_MAX_DELTA):
+                self.current_deps_delta = None
+                if added or removed:
+                    self.current_deps_delta = {
+                        'added': serialize_convergence_deps(added),
+                        'removed': serialize_convergence_deps(removed)}
+                return
+
+        self.current_deps = serialize_convergence_deps(edges)
+        self.current_deps_delta = None
+
     def _converge_create_or_update(self):
         current_resources = self._update_or_store_resources()
         self._compute_convg_dependencies(self.ext_rsrcs_db, self.dependencies,
                                          current_resources)
-        # Store list of edges
-        self.current_deps = {
-            'edges': [[rqr, rqd] for rqr, rqd in
-                      self.convergence_dependencies.graph().edges()]}
+        self._set_stored_convergence_deps(
+            self.convergence_dependencies.graph().edges())
         stack_id = self.store()
         if stack_id is None:
             # Failed concurrent update
@@ -1273,12 +1565,22 @@ class Stack(collections.Mapping):
         curr_name_translated_dep = self.dependencies.translate(lambda res:
                                                                res.name)
         rsrcs = {}
+        # New resources are stored in batches; a batch must be stored before
+        # any resource that they require, so that their IDs are known.
+        unstored = collections.OrderedDict()
+
+        def store_new_resources():
+            resource.Resource._store_all(self.context,
+                                         list(unstored.values()))
+            unstored.clear()
 
         def update_needed_by(res):
-            new_requirers = set(
-                rsrcs[rsrc_name].id for rsrc_name in
-                curr_name_translated_dep.required_by(res.name)
-            )
+            requirers = list(curr_name_translated_dep.required_by(res.name))
+            if any(rsrc_name in unstored for rsrc_name in requirers):
+                store_new_resources()
+
+            new_requirers = set(rsrcs[rsrc_name].id
+                                for rsrc_name in requirers)
             old_requirers = set(res.needed_by) if res.needed_by else set()
             needed_by = old_requirers | new_requirers
             res.needed_by = list(needed_by)
@@ -1288,7 +1590,7 @@ class Stack(collections.Mapping):
             if existing_rsrc_db is None:
                 update_needed_by(rsrc)
                 rsrc.current_template_id = self.t.id
-                rsrc._store()
+                unstored[rsrc.name] = rsrc
                 rsrcs[rsrc.name] = rsrc
             else:
                 update_needed_by(existing_rsrc_db)
@@ -1296,6 +1598,7 @@ class Stack(collections.Mapping):
                     existing_rsrc_db, existing_rsrc_db.needed_by
                 )
                 rsrcs[existing_rsrc_db.name] = existing_rsrc_db
+        store_new_resources()
         return rsrcs
 
     def _compute_convg_dependencies(self, existing_resources,
@@ -1321,8 +1624,13 @@ class Stack(collections.Mapping):
     @property
     def convergence_dependencies(self):
         if self._convg_deps is None:
-            current_deps = ([tuple(i), (tuple(j) if j is not None else None)]
-                            for i, j in self.current_deps['edges'])
+            current_deps = deserialize_convergence_deps(self.current_deps)
+            if self.current_deps_delta:
+                removed = set(deserialize_convergence_deps(
+                    self.current_deps_delta['removed']))
+                current_deps = [e for e in current_deps if e not in removed]
+                current_deps.extend(deserialize_convergence_deps(
+                    self.current_deps_delta['added']))
             self._convg_deps = dependencies.Dependencies(edges=current_deps)
 
         return self._convg_deps
@@ -1658,11 +1966,15 @@ class Stack(collections.Mapping):
                                'Failed stack pre-ops: %s' % six.text_type(e))
                 return
 
-        action_task = scheduler.DependencyTaskGroup(self.dependencies,
-                                                    resource.Resource.destroy,
-                                                    reverse=True)
+        action_task = scheduler.DependencyTaskGroup(
+            self.dependencies,
+            resource.Resource.destroy,
+            reverse=True,
+            limits=self.resource_action_limits(),
+            step_func=self._flush_events)
         try:
-            scheduler.TaskRunner(action_task)(timeout=self.timeout_secs())
+            scheduler.TaskRunner(self._queue_events,
+                                 action_task())(timeout=self.timeout_secs())
         except exception.ResourceFailure as ex:
             stack_status = self.FAILED
             reason = 'Resource %s failed: %s' % (action, six.text_type(ex))
@@ -14,6 +14,7 @@
 
 import ast
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 import six
 
 from heat.common.i18n import _
@@ -70,19 +71,30 @@ def update_input_data(context, entity_id, current_traversal,
     return rows_updated
 
 
+TUPLE_PREFIX = u'tuple:'
+
+
 def _str_pack_tuple(t):
-    return u'tuple:' + str(t)
+    return TUPLE_PREFIX + jsonutils.dumps(list(t), separators=(',', ':'))
 
 
 def _str_unpack_tuple(s):
     s = s[s.index(':') + 1:]
+    if s.startswith(u'['):
+        return tuple(jsonutils.loads(s))
+    # packed by an earlier version as the repr of the tuple
     return ast.literal_eval(s)
 
 
+def _is_packed_tuple(k):
+    return (isinstance(k, six.string_types) and
+            k.startswith((TUPLE_PREFIX + u'[', TUPLE_PREFIX + u'(')))
+
+
 def _deserialize(d):
     d2 = {}
     for k, v in d.items():
-        if isinstance(k, six.string_types) and k.startswith(u'tuple:('):
+        if _is_packed_tuple(k):
             k = _str_unpack_tuple(k)
         if isinstance(v, dict):
             v = _deserialize(v)
@@ -113,19 +125,37 @@ def serialize_input_data(input_data):
     return {'input_data': _serialize(input_data)}
 
 
+def add_input(context, entity_id, current_traversal, is_update,
+              sender, data):
+    """Records the input from one predecessor of a sync point.
+
+    Returns all of the input data received by the sync point so far.
+    """
+    sender_key = (_str_pack_tuple(sender) if isinstance(sender, tuple)
+                  else six.text_type(sender))
+    inputs = sync_point_object.SyncPoint.add_input(
+        context, entity_id, current_traversal, is_update, sender_key,
+        serialize_input_data({sender: data}))
+    if inputs is None:
+        key = (entity_id, current_traversal, is_update)
+        raise SyncPointNotFound(key)
+
+    input_data = {}
+    for db_input_data in inputs:
+        if db_input_data:
+            input_data.update(deserialize_input_data(db_input_data))
+    return input_data
+
+
 def sync(cnxt, entity_id, current_traversal, is_update, propagate,
          predecessors, new_data):
-    rows_updated = None
-    sync_point = None
-    input_data = None
-    while not rows_updated:
-        # TODO(sirushtim): Add a conf option to add no. of retries
-        sync_point = get(cnxt, entity_id, current_traversal, is_update)
-        input_data = deserialize_input_data(sync_point.input_data)
-        input_data.update(new_data)
-        rows_updated = update_input_data(
-            cnxt, entity_id, current_traversal, is_update,
-            sync_point.atomic_key, serialize_input_data(input_data))
+    # Each predecessor's input is stored separately, so that senders need
+    # not retry a read-modify-write of all of the input data when they
+    # race one another.
+    input_data = {}
+    for sender, data in new_data.items():
+        input_data = add_input(cnxt, entity_id, current_traversal, is_update,
+                               sender, data)
 
     waiting = predecessors - set(input_data)
     key = make_key(entity_id, current_traversal, is_update)
@@ -116,6 +116,19 @@ class Template(collections.Mapping):
         self.version = get_version(self.t,
                                    list(six.iterkeys(_template_classes)))
         self.t_digest = None
+        # The referenced attributes of each resource, built by
+        # Stack.dep_attrs() and dropped when the resources change.
+        self.dep_attrs_index = None
+
+    @property
+    def env(self):
+        return self._env
+
+    @env.setter
+    def env(self, env):
+        # The referenced attributes depend on the parameters
+        self._env = env
+        self.dep_attrs_index = None
 
     def __deepcopy__(self, memo):
         return Template(copy.deepcopy(self.t, memo), files=self.files,
@@ -212,6 +225,7 @@ class Template(collections.Mapping):
     def remove_resource(self, name):
         """Remove a resource from the template."""
         self.t.get(self.RESOURCES, {}).pop(name)
+        self.dep_attrs_index = None
 
     def parse(self, stack, snippet):
         return parse(self.functions, stack, snippet)
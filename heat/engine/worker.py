@@ -13,28 +13,81 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import datetime
+
+from oslo_config import cfg
 from oslo_log import log as logging
 import oslo_messaging
 from oslo_service import service
+from oslo_utils import timeutils as oslo_timeutils
 from osprofiler import profiler
 import six
 
 from heat.common import context
 from heat.common import exception
+from heat.common import hash_ring
 from heat.common.i18n import _LE
 from heat.common.i18n import _LI
 from heat.common import messaging as rpc_messaging
+from heat.common import timeutils
 from heat.engine import resource
 from heat.engine import scheduler
 from heat.engine import stack as parser
 from heat.engine import sync_point
 from heat.objects import resource as resource_objects
+from heat.objects import service as service_objects
 from heat.rpc import listener_client
 from heat.rpc import worker_client as rpc_client
 
 LOG = logging.getLogger(__name__)
 
 
+class TraversalCache(object):
+    """A bounded cache of the templates used by convergence traversals.
+
+    Every resource checked in a traversal loads the stack with the same
+    templates, so the raw templates are kept for each traversal instead of
+    being fetched and decoded from the database for every message. Only the
+    most recently used traversals are kept, and a traversal's entry is
+    discarded as soon as it is found to have been superseded by a new
+    traversal of its stack.
+
+    Stack.load() builds a new Template from the cached data every time, so
+    the stacks loaded for the traversal do not share any Template object.
+    The index of referenced attributes built by Stack.dep_attrs() is kept
+    here too, by template ID, so that it is only built once per traversal.
+    """
+
+    def __init__(self, max_traversals):
+        self.max_traversals = max_traversals
+        self._traversals = collections.OrderedDict()
+
+    def _entry(self, traversal):
+        entry = self._traversals.pop(traversal, None)
+        if entry is None:
+            entry = ({}, {})
+        self._traversals[traversal] = entry
+        while len(self._traversals) > self.max_traversals:
+            self._traversals.popitem(last=False)
+        return entry
+
+    def templates(self, traversal):
+        """Return the dict of raw templates, keyed by ID, for a traversal."""
+        return self._entry(traversal)[0]
+
+    def dep_attrs_indexes(self, traversal):
+        """Return the dict of referenced attribute indexes for a traversal.
+
+        The indexes are keyed by template ID.
+        """
+        return self._entry(traversal)[1]
+
+    def invalidate(self, traversal):
+        """Discard the cached data for a traversal."""
+        self._traversals.pop(traversal, None)
+
+
 @profiler.trace_cls("rpc")
 class WorkerService(service.Service):
     """Service that has 'worker' actor in convergence.
@@ -46,7 +99,10 @@ class WorkerService(service.Service):
     or expect replies from these messages.
     """
 
-    RPC_API_VERSION = '1.2'
+    RPC_API_VERSION = '1.3'
+
+    # Maximum number of traversals to keep the templates of
+    CACHED_TRAVERSALS = 16
 
     def __init__(self,
                  host,
@@ -62,6 +118,10 @@ class WorkerService(service.Service):
         self._rpc_client = rpc_client.WorkerClient()
         self._rpc_server = None
         self.target = None
+        self._traversal_cache = TraversalCache(self.CACHED_TRAVERSALS)
+        self._engine_ring = None
+        self._engine_ring_expiry = None
+        self._engine_report_expiry = {}
 
     def start(self):
         target = oslo_messaging.Target(
@@ -138,7 +198,8 @@ class WorkerService(service.Service):
         failure_reason = u'Timed out'
         self._handle_failure(cnxt, stack, failure_reason)
 
-    def _load_resource(self, cnxt, resource_id, resource_data, is_update):
+    def _load_resource(self, cnxt, resource_id, resource_data, is_update,
+                       current_traversal=None):
         if is_update:
             cache_data = {in_data.get(
                 'name'): in_data for in_data in resource_data.values()
@@ -147,9 +208,17 @@ class WorkerService(service.Service):
             # no data to resolve in cleanup phase
             cache_data = {}
 
+        templates = dep_attrs_indexes = None
+        if current_traversal is not None:
+            templates = self._traversal_cache.templates(current_traversal)
+            dep_attrs_indexes = self._traversal_cache.dep_attrs_indexes(
+                current_traversal)
+
         try:
             return resource.Resource.load(cnxt, resource_id,
-                                          is_update, cache_data)
+                                          is_update, cache_data,
+                                          templates=templates,
+                                          dep_attrs_indexes=dep_attrs_indexes)
         except (exception.ResourceNotFound, exception.NotFound):
             pass  # can be ignored
 
@@ -207,6 +276,65 @@ class WorkerService(service.Service):
 
         return False
 
+    def _refresh_engines(self, cnxt):
+        """Read the engines whose last report is still fresh."""
+        now = oslo_timeutils.utcnow()
+        report_expiry = {}
+        for srv in service_objects.Service.get_all(cnxt):
+            if srv.binary != 'heat-engine':
+                continue
+            expiry = ((srv.updated_at or srv.created_at) +
+                      datetime.timedelta(seconds=srv.report_interval))
+            if expiry >= now:
+                report_expiry[srv.host] = max(
+                    expiry, report_expiry.get(srv.host, expiry))
+        self._engine_report_expiry = report_expiry
+        self._engine_ring = hash_ring.HashRing(report_expiry)
+        self._engine_ring_expiry = timeutils.Duration(
+            cfg.CONF.periodic_interval)
+
+    def _engine_host(self, cnxt, stack_id):
+        """Return the host of the engine to check a stack's resources on.
+
+        Stacks are mapped onto the engines by consistent hashing, so that the
+        resources of a stack are checked by an engine that has already cached
+        its templates. Only engines whose last report is fresh are used: if
+        the report of the engine a stack maps to has gone stale, the engines
+        are read again from the service table before choosing. Returns None
+        if no engine is known to be alive.
+        """
+        host = None
+        if self._engine_ring is not None:
+            host = self._engine_ring.get_host(stack_id)
+        if host is None:
+            stale = (self._engine_ring is None or
+                     self._engine_ring_expiry.expired())
+        else:
+            stale = (self._engine_report_expiry[host] <
+                     oslo_timeutils.utcnow())
+        if stale:
+            self._refresh_engines(cnxt)
+            host = self._engine_ring.get_host(stack_id)
+        return host
+
+    def _check_resources(self, cnxt, stack, current_traversal, ready):
+        """Trigger the checks of resources whose dependencies are satisfied.
+
+        A single resource is checked with check_resource on any engine, while
+        many are sent together in one check_resources message to the engine
+        that the stack is mapped to, or to any engine if none is alive.
+        """
+        if len(ready) == 1:
+            resource_id, data, is_update = ready[0]
+            self._rpc_client.check_resource(cnxt, resource_id,
+                                            current_traversal, data,
+                                            is_update, stack.adopt_stack_data)
+        elif ready:
+            self._rpc_client.check_resources(
+                cnxt, stack.id, ready, current_traversal,
+                stack.adopt_stack_data,
+                server=self._engine_host(cnxt, stack.id))
+
     def _retrigger_check_resource(self, cnxt, is_update, resource_id, stack):
         current_traversal = stack.current_traversal
         graph = stack.convergence_dependencies.graph()
@@ -256,13 +384,17 @@ class WorkerService(service.Service):
                             else resource_id)
             return None
 
+        ready = []
         try:
-            for req, fwd in deps.required_by(graph_key):
-                input_data = _get_input_data(req, fwd)
-                propagate_check_resource(
-                    cnxt, self._rpc_client, req, current_traversal,
-                    set(graph[(req, fwd)]), graph_key, input_data, fwd,
-                    stack.adopt_stack_data)
+            try:
+                for req, fwd in deps.required_by(graph_key):
+                    input_data = _get_input_data(req, fwd)
+                    propagate_check_resource(
+                        cnxt, self._rpc_client, req, current_traversal,
+                        set(graph[(req, fwd)]), graph_key, input_data, fwd,
+                        stack.adopt_stack_data, ready)
+            finally:
+                self._check_resources(cnxt, stack, current_traversal, ready)
 
             check_stack_complete(cnxt, stack, current_traversal,
                                  resource_id, deps, is_update)
@@ -290,13 +422,15 @@ class WorkerService(service.Service):
         resource_data = dict(sync_point.deserialize_input_data(data))
         rsrc, rsrc_owning_stack, stack = self._load_resource(cnxt, resource_id,
                                                              resource_data,
-                                                             is_update)
+                                                             is_update,
+                                                             current_traversal)
 
         if rsrc is None:
             return
 
         if current_traversal != stack.current_traversal:
             LOG.debug('[%s] Traversal cancelled; stopping.', current_traversal)
+            self._traversal_cache.invalidate(current_traversal)
             return
 
         if stack.has_timed_out():
@@ -324,12 +458,22 @@ class WorkerService(service.Service):
                                               current_traversal, is_update,
                                               rsrc, stack)
 
+    @context.request_context
+    def check_resources(self, cnxt, stack_id, resources, current_traversal,
+                        adopt_stack_data):
+        """Process many nodes of the dependency graph of a stack.
+
+        Each node is processed in its own thread, exactly as if it had been
+        received in a separate check_resource message.
+        """
+        for resource_id, data, is_update in resources:
+            self.thread_group_mgr.start(stack_id, self.check_resource,
+                                        cnxt, resource_id, current_traversal,
+                                        data, is_update, adopt_stack_data)
+
 
 def construct_input_data(rsrc, curr_stack):
-    attributes = curr_stack.get_dep_attrs(
-        six.itervalues(curr_stack.resources),
-        curr_stack.outputs,
-        rsrc.name)
+    attributes = curr_stack.dep_attrs(rsrc.name)
     resolved_attributes = {}
     for attr in attributes:
         try:
@@ -372,9 +516,18 @@ def check_stack_complete(cnxt, stack, current_traversal, sender_id, deps,
 
 def propagate_check_resource(cnxt, rpc_client, next_res_id,
                              current_traversal, predecessors, sender_key,
-                             sender_data, is_update, adopt_stack_data):
-    """Trigger processing of node if all of its dependencies are satisfied."""
+                             sender_data, is_update, adopt_stack_data,
+                             ready=None):
+    """Trigger processing of node if all of its dependencies are satisfied.
+
+    If a ready list is passed, a node whose dependencies are satisfied is
+    appended to it as a (resource_id, data, is_update) tuple for the caller
+    to send, instead of being sent immediately.
+    """
     def do_check(entity_id, data):
+        if ready is not None:
+            ready.append((entity_id, data, is_update))
+            return
         rpc_client.check_resource(cnxt, entity_id, current_traversal,
                                   data, is_update, adopt_stack_data)
 
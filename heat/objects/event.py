@@ -42,8 +42,11 @@ class Event(
     }
 
     @staticmethod
-    def _from_db_object(context, event, db_event):
+    def _from_db_object(context, event, db_event,
+                        include_rsrc_prop_data=True):
         for field in event.fields:
+            if field == 'resource_properties' and not include_rsrc_prop_data:
+                continue
             event[field] = db_event[field]
         event._context = context
         event.obj_reset_changes()
@@ -60,17 +63,23 @@ class Event(
                 for db_event in db_api.event_get_all(context)]
 
     @classmethod
-    def get_all_by_tenant(cls, context, **kwargs):
-        return [cls._from_db_object(context, cls(), db_event)
-                for db_event in db_api.event_get_all_by_tenant(context,
-                                                               **kwargs)]
+    def get_all_by_tenant(cls, context, include_rsrc_prop_data=True,
+                          **kwargs):
+        db_events = db_api.event_get_all_by_tenant(
+            context, include_rsrc_prop_data=include_rsrc_prop_data, **kwargs)
+        return [cls._from_db_object(context, cls(), db_event,
+                                    include_rsrc_prop_data)
+                for db_event in db_events]
 
     @classmethod
-    def get_all_by_stack(cls, context, stack_id, **kwargs):
-        return [cls._from_db_object(context, cls(), db_event)
-                for db_event in db_api.event_get_all_by_stack(context,
-                                                              stack_id,
-                                                              **kwargs)]
+    def get_all_by_stack(cls, context, stack_id, include_rsrc_prop_data=True,
+                         **kwargs):
+        db_events = db_api.event_get_all_by_stack(
+            context, stack_id,
+            include_rsrc_prop_data=include_rsrc_prop_data, **kwargs)
+        return [cls._from_db_object(context, cls(), db_event,
+                                    include_rsrc_prop_data)
+                for db_event in db_events]
 
     @classmethod
     def count_all_by_stack(cls, context, stack_id):
@@ -80,3 +89,9 @@ class Event(
     def create(cls, context, values):
         return cls._from_db_object(context, cls(),
                                    db_api.event_create(context, values))
+
+    @classmethod
+    def create_many(cls, context, values_list):
+        return [cls._from_db_object(context, cls(), db_event)
+                for db_event in db_api.event_create_many(context,
+                                                         values_list)]
@@ -68,6 +68,11 @@ class RawTemplate(
         raw_template_db = db_api.raw_template_get(context, template_id)
         return cls._from_db_object(context, cls(), raw_template_db)
 
+    @classmethod
+    def get_templates(cls, context, template_ids):
+        """Return a dict of the template data of the given raw templates."""
+        return db_api.raw_template_get_templates(context, template_ids)
+
     @classmethod
     def encrypt_hidden_parameters(cls, tmpl):
         if cfg.CONF.encrypt_parameters_and_properties:
@@ -112,6 +112,12 @@ class Resource(
         return cls._from_db_object(cls(context), context,
                                    db_api.resource_create(context, values))
 
+    @classmethod
+    def create_many(cls, context, values_list):
+        return [cls._from_db_object(cls(context), context, resource_db)
+                for resource_db in db_api.resource_create_many(context,
+                                                               values_list)]
+
     @classmethod
     def delete(cls, context, resource_id):
         resource_db = db_api.resource_get(context, resource_id)
@@ -57,6 +57,7 @@ class Stack(
         'convergence': fields.BooleanField(),
         'current_traversal': fields.StringField(),
         'current_deps': heat_fields.JsonField(),
+        'current_deps_delta': heat_fields.JsonField(),
         'prev_raw_template_id': fields.IntegerField(),
         'prev_raw_template': fields.ObjectField('RawTemplate'),
         'tags': fields.ObjectField('StackTagList'),
@@ -64,12 +65,16 @@ class Stack(
     }
 
     @staticmethod
-    def _from_db_object(context, stack, db_stack):
+    def _from_db_object(context, stack, db_stack, load_template=True):
         for field in stack.fields:
             if field == 'raw_template':
-                stack['raw_template'] = (
-                    raw_template.RawTemplate.get_by_id(
-                        context, db_stack['raw_template_id']))
+                # If not loaded now, it is left as None for the caller to
+                # fetch (e.g. with Template.load()) if it needs it
+                stack['raw_template'] = None
+                if load_template:
+                    stack['raw_template'] = (
+                        raw_template.RawTemplate.get_by_id(
+                            context, db_stack['raw_template_id']))
             elif field == 'tags':
                 stack['tags'] = stack_tag.StackTagList.from_db_object(
                     context, db_stack.get(field))
@@ -84,11 +89,12 @@ class Stack(
         return db_api.stack_get_root_id(context, stack_id)
 
     @classmethod
-    def get_by_id(cls, context, stack_id, **kwargs):
+    def get_by_id(cls, context, stack_id, load_template=True, **kwargs):
         db_stack = db_api.stack_get(context, stack_id, **kwargs)
         if not db_stack:
             return None
-        stack = cls._from_db_object(context, cls(context), db_stack)
+        stack = cls._from_db_object(context, cls(context), db_stack,
+                                    load_template=load_template)
         return stack
 
     @classmethod
@@ -113,10 +119,12 @@ class Stack(
 
     @classmethod
     def get_all(cls, context, *args, **kwargs):
+        load_template = kwargs.get('load_template', True)
         db_stacks = db_api.stack_get_all(context, *args, **kwargs)
         for db_stack in db_stacks:
             try:
-                yield cls._from_db_object(context, cls(context), db_stack)
+                yield cls._from_db_object(context, cls(context), db_stack,
+                                          load_template=load_template)
             except exception.NotFound:
                 pass
 
@@ -129,6 +137,11 @@ class Stack(
             except exception.NotFound:
                 pass
 
+    @classmethod
+    def get_identities(cls, context, stack_ids):
+        """Return the id, name and tenant of each of the given stacks."""
+        return db_api.stack_get_identities(context, stack_ids)
+
     @classmethod
     def count_all(cls, context, **kwargs):
         return db_api.stack_count_all(context, **kwargs)
@@ -83,6 +83,22 @@ class SyncPoint(
             atomic_key,
             input_data)
 
+    @classmethod
+    def add_input(cls,
+                  context,
+                  entity_id,
+                  traversal_id,
+                  is_update,
+                  sender,
+                  input_data):
+        return db_api.sync_point_add_input(
+            context,
+            entity_id,
+            traversal_id,
+            is_update,
+            sender,
+            input_data)
+
     @classmethod
     def delete_all_by_stack_and_traversal(cls,
                                           context,
@@ -47,6 +47,8 @@ class EngineClient(object):
         1.24 - Adds ignorable_errors to validate_template
         1.25 - list_stack_resource filter update
         1.26 - Add mark_unhealthy
+        1.27 - Add include_rsrc_prop_data to list_events
+        1.28 - Add with_parameters option to list_stacks
     """
 
     BASE_RPC_API_VERSION = '1.0'
@@ -107,7 +109,7 @@ class EngineClient(object):
                     sort_dir=None, filters=None, tenant_safe=True,
                     show_deleted=False, show_nested=False, show_hidden=False,
                     tags=None, tags_any=None, not_tags=None,
-                    not_tags_any=None):
+                    not_tags_any=None, with_parameters=True):
         """Returns attributes of all stacks.
 
         It supports pagination (``limit`` and ``marker``), sorting
@@ -132,6 +134,7 @@ class EngineClient(object):
             multiple tags using the boolean AND expression
         :param not_tags_any: show stacks not containing these tags, combine
             multiple tags using the boolean OR expression
+        :param with_parameters: if true, include the parameters of the stacks
         :returns: a list of stacks
         """
         return self.call(ctxt,
@@ -144,8 +147,9 @@ class EngineClient(object):
                                        show_hidden=show_hidden,
                                        tags=tags, tags_any=tags_any,
                                        not_tags=not_tags,
-                                       not_tags_any=not_tags_any),
-                         version='1.8')
+                                       not_tags_any=not_tags_any,
+                                       with_parameters=with_parameters),
+                         version='1.28')
 
     def count_stacks(self, ctxt, filters=None, tenant_safe=True,
                      show_deleted=False, show_nested=False, show_hidden=False,
@@ -446,7 +450,8 @@ class EngineClient(object):
                          version='1.9')
 
     def list_events(self, ctxt, stack_identity, filters=None, limit=None,
-                    marker=None, sort_keys=None, sort_dir=None,):
+                    marker=None, sort_keys=None, sort_dir=None,
+                    include_rsrc_prop_data=True):
         """Lists all events associated with a given stack.
 
         It supports pagination (``limit`` and ``marker``),
@@ -460,14 +465,19 @@ class EngineClient(object):
         :param marker: the ID of the last event in the previous page
         :param sort_keys: an array of fields used to sort the list
         :param sort_dir: the direction of the sort ('asc' or 'desc').
+        :param include_rsrc_prop_data: whether to include the resource
+                                       properties of each event
         """
-        return self.call(ctxt, self.make_msg('list_events',
-                                             stack_identity=stack_identity,
-                                             filters=filters,
-                                             limit=limit,
-                                             marker=marker,
-                                             sort_keys=sort_keys,
-                                             sort_dir=sort_dir))
+        return self.call(ctxt, self.make_msg(
+            'list_events',
+            stack_identity=stack_identity,
+            filters=filters,
+            limit=limit,
+            marker=marker,
+            sort_keys=sort_keys,
+            sort_dir=sort_dir,
+            include_rsrc_prop_data=include_rsrc_prop_data),
+            version='1.27')
 
     def describe_stack_resource(self, ctxt, stack_identity, resource_name,
                                 with_attr=False):
@@ -15,9 +15,13 @@
 
 """Client side of the heat worker RPC API."""
 
+from oslo_config import cfg
+
 from heat.common import messaging
 from heat.rpc import worker_api
 
+cfg.CONF.import_opt('worker', 'heat.common.config', group='upgrade_levels')
+
 
 class WorkerClient(object):
     """Client side of the heat worker RPC API.
@@ -27,6 +31,7 @@ class WorkerClient(object):
         1.0 - Initial version.
         1.1 - Added check_resource.
         1.2 - Add adopt data argument to check_resource.
+        1.3 - Added check_resources.
     """
 
     BASE_RPC_API_VERSION = '1.0'
@@ -34,16 +39,22 @@ class WorkerClient(object):
     def __init__(self):
         self._client = messaging.get_rpc_client(
             topic=worker_api.TOPIC,
-            version=self.BASE_RPC_API_VERSION)
+            version=self.BASE_RPC_API_VERSION,
+            version_cap=cfg.CONF.upgrade_levels.worker)
 
     @staticmethod
     def make_msg(method, **kwargs):
         return method, kwargs
 
-    def cast(self, ctxt, msg, version=None):
+    def cast(self, ctxt, msg, version=None, server=None):
         method, kwargs = msg
+        prepare_args = {}
         if version is not None:
-            client = self._client.prepare(version=version)
+            prepare_args['version'] = version
+        if server is not None:
+            prepare_args['server'] = server
+        if prepare_args:
+            client = self._client.prepare(**prepare_args)
         else:
             client = self._client
         client.cast(ctxt, method, **kwargs)
@@ -56,3 +67,28 @@ class WorkerClient(object):
                       current_traversal=current_traversal, data=data,
                       is_update=is_update, adopt_stack_data=adopt_stack_data),
                   version='1.2')
+
+    def check_resources(self, ctxt, stack_id, resources, current_traversal,
+                        adopt_stack_data, server=None):
+        """Check many resources of a stack with a single message.
+
+        If the worker API version is capped below 1.3 by the
+        upgrade_levels.worker option, each resource is sent in a separate
+        check_resource message to any engine instead.
+
+        :param resources: a list of (resource_id, data, is_update) tuples
+        :param server: the host of the engine to send the message to, or
+                       None to send it to any engine
+        """
+        if not self._client.can_send_version('1.3'):
+            for resource_id, data, is_update in resources:
+                self.check_resource(ctxt, resource_id, current_traversal,
+                                    data, is_update, adopt_stack_data)
+            return
+        self.cast(ctxt,
+                  self.make_msg(
+                      'check_resources', stack_id=stack_id,
+                      resources=resources,
+                      current_traversal=current_traversal,
+                      adopt_stack_data=adopt_stack_data),
+                  version='1.3', server=server)
@@ -167,9 +167,9 @@ class CfnStackControllerTest(common.HeatTestCase):
                         'show_deleted': False, 'show_nested': False,
                         'show_hidden': False, 'tags': None,
                         'tags_any': None, 'not_tags': None,
-                        'not_tags_any': None}
+                        'not_tags_any': None, 'with_parameters': False}
         mock_call.assert_called_once_with(
-            dummy_req.context, ('list_stacks', default_args), version='1.8')
+            dummy_req.context, ('list_stacks', default_args), version='1.28')
 
     @mock.patch.object(rpc_client.EngineClient, 'call')
     def test_list_rmt_aterr(self, mock_call):
@@ -185,7 +185,7 @@ class CfnStackControllerTest(common.HeatTestCase):
         result = self.controller.list(dummy_req)
         self.assertIsInstance(result, exception.HeatInvalidParameterValueError)
         mock_call.assert_called_once_with(
-            dummy_req.context, ('list_stacks', mock.ANY), version='1.8')
+            dummy_req.context, ('list_stacks', mock.ANY), version='1.28')
 
     @mock.patch.object(rpc_client.EngineClient, 'call')
     def test_list_rmt_interr(self, mock_call):
@@ -201,7 +201,7 @@ class CfnStackControllerTest(common.HeatTestCase):
         result = self.controller.list(dummy_req)
         self.assertIsInstance(result, exception.HeatInternalFailureError)
         mock_call.assert_called_once_with(
-            dummy_req.context, ('list_stacks', mock.ANY), version='1.8')
+            dummy_req.context, ('list_stacks', mock.ANY), version='1.28')
 
     def test_describe_last_updated_time(self):
         params = {'Action': 'DescribeStacks'}
@@ -1215,13 +1215,14 @@ class CfnStackControllerTest(common.HeatTestCase):
 
         kwargs = {'stack_identity': identity,
                   'limit': None, 'sort_keys': None, 'marker': None,
-                  'sort_dir': None, 'filters': None}
+                  'sort_dir': None, 'filters': None,
+                  'include_rsrc_prop_data': True}
         self.m.StubOutWithMock(rpc_client.EngineClient, 'call')
         rpc_client.EngineClient.call(
             dummy_req.context, ('identify_stack', {'stack_name': stack_name})
         ).AndReturn(identity)
         rpc_client.EngineClient.call(
-            dummy_req.context, ('list_events', kwargs)
+            dummy_req.context, ('list_events', kwargs), version='1.27'
         ).AndReturn(engine_resp)
 
         self.m.ReplayAll()
@@ -1259,7 +1260,8 @@ class CfnStackControllerTest(common.HeatTestCase):
             dummy_req.context, ('identify_stack', {'stack_name': stack_name})
         ).AndReturn(identity)
         rpc_client.EngineClient.call(
-            dummy_req.context, ('list_events', {'stack_identity': identity})
+            dummy_req.context, ('list_events', {'stack_identity': identity}),
+            version='1.27'
         ).AndRaise(Exception())
 
         self.m.ReplayAll()
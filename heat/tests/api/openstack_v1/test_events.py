@@ -65,7 +65,8 @@ class EventControllerTest(tools.ControllerTest, common.HeatTestCase):
 
         kwargs = {'stack_identity': stack_identity,
                   'limit': None, 'sort_keys': None, 'marker': None,
-                  'sort_dir': None, 'filters': {'resource_name': res_name}}
+                  'sort_dir': None, 'filters': {'resource_name': res_name},
+                  'include_rsrc_prop_data': False}
 
         engine_resp = [
             {
@@ -84,8 +85,8 @@ class EventControllerTest(tools.ControllerTest, common.HeatTestCase):
         ]
         self.m.StubOutWithMock(rpc_client.EngineClient, 'call')
         rpc_client.EngineClient.call(
-            req.context, ('list_events', kwargs)
-        ).AndReturn(engine_resp)
+            req.context, ('list_events', kwargs),
+            version='1.27').AndReturn(engine_resp)
         self.m.ReplayAll()
 
         result = self.controller.index(req, tenant_id=self.tenant,
@@ -155,7 +156,7 @@ class EventControllerTest(tools.ControllerTest, common.HeatTestCase):
 
         rpc_call_args, _ = mock_call.call_args
         engine_args = rpc_call_args[1][1]
-        self.assertEqual(6, len(engine_args))
+        self.assertEqual(7, len(engine_args))
         self.assertIn('filters', engine_args)
         self.assertIn('resource_name', engine_args['filters'])
         self.assertEqual(res_name, engine_args['filters']['resource_name'])
@@ -202,7 +203,7 @@ class EventControllerTest(tools.ControllerTest, common.HeatTestCase):
 
         rpc_call_args, _ = mock_call.call_args
         engine_args = rpc_call_args[1][1]
-        self.assertEqual(6, len(engine_args))
+        self.assertEqual(7, len(engine_args))
         self.assertIn('filters', engine_args)
         self.assertIn('resource_name', engine_args['filters'])
         self.assertIn('resource1', engine_args['filters']['resource_name'])
@@ -229,7 +230,8 @@ class EventControllerTest(tools.ControllerTest, common.HeatTestCase):
 
         kwargs = {'stack_identity': stack_identity,
                   'limit': None, 'sort_keys': None, 'marker': None,
-                  'sort_dir': None, 'filters': {'resource_name': res_name}}
+                  'sort_dir': None, 'filters': {'resource_name': res_name},
+                  'include_rsrc_prop_data': False}
 
         engine_resp = [
             {
@@ -249,8 +251,8 @@ class EventControllerTest(tools.ControllerTest, common.HeatTestCase):
         self.m.StubOutWithMock(rpc_client.EngineClient, 'call')
         rpc_client.EngineClient.call(
             req.context,
-            ('list_events', kwargs)
-        ).AndReturn(engine_resp)
+            ('list_events', kwargs),
+            version='1.27').AndReturn(engine_resp)
         self.m.ReplayAll()
 
         result = self.controller.index(req, tenant_id=self.tenant,
@@ -289,14 +291,15 @@ class EventControllerTest(tools.ControllerTest, common.HeatTestCase):
 
         kwargs = {'stack_identity': stack_identity,
                   'limit': None, 'sort_keys': None, 'marker': None,
-                  'sort_dir': None, 'filters': None}
+                  'sort_dir': None, 'filters': None,
+                  'include_rsrc_prop_data': False}
 
         error = heat_exc.EntityNotFound(entity='Stack', name='a')
         self.m.StubOutWithMock(rpc_client.EngineClient, 'call')
         rpc_client.EngineClient.call(
             req.context,
-            ('list_events', kwargs)
-        ).AndRaise(tools.to_remote_error(error))
+            ('list_events', kwargs),
+            version='1.27').AndRaise(tools.to_remote_error(error))
         self.m.ReplayAll()
 
         resp = tools.request_with_middleware(
@@ -338,14 +341,15 @@ class EventControllerTest(tools.ControllerTest, common.HeatTestCase):
 
         kwargs = {'stack_identity': stack_identity,
                   'limit': None, 'sort_keys': None, 'marker': None,
-                  'sort_dir': None, 'filters': {'resource_name': res_name}}
+                  'sort_dir': None, 'filters': {'resource_name': res_name},
+                  'include_rsrc_prop_data': False}
 
         engine_resp = []
         self.m.StubOutWithMock(rpc_client.EngineClient, 'call')
         rpc_client.EngineClient.call(
             req.context,
-            ('list_events', kwargs)
-        ).AndReturn(engine_resp)
+            ('list_events', kwargs),
+            version='1.27').AndReturn(engine_resp)
         self.m.ReplayAll()
 
         self.assertRaises(webob.exc.HTTPNotFound,
@@ -380,7 +384,7 @@ class EventControllerTest(tools.ControllerTest, common.HeatTestCase):
 
         rpc_call_args, _ = mock_call.call_args
         engine_args = rpc_call_args[1][1]
-        self.assertEqual(6, len(engine_args))
+        self.assertEqual(7, len(engine_args))
         self.assertIn('limit', engine_args)
         self.assertEqual(10, engine_args['limit'])
         self.assertIn('sort_keys', engine_args)
@@ -470,7 +474,8 @@ class EventControllerTest(tools.ControllerTest, common.HeatTestCase):
         kwargs = {'stack_identity': stack_identity,
                   'limit': None, 'sort_keys': None, 'marker': None,
                   'sort_dir': None,
-                  'filters': {'resource_name': res_name, 'uuid': event_id}}
+                  'filters': {'resource_name': res_name, 'uuid': event_id},
+                  'include_rsrc_prop_data': True}
 
         engine_resp = [
             {
@@ -491,8 +496,8 @@ class EventControllerTest(tools.ControllerTest, common.HeatTestCase):
         self.m.StubOutWithMock(rpc_client.EngineClient, 'call')
         rpc_client.EngineClient.call(
             req.context,
-            ('list_events', kwargs)
-        ).AndReturn(engine_resp)
+            ('list_events', kwargs),
+            version='1.27').AndReturn(engine_resp)
         self.m.ReplayAll()
 
         result = self.controller.show(req, tenant_id=self.tenant,
@@ -537,12 +542,14 @@ class EventControllerTest(tools.ControllerTest, common.HeatTestCase):
         kwargs = {'stack_identity': stack_identity,
                   'limit': None, 'sort_keys': None, 'marker': None,
                   'sort_dir': None,
-                  'filters': {'resource_name': res_name, 'uuid': '42'}}
+                  'filters': {'resource_name': res_name, 'uuid': '42'},
+                  'include_rsrc_prop_data': True}
 
         engine_resp = []
         self.m.StubOutWithMock(rpc_client.EngineClient, 'call')
         rpc_client.EngineClient.call(
-            req.context, ('list_events', kwargs)).AndReturn(engine_resp)
+            req.context, ('list_events', kwargs),
+            version='1.27').AndReturn(engine_resp)
         self.m.ReplayAll()
 
         self.assertRaises(webob.exc.HTTPNotFound,
@@ -566,13 +573,14 @@ class EventControllerTest(tools.ControllerTest, common.HeatTestCase):
         kwargs = {'stack_identity': stack_identity,
                   'limit': None, 'sort_keys': None, 'marker': None,
                   'sort_dir': None,
-                  'filters': {'resource_name': res_name, 'uuid': '42'}}
+                  'filters': {'resource_name': res_name, 'uuid': '42'},
+                  'include_rsrc_prop_data': True}
 
         error = heat_exc.EntityNotFound(entity='Stack', name='a')
         self.m.StubOutWithMock(rpc_client.EngineClient, 'call')
         rpc_client.EngineClient.call(
-            req.context, ('list_events', kwargs)
-        ).AndRaise(tools.to_remote_error(error))
+            req.context, ('list_events', kwargs),
+            version='1.27').AndRaise(tools.to_remote_error(error))
         self.m.ReplayAll()
 
         resp = tools.request_with_middleware(
@@ -647,7 +655,7 @@ class EventControllerTest(tools.ControllerTest, common.HeatTestCase):
 
         rpc_call_args, _ = mock_call.call_args
         engine_args = rpc_call_args[1][1]
-        self.assertEqual(6, len(engine_args))
+        self.assertEqual(7, len(engine_args))
         self.assertIn('filters', engine_args)
         self.assertIn('resource_name', engine_args['filters'])
         self.assertIn(res_name, engine_args['filters']['resource_name'])
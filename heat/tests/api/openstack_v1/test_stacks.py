@@ -286,9 +286,9 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
                         'show_deleted': False, 'show_nested': False,
                         'show_hidden': False, 'tags': None,
                         'tags_any': None, 'not_tags': None,
-                        'not_tags_any': None}
+                        'not_tags_any': None, 'with_parameters': False}
         mock_call.assert_called_once_with(
-            req.context, ('list_stacks', default_args), version='1.8')
+            req.context, ('list_stacks', default_args), version='1.28')
 
     @mock.patch.object(rpc_client.EngineClient, 'call')
     def test_index_whitelists_pagination_params(self, mock_call, mock_enforce):
@@ -307,7 +307,7 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
 
         rpc_call_args, _ = mock_call.call_args
         engine_args = rpc_call_args[1][1]
-        self.assertEqual(13, len(engine_args))
+        self.assertEqual(14, len(engine_args))
         self.assertIn('limit', engine_args)
         self.assertIn('sort_keys', engine_args)
         self.assertIn('marker', engine_args)
@@ -461,7 +461,8 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         self.controller.index(req, tenant_id=self.tenant)
         rpc_client.list_stacks.assert_called_once_with(mock.ANY,
                                                        filters=mock.ANY,
-                                                       tenant_safe=False)
+                                                       tenant_safe=False,
+                                                       with_parameters=False)
 
     def test_global_index_show_deleted_false(self, mock_enforce):
         rpc_client = self.controller.rpc_client
@@ -474,6 +475,7 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         rpc_client.list_stacks.assert_called_once_with(mock.ANY,
                                                        filters=mock.ANY,
                                                        tenant_safe=True,
+                                                       with_parameters=False,
                                                        show_deleted=False)
 
     def test_global_index_show_deleted_true(self, mock_enforce):
@@ -487,6 +489,7 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         rpc_client.list_stacks.assert_called_once_with(mock.ANY,
                                                        filters=mock.ANY,
                                                        tenant_safe=True,
+                                                       with_parameters=False,
                                                        show_deleted=True)
 
     def test_global_index_show_nested_false(self, mock_enforce):
@@ -500,6 +503,7 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         rpc_client.list_stacks.assert_called_once_with(mock.ANY,
                                                        filters=mock.ANY,
                                                        tenant_safe=True,
+                                                       with_parameters=False,
                                                        show_nested=False)
 
     def test_global_index_show_nested_true(self, mock_enforce):
@@ -513,6 +517,7 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         rpc_client.list_stacks.assert_called_once_with(mock.ANY,
                                                        filters=mock.ANY,
                                                        tenant_safe=True,
+                                                       with_parameters=False,
                                                        show_nested=True)
 
     def test_index_show_deleted_True_with_count_True(self, mock_enforce):
@@ -528,6 +533,7 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         rpc_client.list_stacks.assert_called_once_with(mock.ANY,
                                                        filters=mock.ANY,
                                                        tenant_safe=True,
+                                                       with_parameters=False,
                                                        show_deleted=True)
         rpc_client.count_stacks.assert_called_once_with(mock.ANY,
                                                         filters=mock.ANY,
@@ -599,9 +605,9 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
                         'show_deleted': False, 'show_nested': False,
                         'show_hidden': False, 'tags': None,
                         'tags_any': None, 'not_tags': None,
-                        'not_tags_any': None}
+                        'not_tags_any': None, 'with_parameters': True}
         mock_call.assert_called_once_with(
-            req.context, ('list_stacks', default_args), version='1.8')
+            req.context, ('list_stacks', default_args), version='1.28')
 
     @mock.patch.object(rpc_client.EngineClient, 'call')
     def test_index_rmt_aterr(self, mock_call, mock_enforce):
@@ -617,7 +623,7 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         self.assertEqual(400, resp.json['code'])
         self.assertEqual('AttributeError', resp.json['error']['type'])
         mock_call.assert_called_once_with(
-            req.context, ('list_stacks', mock.ANY), version='1.8')
+            req.context, ('list_stacks', mock.ANY), version='1.28')
 
     def test_index_err_denied_policy(self, mock_enforce):
         self._mock_enforce_setup(mock_enforce, 'index', False)
@@ -645,7 +651,7 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         self.assertEqual(500, resp.json['code'])
         self.assertEqual('Exception', resp.json['error']['type'])
         mock_call.assert_called_once_with(
-            req.context, ('list_stacks', mock.ANY), version='1.8')
+            req.context, ('list_stacks', mock.ANY), version='1.28')
 
     def test_create(self, mock_enforce):
         self._mock_enforce_setup(mock_enforce, 'create', True)
@@ -14,6 +14,7 @@
 
 import uuid
 
+from cinderclient import exceptions as cinder_exc
 import mock
 
 from heat.common import exception
@@ -53,6 +54,26 @@ class CinderClientPluginTest(common.HeatTestCase):
         self.cinder_client.volume_snapshots.get.assert_called_once_with(
             snapshot_id)
 
+    def test_list_volumes(self):
+        volumes = [mock.Mock(), mock.Mock()]
+        self.cinder_client.volumes.list.return_value = volumes
+        self.assertEqual(volumes, self.cinder_plugin._list_volumes())
+        self.cinder_client.volumes.list.assert_called_once_with(
+            detailed=True)
+
+    def test_list_volumes_unavailable(self):
+        for ex in (cinder_exc.OverLimit(413),
+                   cinder_exc.ClientException(500),
+                   cinder_exc.ClientException(503)):
+            self.cinder_client.volumes.list.side_effect = ex
+            self.assertIsNone(self.cinder_plugin._list_volumes())
+
+    def test_list_volumes_error(self):
+        self.cinder_client.volumes.list.side_effect = (
+            cinder_exc.ClientException(400))
+        self.assertRaises(cinder_exc.ClientException,
+                          self.cinder_plugin._list_volumes)
+
 
 class VolumeConstraintTest(common.HeatTestCase):
 
@@ -34,6 +34,7 @@ from zaqarclient.transport import errors as zaqar_exc
 from heat.common import exception
 from heat.engine import clients
 from heat.engine.clients import client_plugin
+from heat.engine import scheduler
 from heat.tests import common
 from heat.tests import fakes
 from heat.tests.openstack.nova import fakes as fakes_nova
@@ -383,6 +384,142 @@ class ClientPluginTest(common.HeatTestCase):
         self.assertEqual(2, plugin._create.call_count)
 
 
+class BatchPollerTest(common.HeatTestCase):
+
+    def setUp(self):
+        super(BatchPollerTest, self).setUp()
+        self.fetch = mock.Mock(side_effect=lambda i: mock.Mock(id=i))
+        self.list = mock.Mock()
+        self.poller = client_plugin.BatchPoller(
+            self.fetch, self.list, scheduler.PollInterval(60))
+
+    def test_single_object(self):
+        for i in range(3):
+            self.assertEqual('1', self.poller.fetch('1').id)
+        self.assertEqual(3, self.fetch.call_count)
+        self.assertFalse(self.list.called)
+
+    def test_many_objects(self):
+        ids = ['1', '2', '3']
+        self.list.return_value = [mock.Mock(id=i) for i in ids + ['4']]
+
+        # The first poll of each object is individual
+        for i in ids:
+            self.assertEqual(i, self.poller.fetch(i).id)
+        self.assertEqual(3, self.fetch.call_count)
+        self.assertFalse(self.list.called)
+
+        for step in range(2):
+            for i in ids:
+                self.assertEqual(i, self.poller.fetch(i).id)
+        self.assertEqual(2, self.list.call_count)
+        self.assertEqual(3, self.fetch.call_count)
+
+    def test_missing_from_list(self):
+        self.list.return_value = [mock.Mock(id='1')]
+        self.poller.fetch('1')
+        self.poller.fetch('2')
+
+        self.assertEqual('1', self.poller.fetch('1').id)
+        self.assertEqual('2', self.poller.fetch('2').id)
+        self.assertEqual(1, self.list.call_count)
+        self.assertEqual(3, self.fetch.call_count)
+
+    def test_list_unavailable(self):
+        self.list.return_value = None
+        self.poller.fetch('1')
+        self.poller.fetch('2')
+
+        self.assertIsNone(self.poller.fetch('1'))
+        self.assertIsNone(self.poller.fetch('2'))
+        self.assertEqual(1, self.list.call_count)
+
+    def test_expired(self):
+        self.poller.max_age = -1
+        self.list.return_value = [mock.Mock(id='1'), mock.Mock(id='2')]
+        self.poller.fetch('1')
+        self.poller.fetch('2')
+
+        self.poller.fetch('1')
+        self.poller.fetch('2')
+        self.assertEqual(2, self.list.call_count)
+
+    def test_discard(self):
+        self.poller.fetch('1')
+        self.poller.fetch('2')
+        self.poller.discard('2')
+
+        self.poller.fetch('1')
+        self.assertFalse(self.list.called)
+        self.assertEqual(3, self.fetch.call_count)
+
+    def test_max_age(self):
+        poller = client_plugin.BatchPoller(
+            self.fetch, self.list,
+            scheduler.ExponentialBackoff(max_interval=15, jitter_max=1))
+        self.assertEqual(16, poller.max_age)
+
+    def test_fetch_error_discards(self):
+        self.poller.fetch('1')
+        self.poller.fetch('2')
+        self.fetch.side_effect = exception.EntityNotFound(entity='Server',
+                                                          name='3')
+        self.assertRaises(exception.EntityNotFound, self.poller.fetch, '3')
+
+        self.poller.discard('2')
+        self.fetch.side_effect = lambda i: mock.Mock(id=i)
+        self.poller.fetch('1')
+        self.assertFalse(self.list.called)
+
+    def test_stale_objects_dropped(self):
+        self.poller.fetch('1')
+        self.poller.fetch('2')
+        self.poller._pending['2'] = mock.Mock(
+            **{'expired.return_value': True})
+
+        self.poller.fetch('1')
+        self.assertFalse(self.list.called)
+        self.assertNotIn('2', self.poller._pending)
+
+    def test_large_tenant_not_listed(self):
+        self.list.return_value = [mock.Mock(id=str(i)) for i in range(100)]
+        self.poller.fetch('1')
+        self.poller.fetch('2')
+
+        self.poller.fetch('1')
+        self.poller.fetch('2')
+        self.assertEqual(1, self.list.call_count)
+        self.assertEqual(100, self.poller._tenant_size)
+
+        # the objects being polled are too few for a list to pay off
+        self.poller.max_age = -1
+        self.poller.fetch('1')
+        self.poller.fetch('2')
+        self.assertEqual(1, self.list.call_count)
+        self.assertEqual(4, self.fetch.call_count)
+
+    def test_objects_not_on_first_page(self):
+        self.list.return_value = [mock.Mock(id=str(i)) for i in range(4)]
+        for i in ('1', '10', '11', '12'):
+            self.poller.fetch(i)
+
+        self.poller.fetch('1')
+        self.assertEqual(1, self.list.call_count)
+        # one in four objects was listed, so the tenant has about sixteen
+        self.assertEqual(16, self.poller._tenant_size)
+
+    def test_tenant_size_expires(self):
+        self.poller.ESTIMATE_AGE = -1
+        self.list.return_value = [mock.Mock(id=str(i)) for i in range(100)]
+        self.poller.max_age = -1
+        self.poller.fetch('1')
+        self.poller.fetch('2')
+
+        self.poller.fetch('1')
+        self.poller.fetch('2')
+        self.assertEqual(2, self.list.call_count)
+
+
 class TestClientPluginsInitialise(common.HeatTestCase):
 
     @testcase.skip('skipped until keystone can read context auth_ref')
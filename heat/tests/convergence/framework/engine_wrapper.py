@@ -16,6 +16,7 @@ import six
 from heat.db import api as db_api
 from heat.engine import service
 from heat.engine import stack
+from heat.objects import stack as stack_object
 from heat.tests.convergence.framework import message_processor
 from heat.tests.convergence.framework import message_queue
 from heat.tests.convergence.framework import scenario_template
@@ -98,6 +99,6 @@ class Engine(message_processor.MessageProcessor):
     @message_processor.asynchronous
     def rollback_stack(self, stack_name):
         cntxt = utils.dummy_context()
-        db_stack = db_api.stack_get_by_name(cntxt, stack_name)
-        stk = stack.Stack.load(cntxt, stack=db_stack)
+        stack_obj = stack_object.Stack.get_by_name(cntxt, stack_name)
+        stk = stack.Stack.load(cntxt, stack=stack_obj)
         stk.rollback()
@@ -35,3 +35,9 @@ class Worker(message_processor.MessageProcessor):
                                  current_traversal,
                                  data, is_update,
                                  adopt_stack_data)
+
+    def check_resources(self, ctxt, stack_id, resources,
+                        current_traversal, adopt_stack_data, server=None):
+        for resource_id, data, is_update in resources:
+            self.check_resource(ctxt, resource_id, current_traversal,
+                                data, is_update, adopt_stack_data)
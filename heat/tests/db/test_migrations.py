@@ -747,6 +747,44 @@ class HeatMigrationsCheckers(test_migrations.WalkVersionsMixin,
         self.assertIndexMembers(engine, 'stack', 'ix_stack_owner_id',
                                 ['owner_id'])
 
+    def _check_072(self, engine, data):
+        self.assertColumnExists(engine, 'event', 'rsrc_prop_data')
+        self.assertColumnIsNullable(engine, 'event', 'rsrc_prop_data')
+
+    def _check_073(self, engine, data):
+        column_list = [('entity_id', False),
+                       ('traversal_id', False),
+                       ('is_update', False),
+                       ('sender', False),
+                       ('input_data', True),
+                       ('updated_at', True),
+                       ('created_at', True)]
+        for column in column_list:
+            self.assertColumnExists(engine, 'sync_point_input', column[0])
+            if not column[1]:
+                self.assertColumnIsNotNullable(engine, 'sync_point_input',
+                                               column[0])
+            else:
+                self.assertColumnIsNullable(engine, 'sync_point_input',
+                                            column[0])
+        self.assertIndexMembers(engine, 'sync_point_input',
+                                'ix_sync_point_input_traversal_id',
+                                ['traversal_id'])
+
+    def _check_074(self, engine, data):
+        self.assertColumnExists(engine, 'stack', 'current_deps_delta')
+        self.assertColumnIsNullable(engine, 'stack', 'current_deps_delta')
+
+    def _check_075(self, engine, data):
+        self.assertColumnExists(engine, 'raw_template_blob', 'id')
+        self.assertColumnExists(engine, 'raw_template_blob', 'data')
+        self.assertColumnExists(engine, 'raw_template_blob', 'ref_count')
+        self.assertColumnIsNotNullable(engine, 'raw_template_blob',
+                                       'ref_count')
+        for column in ('template_blob_id', 'files_blob_id'):
+            self.assertColumnExists(engine, 'raw_template', column)
+            self.assertColumnIsNullable(engine, 'raw_template', column)
+
 
 class TestHeatMigrationsMySQL(HeatMigrationsCheckers,
                               test_base.MySQLOpportunisticTestCase):
@@ -13,6 +13,7 @@
 
 import datetime
 import json
+import random
 import time
 import uuid
 
@@ -1487,6 +1488,27 @@ class DBAPIRawTemplateTest(common.HeatTestCase):
         self.assertEqual(tp.id, template.id)
         self.assertEqual(tp.template, template.template)
 
+    def test_raw_template_get_templates(self):
+        t1 = template_format.parse(wp_template)
+        t2 = {'heat_template_version': '2015-10-15'}
+        tp1 = create_raw_template(self.ctx, template=t1, files={'foo': 'bar'})
+        tp2 = create_raw_template(self.ctx, template=t2)
+
+        # Use a new session, so that nothing is already loaded
+        ctx = utils.dummy_context()
+        load_blobs = self.patchobject(db_api, '_raw_template_load_blobs',
+                                      wraps=db_api._raw_template_load_blobs)
+        templates = db_api.raw_template_get_templates(
+            ctx, [tp1.id, tp2.id, tp2.id + 1])
+        self.assertEqual({tp1.id: t1, tp2.id: t2}, templates)
+        loaded = load_blobs.call_args[0][1]
+        self.assertEqual(2, len(loaded))
+        for rt in loaded:
+            self.assertNotIn('files', rt.__dict__)
+            self.assertNotIn('environment', rt.__dict__)
+
+        self.assertEqual({}, db_api.raw_template_get_templates(ctx, []))
+
     def test_raw_template_update(self):
         another_wp_template = '''
         {
@@ -1536,6 +1558,103 @@ class DBAPIRawTemplateTest(common.HeatTestCase):
         self.assertRaises(exception.NotFound, db_api.raw_template_get,
                           self.ctx, tp.id)
 
+    def _blob_ref_count(self, blob_id):
+        blob = self.ctx.session.query(
+            models.RawTemplateBlob.ref_count).filter_by(id=blob_id).first()
+        return blob.ref_count if blob is not None else 0
+
+    def test_raw_template_create_shared(self):
+        tp1 = create_raw_template(self.ctx)
+        tp2 = create_raw_template(self.ctx, files={})
+        tp3 = create_raw_template(self.ctx)
+
+        self.assertIsNotNone(tp1.template_blob_id)
+        self.assertEqual(tp1.template_blob_id, tp2.template_blob_id)
+        self.assertEqual(tp1.template_blob_id, tp3.template_blob_id)
+        self.assertEqual(3, self._blob_ref_count(tp1.template_blob_id))
+        self.assertIsNotNone(tp1.files_blob_id)
+        self.assertIsNone(tp2.files_blob_id)
+        self.assertEqual(2, self._blob_ref_count(tp1.files_blob_id))
+
+        # the shared contents are not stored in the raw templates themselves
+        stored = self.ctx.session.query(models.RawTemplate.template,
+                                        models.RawTemplate.files).filter_by(
+            id=tp1.id).one()
+        self.assertIsNone(stored.template)
+        self.assertIsNone(stored.files)
+        self.assertEqual({}, tp2.files)
+
+    def test_raw_template_get_shared(self):
+        t = template_format.parse(wp_template)
+        tp1 = create_raw_template(self.ctx)
+        tp2 = create_raw_template(self.ctx)
+
+        ctx = utils.dummy_context()
+        template1 = db_api.raw_template_get(ctx, tp1.id)
+        template2 = db_api.raw_template_get(ctx, tp2.id)
+        self.assertEqual(t, template1.template)
+        self.assertEqual({'foo': 'bar'}, template1.files)
+
+        # each raw template has its own copy of the shared contents
+        template1.template['Resources'] = {}
+        template1.files['foo'] = 'baz'
+        self.assertEqual(t, template2.template)
+        self.assertEqual({'foo': 'bar'}, template2.files)
+
+    def test_raw_template_update_shared(self):
+        tp1 = create_raw_template(self.ctx)
+        tp2 = create_raw_template(self.ctx)
+        old_blob_id = tp1.template_blob_id
+        new_t = {'HeatTemplateFormatVersion': '2012-12-12'}
+
+        updated_tp = db_api.raw_template_update(self.ctx, tp1.id,
+                                                {'template': new_t})
+        self.assertEqual(new_t, updated_tp.template)
+        self.assertNotEqual(old_blob_id, updated_tp.template_blob_id)
+        self.assertEqual(1, self._blob_ref_count(old_blob_id))
+        self.assertEqual(1,
+                         self._blob_ref_count(updated_tp.template_blob_id))
+
+        db_api.raw_template_update(self.ctx, tp2.id, {'template': new_t})
+        self.assertEqual(0, self._blob_ref_count(old_blob_id))
+        self.assertEqual(2,
+                         self._blob_ref_count(updated_tp.template_blob_id))
+        self.assertEqual(new_t,
+                         db_api.raw_template_get(utils.dummy_context(),
+                                                 tp2.id).template)
+
+    def test_raw_template_update_not_shared(self):
+        t = template_format.parse(wp_template)
+        tp_ref = models.RawTemplate()
+        tp_ref.update({'template': t, 'files': {'foo': 'bar'}})
+        tp_ref.save(self.ctx.session)
+        self.assertIsNone(tp_ref.template_blob_id)
+
+        template = db_api.raw_template_get(utils.dummy_context(), tp_ref.id)
+        self.assertEqual(t, template.template)
+
+        new_t = {'HeatTemplateFormatVersion': '2012-12-12'}
+        updated_tp = db_api.raw_template_update(self.ctx, tp_ref.id,
+                                                {'template': new_t})
+        self.assertEqual(new_t, updated_tp.template)
+        self.assertIsNotNone(updated_tp.template_blob_id)
+        self.assertIsNone(updated_tp.files_blob_id)
+        self.assertEqual({'foo': 'bar'}, updated_tp.files)
+
+    def test_raw_template_delete_shared(self):
+        tp1 = create_raw_template(self.ctx)
+        tp2 = create_raw_template(self.ctx)
+        blob_id = tp1.template_blob_id
+
+        db_api.raw_template_delete(self.ctx, tp1.id)
+        self.assertEqual(1, self._blob_ref_count(blob_id))
+        self.assertIsNotNone(db_api.raw_template_get(utils.dummy_context(),
+                                                     tp2.id).template)
+
+        db_api.raw_template_delete(self.ctx, tp2.id)
+        self.assertEqual(0, self.ctx.session.query(
+            models.RawTemplateBlob).count())
+
 
 class DBAPIUserCredsTest(common.HeatTestCase):
     def setUp(self):
@@ -1816,6 +1935,45 @@ class DBAPIStackTest(common.HeatTestCase):
         names = [ret_stack.name for ret_stack in ret_stacks]
         [self.assertIn(val['name'], names) for val in values]
 
+    def test_stack_get_all_eager_load(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds,
+                             current_deps={'edges': [[['a', True], None]]})
+        db_api.stack_tags_set(self.ctx, stack.id, ['tag1'])
+
+        # Use a new session, so that nothing is already loaded
+        ctx = utils.dummy_context()
+        ret_stacks = db_api.stack_get_all(ctx, eager_load=True)
+        self.assertEqual(1, len(ret_stacks))
+        loaded = ret_stacks[0].__dict__
+        self.assertEqual(stack.raw_template_id, loaded['raw_template'].id)
+        self.assertEqual(self.template.template,
+                         loaded['raw_template'].__dict__['template'])
+        self.assertEqual(['tag1'], [t.tag for t in loaded['tags']])
+        self.assertNotIn('current_deps', loaded)
+
+    def test_stack_get_all_eager_load_no_template(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        db_api.stack_tags_set(self.ctx, stack.id, ['tag1'])
+
+        # Use a new session, so that nothing is already loaded
+        ctx = utils.dummy_context()
+        ret_stacks = db_api.stack_get_all(ctx, eager_load=True,
+                                          load_template=False)
+        self.assertEqual(1, len(ret_stacks))
+        loaded = ret_stacks[0].__dict__
+        self.assertNotIn('raw_template', loaded)
+        self.assertEqual(['tag1'], [t.tag for t in loaded['tags']])
+
+    def test_stack_get_identities(self):
+        stacks = [create_stack(self.ctx, self.template, self.user_creds,
+                               name='stack%d' % i) for i in range(3)]
+
+        identities = db_api.stack_get_identities(
+            self.ctx, [s.id for s in stacks[:2]])
+        self.assertEqual(
+            sorted((s.id, s.name, self.ctx.tenant_id) for s in stacks[:2]),
+            sorted(tuple(i) for i in identities))
+
     def test_stack_get_all_by_owner_id(self):
         parent_stack1 = create_stack(self.ctx, self.template, self.user_creds)
         parent_stack2 = create_stack(self.ctx, self.template, self.user_creds)
@@ -1941,6 +2099,79 @@ class DBAPIStackTest(common.HeatTestCase):
                                               show_deleted=True))
         self.assertIsNotNone(db_api.raw_template_get(ctx, templates[1].id))
 
+    def test_purge_deleted_batched(self):
+        now = timeutils.utcnow()
+        templates = [create_raw_template(self.ctx) for i in range(5)]
+        creds = [create_user_creds(self.ctx) for i in range(5)]
+        stacks = [create_stack(self.ctx, templates[i], creds[i],
+                               deleted_at=now - datetime.timedelta(
+                                   seconds=10))
+                  for i in range(5)]
+        for s in stacks:
+            create_resource(self.ctx, s)
+            create_event(self.ctx, stack_id=s.id)
+
+        sleep = self.patchobject(db_api, 'time').sleep
+        counts = db_api.purge_deleted(age=5, granularity='seconds',
+                                      batch_size=2, sleep_time=3)
+
+        self._deleted_stack_existance(utils.dummy_context(), stacks,
+                                      (), (0, 1, 2, 3, 4))
+        for table in ('stack', 'resource', 'event', 'raw_template',
+                      'user_creds'):
+            self.assertEqual(5, counts[table])
+        self.assertEqual([mock.call(3)] * 2, sleep.call_args_list)
+
+    def test_purge_deleted_batched_no_trailing_sleep(self):
+        now = timeutils.utcnow()
+        stacks = [create_stack(self.ctx, create_raw_template(self.ctx),
+                               create_user_creds(self.ctx),
+                               deleted_at=now - datetime.timedelta(
+                                   seconds=10))
+                  for i in range(4)]
+
+        sleep = self.patchobject(db_api, 'time').sleep
+        counts = db_api.purge_deleted(age=5, granularity='seconds',
+                                      batch_size=2, sleep_time=3)
+
+        self._deleted_stack_existance(utils.dummy_context(), stacks,
+                                      (), (0, 1, 2, 3))
+        self.assertEqual(4, counts['stack'])
+        self.assertEqual([mock.call(3)], sleep.call_args_list)
+
+    def test_purge_deleted_raw_template_blobs(self):
+        # drop the template from setUp(), which shares the same blobs
+        db_api.raw_template_delete(self.ctx, self.template.id)
+        now = timeutils.utcnow()
+        templates = [create_raw_template(self.ctx) for i in range(3)]
+        stacks = [create_stack(self.ctx, templates[i],
+                               create_user_creds(self.ctx),
+                               deleted_at=now - datetime.timedelta(
+                                   seconds=10 * (i + 1)))
+                  for i in range(3)]
+        blob_id = templates[0].template_blob_id
+
+        counts = db_api.purge_deleted(age=15, granularity='seconds')
+        self._deleted_stack_existance(utils.dummy_context(), stacks,
+                                      (0,), (1, 2))
+        self.assertEqual(2, counts['raw_template'])
+        self.assertEqual(0, counts['raw_template_blob'])
+        blob = db_api.get_session().query(models.RawTemplateBlob).get(blob_id)
+        self.assertEqual(1, blob.ref_count)
+
+        counts = db_api.purge_deleted(age=5, granularity='seconds')
+        self._deleted_stack_existance(utils.dummy_context(), stacks,
+                                      (), (0, 1, 2))
+        self.assertEqual(2, counts['raw_template_blob'])
+        self.assertEqual(0, db_api.get_session().query(
+            models.RawTemplateBlob).count())
+
+    def test_purge_deleted_batch_size_invalid(self):
+        self.assertRaises(exception.Error, db_api.purge_deleted,
+                          age=1, batch_size=-1)
+        self.assertRaises(exception.Error, db_api.purge_deleted,
+                          age=1, batch_size='foo')
+
     def _deleted_stack_existance(self, ctx, stacks, existing, deleted):
         for s in existing:
             self.assertIsNotNone(db_api.stack_get(ctx, stacks[s].id,
@@ -2064,6 +2295,37 @@ class DBAPIResourceTest(common.HeatTestCase):
         self.assertEqual('{"foo": "123"}', json.dumps(ret_res.rsrc_metadata))
         self.assertEqual(self.stack.id, ret_res.stack_id)
 
+    def test_resource_create_many(self):
+        values = [{
+            'name': 'res%d' % i,
+            'nova_instance': None,
+            'action': 'init',
+            'status': 'complete',
+            'status_reason': '',
+            'rsrc_metadata': None,
+            'stack_id': self.stack.id,
+            'stack_name': self.stack.name,
+            'properties_data': {'foo': i},
+            'needed_by': [i + 1],
+        } for i in range(5)]
+
+        ret = db_api.resource_create_many(self.ctx, values)
+        self.assertEqual(['res%d' % i for i in range(5)],
+                         [r.name for r in ret])
+        self.assertEqual(5, len(set(r.id for r in ret)))
+        self.assertEqual(5, len(set(r.uuid for r in ret)))
+        for i, res in enumerate(ret):
+            self.assertIsNotNone(res.created_at)
+            self.assertEqual([], res.data)
+            db_res = db_api.resource_get(self.ctx, res.id)
+            self.assertEqual('res%d' % i, db_res.name)
+            self.assertEqual({'foo': i}, db_res.properties_data)
+            self.assertEqual([i + 1], db_res.needed_by)
+            self.assertEqual(self.stack.id, db_res.stack_id)
+
+    def test_resource_create_many_empty(self):
+        self.assertEqual([], db_api.resource_create_many(self.ctx, []))
+
     def test_resource_get(self):
         res = create_resource(self.ctx, self.stack)
         ret_res = db_api.resource_get(self.ctx, res.id)
@@ -2303,6 +2565,93 @@ class DBAPIEventTest(common.HeatTestCase):
         self.assertEqual('create_complete', ret_event.resource_status_reason)
         self.assertEqual({'name': 'foo'}, ret_event.resource_properties)
 
+    def test_event_legacy_resource_properties(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        table = models.Event.__table__
+        db_api.get_engine().execute(table.insert(), {
+            'stack_id': stack.id,
+            'uuid': UUID3,
+            'resource_name': 'res',
+            'resource_properties': {'name': 'legacy'}})
+
+        events = db_api.event_get_all_by_stack(self.ctx, stack.id)
+        self.assertEqual(1, len(events))
+        self.assertIsNone(events[0].rsrc_prop_data)
+        self.assertEqual({'name': 'legacy'}, events[0].resource_properties)
+
+    def test_event_create_json_properties(self):
+        event = create_event(self.ctx)
+        ret_event = db_api.event_get(self.ctx, event.id)
+        self.assertEqual({'name': 'foo'}, ret_event.rsrc_prop_data)
+        self.assertIsNone(ret_event._resource_properties)
+
+    def test_event_get_all_by_stack_without_properties(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        create_event(self.ctx, stack_id=stack.id)
+
+        # use a new session, so that the event is not already loaded
+        events = db_api.event_get_all_by_stack(utils.dummy_context(),
+                                               stack.id,
+                                               include_rsrc_prop_data=False)
+
+        self.assertEqual(1, len(events))
+        self.assertEqual('res', events[0].resource_name)
+        self.assertNotIn('rsrc_prop_data', events[0].__dict__)
+        self.assertNotIn('_resource_properties', events[0].__dict__)
+
+    def test_event_create_many(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        values = [{'stack_id': stack.id,
+                   'resource_name': 'res%d' % i,
+                   'resource_status_reason': 'x' * 300,
+                   'resource_properties': {'num': i}}
+                  for i in range(3)]
+
+        events = db_api.event_create_many(self.ctx, values)
+
+        self.assertEqual(['res0', 'res1', 'res2'],
+                         [e.resource_name for e in events])
+        self.assertEqual(sorted(e.id for e in events),
+                         [e.id for e in events])
+        for i, ev in enumerate(events):
+            ret_event = db_api.event_get(self.ctx, ev.id)
+            self.assertEqual(ev.uuid, ret_event.uuid)
+            self.assertEqual({'num': i}, ret_event.resource_properties)
+            self.assertEqual('x' * 255, ret_event.resource_status_reason)
+            self.assertIsNotNone(ret_event.created_at)
+
+    def test_event_create_many_empty(self):
+        self.assertEqual([], db_api.event_create_many(self.ctx, []))
+
+    def test_event_create_prune_skipped(self):
+        cfg.CONF.set_override('max_events_per_stack', 1)
+        cfg.CONF.set_override('event_purge_batch_size', 10)
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        self.patchobject(random, 'uniform', return_value=0.5)
+        count = self.patchobject(db_api, 'event_count_all_by_stack')
+
+        for i in range(3):
+            create_event(self.ctx, stack_id=stack.id)
+
+        self.assertFalse(count.called)
+        self.assertEqual(3, len(db_api.event_get_all_by_stack(self.ctx,
+                                                              stack.id)))
+
+    def test_event_create_prune_excess(self):
+        cfg.CONF.set_override('max_events_per_stack', 2)
+        cfg.CONF.set_override('event_purge_batch_size', 10)
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        uniform = self.patchobject(random, 'uniform', return_value=0.5)
+        for i in range(5):
+            create_event(self.ctx, stack_id=stack.id,
+                         physical_resource_id=str(i))
+
+        uniform.return_value = 0.1
+        create_event(self.ctx, stack_id=stack.id, physical_resource_id='5')
+
+        events = db_api.event_get_all_by_stack(self.ctx, stack.id)
+        self.assertEqual(['5'], [e.physical_resource_id for e in events])
+
     def test_event_get_all(self):
         self.stack1 = create_stack(self.ctx, self.template, self.user_creds,
                                    tenant='tenant1')
@@ -2827,6 +3176,62 @@ class DBAPISyncPointTest(common.HeatTestCase):
         )
         self.assertEqual(0, rows_updated)
 
+    def test_sync_point_add_input(self):
+        sync_point = create_sync_point(
+            self.ctx, entity_id=str(self.resources[0].id),
+            stack_id=self.stack.id, traversal_id=self.stack.current_traversal
+        )
+
+        inputs = db_api.sync_point_add_input(
+            self.ctx, sync_point.entity_id, sync_point.traversal_id,
+            sync_point.is_update, 'sender1', {'input_data': {'a': 1}})
+        self.assertEqual([{}, {'input_data': {'a': 1}}], inputs)
+
+        inputs = db_api.sync_point_add_input(
+            self.ctx, sync_point.entity_id, sync_point.traversal_id,
+            sync_point.is_update, 'sender2', {'input_data': {'b': 2}})
+        self.assertEqual(3, len(inputs))
+        self.assertIn({'input_data': {'a': 1}}, inputs)
+        self.assertIn({'input_data': {'b': 2}}, inputs)
+
+        # a repeated input from the same sender replaces the previous one
+        inputs = db_api.sync_point_add_input(
+            self.ctx, sync_point.entity_id, sync_point.traversal_id,
+            sync_point.is_update, 'sender1', {'input_data': {'a': 3}})
+        self.assertEqual(3, len(inputs))
+        self.assertIn({'input_data': {'a': 3}}, inputs)
+        self.assertIn({'input_data': {'b': 2}}, inputs)
+
+        ret_sync_point = db_api.sync_point_get(self.ctx,
+                                               sync_point.entity_id,
+                                               sync_point.traversal_id,
+                                               sync_point.is_update)
+        self.assertEqual(3, ret_sync_point.atomic_key)
+        self.assertEqual({}, ret_sync_point.input_data)
+
+    def test_sync_point_add_input_not_found(self):
+        self.assertIsNone(db_api.sync_point_add_input(
+            self.ctx, str(self.resources[0].id),
+            self.stack.current_traversal, True, 'sender1',
+            {'input_data': {}}))
+
+    def test_sync_point_delete_with_inputs(self):
+        sync_point = create_sync_point(
+            self.ctx, entity_id=str(self.resources[0].id),
+            stack_id=self.stack.id, traversal_id=self.stack.current_traversal
+        )
+        db_api.sync_point_add_input(
+            self.ctx, sync_point.entity_id, sync_point.traversal_id,
+            sync_point.is_update, 'sender1', {'input_data': {}})
+
+        rows_deleted = db_api.sync_point_delete_all_by_stack_and_traversal(
+            self.ctx, self.stack.id,
+            self.stack.current_traversal
+        )
+        self.assertEqual(1, rows_deleted)
+        self.assertEqual(0, self.ctx.session.query(
+            models.SyncPointInput).count())
+
     def test_sync_point_delete(self):
         for res in self.resources:
             sync_point_rsrc = create_sync_point(
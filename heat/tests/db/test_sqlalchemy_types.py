@@ -44,7 +44,7 @@ class JsonTest(common.HeatTestCase):
         dialect = None
         value = {'foo': 'bar'}
         result = self.sqltype.process_bind_param(value, dialect)
-        self.assertEqual('{"foo": "bar"}', result)
+        self.assertEqual('{"foo":"bar"}', result)
 
     def test_process_bind_param_null(self):
         dialect = None
@@ -102,3 +102,34 @@ class ListTest(common.HeatTestCase):
         value = None
         result = self.sqltype.process_result_value(value, dialect)
         self.assertIsNone(result)
+
+
+class CompressedJsonTest(common.HeatTestCase):
+
+    def setUp(self):
+        super(CompressedJsonTest, self).setUp()
+        self.sqltype = db_types.CompressedJson()
+
+    def test_process_bind_param_small(self):
+        value = {'foo': 'bar'}
+        result = self.sqltype.process_bind_param(value, None)
+        self.assertEqual(b'j{"foo":"bar"}', result)
+
+    def test_process_bind_param_compressed(self):
+        value = {'foo': 'bar' * 1000}
+        result = self.sqltype.process_bind_param(value, None)
+        self.assertEqual(b'z', result[:1])
+        self.assertTrue(len(result) < 3000)
+
+    def test_process_bind_param_null(self):
+        self.assertIsNone(self.sqltype.process_bind_param(None, None))
+
+    def test_round_trip(self):
+        for value in ({'foo': 'bar'}, {'foo': 'bar' * 1000}, {},
+                      {'foo': [1, 2, {'bar': None}], u'b\xe4z': u'qu\xfcx'}):
+            stored = self.sqltype.process_bind_param(value, None)
+            self.assertEqual(value,
+                             self.sqltype.process_result_value(stored, None))
+
+    def test_process_result_value_null(self):
+        self.assertIsNone(self.sqltype.process_result_value(None, None))
@@ -202,6 +202,33 @@ class StackEventTest(common.HeatTestCase):
 
             self.assertIn('event_time', ev)
 
+    @tools.stack_context('service_event_list_no_stack_load')
+    def test_event_list_does_not_load_stacks(self):
+        self.patchobject(parser.Stack, 'load',
+                         side_effect=AssertionError('Stack loaded'))
+        events = self.eng.list_events(self.ctx, None)
+
+        self.assertEqual(4, len(events))
+        for ev in events:
+            self.assertEqual(dict(self.stack.identifier()),
+                             ev['stack_identity'])
+            self.assertEqual(self.stack.name, ev['stack_name'])
+
+    @tools.stack_context('service_event_list_no_props_test_stack')
+    @mock.patch.object(service.EngineService, '_get_stack')
+    def test_event_list_without_properties(self, mock_get):
+        mock_get.return_value = stack_object.Stack.get_by_id(self.ctx,
+                                                             self.stack.id)
+        events = self.eng.list_events(self.ctx, self.stack.identifier(),
+                                      include_rsrc_prop_data=False)
+
+        self.assertEqual(4, len(events))
+        for ev in events:
+            self.assertEqual({}, ev['resource_properties'])
+            self.assertIn(ev['resource_name'],
+                          ('service_event_list_no_props_test_stack',
+                           'WebServer'))
+
     @mock.patch.object(event_object.Event, 'get_all_by_stack')
     @mock.patch.object(service.EngineService, '_get_stack')
     def test_event_list_with_marker_and_filters(self, mock_get, mock_get_all):
@@ -218,7 +245,8 @@ class StackEventTest(common.HeatTestCase):
         mock_get_all.assert_called_once_with(self.ctx, 1, limit=limit,
                                              sort_keys=sort_keys,
                                              marker=marker, sort_dir=sort_dir,
-                                             filters=filters)
+                                             filters=filters,
+                                             include_rsrc_prop_data=True)
 
     @mock.patch.object(event_object.Event, 'get_all_by_tenant')
     def test_tenant_events_list_with_marker_and_filters(self, mock_get_all):
@@ -235,4 +263,5 @@ class StackEventTest(common.HeatTestCase):
                                              sort_keys=sort_keys,
                                              marker=marker,
                                              sort_dir=sort_dir,
-                                             filters=filters)
+                                             filters=filters,
+                                             include_rsrc_prop_data=True)
@@ -85,6 +85,7 @@ class ServiceStackUpdateTest(common.HeatTestCase):
             current_traversal=old_stack.current_traversal,
             prev_raw_template_id=None,
             current_deps=None,
+            current_deps_delta=None,
             disable_rollback=True,
             nested_depth=0,
             owner_id=None,
@@ -349,6 +350,7 @@ class ServiceStackUpdateTest(common.HeatTestCase):
             convergence=False,
             current_traversal=old_stack.current_traversal,
             prev_raw_template_id=None, current_deps=None,
+            current_deps_delta=None,
             disable_rollback=False, nested_depth=0,
             owner_id=None, parent_resource=None,
             stack_user_project_id='1234',
@@ -462,6 +464,7 @@ class ServiceStackUpdateTest(common.HeatTestCase):
             convergence=False,
             current_traversal=old_stack.current_traversal,
             prev_raw_template_id=None, current_deps=None,
+            current_deps_delta=None,
             disable_rollback=True, nested_depth=0,
             owner_id=None, parent_resource=None,
             stack_user_project_id='1234', strict_validate=True,
@@ -578,6 +581,7 @@ class ServiceStackUpdateTest(common.HeatTestCase):
             convergence=False,
             current_traversal=old_stack.current_traversal,
             prev_raw_template_id=None, current_deps=None,
+            current_deps_delta=None,
             disable_rollback=True, nested_depth=0,
             owner_id=None, parent_resource=None,
             stack_user_project_id='1234', strict_validate=True,
@@ -640,6 +644,7 @@ class ServiceStackUpdateTest(common.HeatTestCase):
             self.ctx, stk.name, stk.t,
             convergence=False, current_traversal=stk.current_traversal,
             prev_raw_template_id=None, current_deps=None,
+            current_deps_delta=None,
             disable_rollback=True, nested_depth=0,
             owner_id=None, parent_resource=None,
             stack_user_project_id='1234',
@@ -899,6 +904,7 @@ resources:
             self.ctx, stk.name, stk.t, convergence=False,
             current_traversal=old_stack.current_traversal,
             prev_raw_template_id=None, current_deps=None,
+            current_deps_delta=None,
             disable_rollback=True, nested_depth=0, owner_id=None,
             parent_resource=None, stack_user_project_id='1234',
             strict_validate=True, tenant_id='test_tenant_id', timeout_mins=60,
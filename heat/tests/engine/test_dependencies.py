@@ -244,3 +244,27 @@ class dependenciesTest(common.HeatTestCase):
         leaves = sorted(list(d.roots()))
 
         self.assertEqual(['last1', 'last2'], leaves)
+
+    def test_long_chain_fwd(self):
+        self._dep_test_fwd(*[(str(i + 1), str(i)) for i in range(2000)])
+
+    def test_long_chain_rev(self):
+        self._dep_test_rev(*[(str(i + 1), str(i)) for i in range(2000)])
+
+    def test_wide_fan_fwd(self):
+        self._dep_test_fwd(*[('last', str(i)) for i in range(2000)])
+
+    def test_toposort_scan_order(self):
+        graph = dependencies.Graph()
+        for key in ('a', 'b', 'c', 'd'):
+            graph[key]
+        graph['a'].requires('c')
+        graph['c'].required_by('a')
+        graph['b'].requires('d')
+        graph['d'].required_by('b')
+
+        # The first node without requirements, in graph order, always
+        # comes next
+        self.assertEqual(['c', 'a', 'd', 'b'],
+                         list(dependencies.Graph.toposort(graph)))
+        self.assertEqual(0, len(graph))
@@ -13,8 +13,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+
 import mock
 from oslo_config import cfg
+from oslo_utils import timeutils
 
 from heat.common import exception
 from heat.engine import dependencies
@@ -23,6 +26,7 @@ from heat.engine import scheduler
 from heat.engine import stack
 from heat.engine import sync_point
 from heat.engine import worker
+from heat.objects import service as service_objects
 from heat.rpc import worker_client
 from heat.tests import common
 from heat.tests.engine import tools
@@ -35,7 +39,7 @@ class WorkerServiceTest(common.HeatTestCase):
 
     def test_make_sure_rpc_version(self):
         self.assertEqual(
-            '1.2',
+            '1.3',
             worker.WorkerService.RPC_API_VERSION,
             ('RPC version is changed, please update this test to new version '
              'and make sure additional test cases are added for RPC APIs '
@@ -95,6 +99,111 @@ class WorkerServiceTest(common.HeatTestCase):
             mock_rpc_server.stop.assert_called_once_with()
             mock_rpc_server.wait.assert_called_once_with()
 
+    def test_check_resources(self):
+        thread_group_mgr = mock.Mock()
+        self.worker = worker.WorkerService('host-1',
+                                           'topic-1',
+                                           'engine_id',
+                                           thread_group_mgr)
+        ctx = utils.dummy_context()
+        self.worker.check_resources(ctx, 'stack-id',
+                                    [(1, {}, True), (2, None, False)],
+                                    'traversal', None)
+        thread_group_mgr.start.assert_has_calls([
+            mock.call('stack-id', self.worker.check_resource, ctx, 1,
+                      'traversal', {}, True, None),
+            mock.call('stack-id', self.worker.check_resource, ctx, 2,
+                      'traversal', None, False, None)])
+
+    def _engine(self, host, age, binary='heat-engine'):
+        reported = timeutils.utcnow() - datetime.timedelta(seconds=age)
+        return mock.Mock(host=host, binary=binary, report_interval=60,
+                         created_at=reported, updated_at=reported)
+
+    @mock.patch.object(service_objects.Service, 'get_all')
+    def test_engine_host(self, mock_get_all):
+        self.worker = worker.WorkerService('host-1',
+                                           'topic-1',
+                                           'engine_id',
+                                           mock.Mock())
+        mock_get_all.return_value = [self._engine('host-1', 10),
+                                     self._engine('host-2', 20),
+                                     self._engine('host-3', 70),
+                                     self._engine('host-4', 10, 'heat-api')]
+        ctx = utils.dummy_context()
+
+        hosts = set(self.worker._engine_host(ctx, 'stack-%d' % i)
+                    for i in range(100))
+        self.assertEqual(set(['host-1', 'host-2']), hosts)
+        # the engines are only looked up once while their reports are fresh
+        mock_get_all.assert_called_once_with(ctx)
+        # the same stack is always routed to the same engine
+        self.assertEqual(self.worker._engine_host(ctx, 'stack-0'),
+                         self.worker._engine_host(ctx, 'stack-0'))
+
+    @mock.patch.object(service_objects.Service, 'get_all')
+    def test_engine_host_stale_report(self, mock_get_all):
+        self.worker = worker.WorkerService('host-1',
+                                           'topic-1',
+                                           'engine_id',
+                                           mock.Mock())
+        mock_get_all.return_value = [self._engine('host-1', 10),
+                                     self._engine('host-2', 10)]
+        ctx = utils.dummy_context()
+        stacks = ['stack-%d' % i for i in range(100)]
+        routes = dict((s, self.worker._engine_host(ctx, s)) for s in stacks)
+        self.assertEqual(set(['host-1', 'host-2']), set(routes.values()))
+
+        # host-2 stops reporting, so its report goes stale
+        self.worker._engine_report_expiry['host-2'] -= datetime.timedelta(
+            seconds=60)
+        mock_get_all.return_value = [self._engine('host-1', 10),
+                                     self._engine('host-2', 70)]
+        for s in stacks:
+            self.assertEqual('host-1', self.worker._engine_host(ctx, s))
+        self.assertEqual(2, mock_get_all.call_count)
+
+    @mock.patch.object(service_objects.Service, 'get_all')
+    def test_engine_host_none_alive(self, mock_get_all):
+        self.worker = worker.WorkerService('host-1',
+                                           'topic-1',
+                                           'engine_id',
+                                           mock.Mock())
+        mock_get_all.return_value = [self._engine('host-1', 70)]
+        ctx = utils.dummy_context()
+
+        self.assertIsNone(self.worker._engine_host(ctx, 'stack-0'))
+        self.assertIsNone(self.worker._engine_host(ctx, 'stack-1'))
+        # the engines are not looked up again until periodic_interval passes
+        mock_get_all.assert_called_once_with(ctx)
+
+    @mock.patch.object(worker.WorkerService, '_engine_host',
+                       return_value='host-2')
+    def test_check_resources_batched(self, mock_engine_host):
+        self.worker = worker.WorkerService('host-1',
+                                           'topic-1',
+                                           'engine_id',
+                                           mock.Mock())
+        self.worker._rpc_client = mock.Mock()
+        ctx = utils.dummy_context()
+        stk = mock.Mock(id='stack-id', adopt_stack_data=None)
+
+        self.worker._check_resources(ctx, stk, 'traversal', [])
+        self.assertFalse(self.worker._rpc_client.check_resource.called)
+        self.assertFalse(self.worker._rpc_client.check_resources.called)
+
+        self.worker._check_resources(ctx, stk, 'traversal',
+                                     [(1, {}, True)])
+        self.worker._rpc_client.check_resource.assert_called_once_with(
+            ctx, 1, 'traversal', {}, True, None)
+        self.assertFalse(self.worker._rpc_client.check_resources.called)
+
+        ready = [(1, {}, True), (2, {}, True)]
+        self.worker._check_resources(ctx, stk, 'traversal', ready)
+        self.worker._rpc_client.check_resources.assert_called_once_with(
+            ctx, 'stack-id', ready, 'traversal', None, server='host-2')
+        mock_engine_host.assert_called_once_with(ctx, 'stack-id')
+
 
 @mock.patch.object(worker, 'construct_input_data')
 @mock.patch.object(worker, 'check_stack_complete')
@@ -143,6 +252,14 @@ class CheckWorkflowUpdateTest(common.HeatTestCase):
         for mocked in [mock_cru, mock_crc, mock_pcr, mock_csc, mock_cid]:
             self.assertFalse(mocked.called)
 
+    def test_stale_traversal_templates_discarded(
+            self, mock_cru, mock_crc, mock_pcr, mock_csc, mock_cid):
+        cache = self.worker._traversal_cache
+        cache.templates('stale-traversal')[self.stack.t.id] = self.stack.t
+        self.worker.check_resource(self.ctx, self.resource.id,
+                                   'stale-traversal', {}, True, None)
+        self.assertEqual({}, cache.templates('stale-traversal'))
+
     def test_is_update_traversal(
             self, mock_cru, mock_crc, mock_pcr, mock_csc, mock_cid):
         self.worker.check_resource(
@@ -587,6 +704,44 @@ class CheckWorkflowCleanupTest(common.HeatTestCase):
         self.assertFalse(mock_csc.called)
 
 
+class TraversalCacheTest(common.HeatTestCase):
+    def test_templates(self):
+        cache = worker.TraversalCache(2)
+        templates = cache.templates('traversal-1')
+        templates[1] = 'tmpl'
+        self.assertIs(templates, cache.templates('traversal-1'))
+        self.assertEqual({1: 'tmpl'}, cache.templates('traversal-1'))
+        self.assertEqual({}, cache.templates('traversal-2'))
+
+    def test_least_recently_used_evicted(self):
+        cache = worker.TraversalCache(2)
+        cache.templates('traversal-1')[1] = 'tmpl1'
+        cache.templates('traversal-2')[2] = 'tmpl2'
+        cache.templates('traversal-1')
+        cache.templates('traversal-3')[3] = 'tmpl3'
+
+        self.assertEqual({1: 'tmpl1'}, cache.templates('traversal-1'))
+        self.assertEqual({}, cache.templates('traversal-2'))
+
+    def test_dep_attrs_indexes(self):
+        cache = worker.TraversalCache(2)
+        indexes = cache.dep_attrs_indexes('traversal-1')
+        indexes[1] = {'res': set(['attr'])}
+        self.assertIs(indexes, cache.dep_attrs_indexes('traversal-1'))
+        self.assertEqual({}, cache.dep_attrs_indexes('traversal-2'))
+        cache.templates('traversal-3')
+        self.assertEqual({}, cache.dep_attrs_indexes('traversal-1'))
+
+    def test_invalidate(self):
+        cache = worker.TraversalCache(2)
+        cache.templates('traversal-1')[1] = 'tmpl'
+        cache.dep_attrs_indexes('traversal-1')[1] = {}
+        cache.invalidate('traversal-1')
+        cache.invalidate('traversal-2')
+        self.assertEqual({}, cache.templates('traversal-1'))
+        self.assertEqual({}, cache.dep_attrs_indexes('traversal-1'))
+
+
 class MiscMethodsTest(common.HeatTestCase):
     def setUp(self):
         super(MiscMethodsTest, self).setUp()
@@ -665,6 +820,20 @@ class MiscMethodsTest(common.HeatTestCase):
             ('A', True), {}, True, None)
         self.assertTrue(mock_sync.called)
 
+    @mock.patch.object(sync_point, 'sync')
+    def test_propagate_check_resource_ready(self, mock_sync):
+        mock_sync.side_effect = (
+            lambda cnxt, entity_id, trav, is_update, propagate, pred, data:
+            propagate(entity_id, {'input_data': {}}))
+        rpc_client = mock.Mock()
+        ready = []
+        worker.propagate_check_resource(
+            self.ctx, rpc_client, 'B',
+            self.stack.current_traversal, mock.ANY,
+            ('A', True), {}, True, None, ready)
+        self.assertEqual([('B', {'input_data': {}}, True)], ready)
+        self.assertFalse(rpc_client.check_resource.called)
+
     @mock.patch.object(resource.Resource, 'create_convergence')
     @mock.patch.object(resource.Resource, 'update_convergence')
     def test_check_resource_update_init_action(self, mock_update, mock_create):
@@ -220,6 +220,52 @@ class DependencyTaskGroupTest(common.HeatTestCase):
             dummy.do_step(2, 'last').AndReturn(None)
             dummy.do_step(3, 'last').AndReturn(None)
 
+    def test_chain_rev(self):
+        self.reverse_order = True
+        with self._dep_test(('third', 'second'),
+                            ('second', 'first')) as dummy:
+            dummy.do_step(1, 'third').AndReturn(None)
+            dummy.do_step(2, 'third').AndReturn(None)
+            dummy.do_step(3, 'third').AndReturn(None)
+            dummy.do_step(1, 'second').AndReturn(None)
+            dummy.do_step(2, 'second').AndReturn(None)
+            dummy.do_step(3, 'second').AndReturn(None)
+            dummy.do_step(1, 'first').AndReturn(None)
+            dummy.do_step(2, 'first').AndReturn(None)
+            dummy.do_step(3, 'first').AndReturn(None)
+
+    def _count_steps(self, deps, reverse=False):
+        tg = scheduler.DependencyTaskGroup(deps, lambda o: None,
+                                           reverse=reverse)
+        runner = scheduler.TaskRunner(tg)
+        runner.start()
+        steps = 0
+        while not runner.step():
+            steps += 1
+        return steps
+
+    def test_immediate_chain_fwd(self):
+        deps = dependencies.Dependencies([(str(i + 1), str(i))
+                                          for i in range(100)])
+        # Subtasks that complete on starting unblock those later in the
+        # dependency order within the same pass
+        self.assertEqual(0, self._count_steps(deps))
+
+    def test_immediate_chain_rev(self):
+        deps = dependencies.Dependencies([(str(i + 1), str(i))
+                                          for i in range(5)])
+        # In reverse, newly-ready subtasks precede the one that completed in
+        # the dependency order, so each waits for the next pass
+        self.assertEqual(5, self._count_steps(deps, reverse=True))
+
+    def test_large_fan_in(self):
+        self.steps = 1
+        edges = [('last', str(i)) for i in range(200)]
+        with self._dep_test(*edges) as dummy:
+            for i in range(200):
+                dummy.do_step(1, str(i)).InAnyOrder('1')
+            dummy.do_step(1, 'last').AndReturn(None)
+
     def test_circular_deps(self):
         d = dependencies.Dependencies([('first', 'second'),
                                        ('second', 'third'),
@@ -313,6 +359,113 @@ class DependencyTaskGroupTest(common.HeatTestCase):
         exc = self.assertRaises(type(e1), run_tasks_with_exceptions)
         self.assertEqual(e1, exc)
 
+    def test_step_func(self):
+        log = []
+
+        def task(key):
+            for i in range(2):
+                log.append(key)
+                yield
+
+        deps = dependencies.Dependencies([('B', 'A')])
+        tg = scheduler.DependencyTaskGroup(
+            deps, task, step_func=lambda: log.append('flush'))
+        scheduler.TaskRunner(tg)(wait_time=None)
+        self.assertEqual(['A', 'flush', 'A', 'flush',
+                          'B', 'flush', 'B', 'flush'], log)
+
+
+class ConcurrencyLimitTest(common.HeatTestCase):
+
+    def setUp(self):
+        super(ConcurrencyLimitTest, self).setUp()
+        self.running = set()
+        self.max_running = 0
+
+    def task(self, key):
+        self.running.add(key)
+        self.max_running = max(self.max_running, len(self.running))
+        try:
+            for i in range(3):
+                yield
+        finally:
+            self.running.discard(key)
+
+    def _run(self, deps, limits, **kwargs):
+        tg = scheduler.DependencyTaskGroup(deps, self.task, limits=limits,
+                                           **kwargs)
+        scheduler.TaskRunner(tg)(wait_time=None)
+
+    def test_unlimited(self):
+        limit = scheduler.ConcurrencyLimit(0)
+        deps = dependencies.Dependencies([(k, None) for k in 'ABCDE'])
+        self._run(deps, lambda k: [limit])
+        self.assertEqual(5, self.max_running)
+        self.assertEqual(0, limit.running)
+
+    def test_limited(self):
+        limit = scheduler.ConcurrencyLimit(2)
+        deps = dependencies.Dependencies([(k, None) for k in 'ABCDE'])
+        self._run(deps, lambda k: [limit])
+        self.assertEqual(2, self.max_running)
+        self.assertEqual(set(), self.running)
+        self.assertEqual(0, limit.running)
+
+    def test_limited_subset(self):
+        limit = scheduler.ConcurrencyLimit(1)
+        deps = dependencies.Dependencies([(k, None) for k in 'ABCDE'])
+        self._run(deps, lambda k: [limit] if k in 'ABC' else [])
+        self.assertEqual(3, self.max_running)
+        self.assertEqual(0, limit.running)
+
+    def test_limited_dependencies(self):
+        limit = scheduler.ConcurrencyLimit(1)
+        deps = dependencies.Dependencies([('C', 'A'), ('C', 'B'),
+                                          ('D', 'C'), ('E', 'C')])
+        order = []
+
+        def task(key):
+            order.append(key)
+            return self.task(key)
+
+        tg = scheduler.DependencyTaskGroup(deps, task,
+                                           limits=lambda k: [limit])
+        scheduler.TaskRunner(tg)(wait_time=None)
+        self.assertEqual(1, self.max_running)
+        self.assertEqual(set(['A', 'B']), set(order[:2]))
+        self.assertEqual('C', order[2])
+        self.assertEqual(0, limit.running)
+
+    def test_limit_shared(self):
+        limit = scheduler.ConcurrencyLimit(3)
+        tg1 = scheduler.DependencyTaskGroup(
+            dependencies.Dependencies([(k, None) for k in 'ABCD']),
+            self.task, limits=lambda k: [limit])
+        tg2 = scheduler.DependencyTaskGroup(
+            dependencies.Dependencies([(k, None) for k in 'EFGH']),
+            self.task, limits=lambda k: [limit])
+        runners = [scheduler.TaskRunner(tg1), scheduler.TaskRunner(tg2)]
+        for r in runners:
+            r.start()
+        while not all([r.step() for r in runners]):
+            self.assertLessEqual(limit.running, 3)
+        self.assertEqual(3, self.max_running)
+        self.assertEqual(0, limit.running)
+
+    def test_limit_released_on_error(self):
+        limit = scheduler.ConcurrencyLimit(1)
+
+        def task(key):
+            yield
+            raise Exception('failed')
+
+        deps = dependencies.Dependencies([(k, None) for k in 'AB'])
+        tg = scheduler.DependencyTaskGroup(deps, task,
+                                           limits=lambda k: [limit])
+        runner = scheduler.TaskRunner(tg)
+        self.assertRaises(Exception, runner, wait_time=None)
+        self.assertEqual(0, limit.running)
+
 
 class TaskTest(common.HeatTestCase):
 
@@ -387,6 +540,25 @@ class TaskTest(common.HeatTestCase):
         runner.start()
         runner.run_to_completion(wait_time=24)
 
+    def test_run_wait_time_policy(self):
+        task = DummyTask(4)
+        self.m.StubOutWithMock(task, 'do_step')
+        self.m.StubOutWithMock(scheduler.TaskRunner, '_sleep')
+
+        task.do_step(1).AndReturn(None)
+        scheduler.TaskRunner._sleep(0).AndReturn(None)
+        task.do_step(2).AndReturn(None)
+        scheduler.TaskRunner._sleep(1.0).AndReturn(None)
+        task.do_step(3).AndReturn(None)
+        scheduler.TaskRunner._sleep(2.0).AndReturn(None)
+        task.do_step(4).AndReturn(None)
+        scheduler.TaskRunner._sleep(3).AndReturn(None)
+
+        self.m.ReplayAll()
+
+        policy = scheduler.ExponentialBackoff(max_interval=3, jitter_max=0)
+        scheduler.TaskRunner(task)(wait_time=policy)
+
     def test_sleep(self):
         sleep_time = 42
         self.m.StubOutWithMock(eventlet, 'sleep')
@@ -781,6 +953,62 @@ class TimeoutTest(common.HeatTestCase):
         self.assertNotEqual(earlier, later)
 
 
+class PollIntervalTest(common.HeatTestCase):
+    def _intervals(self, policy, count=6):
+        intervals = policy.intervals()
+        return [next(intervals) for i in range(count)]
+
+    def test_fixed(self):
+        self.assertEqual([5] * 6,
+                         self._intervals(scheduler.PollInterval(5)))
+
+    def test_backoff(self):
+        policy = scheduler.ExponentialBackoff(interval=0.5, max_interval=5,
+                                              jitter_max=0)
+        self.assertEqual([0.5, 1.0, 2.0, 4.0, 5, 5],
+                         self._intervals(policy))
+
+    def test_backoff_jitter(self):
+        policy = scheduler.ExponentialBackoff(max_interval=4, jitter_max=1.0)
+        for base, actual in zip([1, 2, 4, 4, 4, 4], self._intervals(policy)):
+            self.assertTrue(base <= actual < base + 1.0)
+
+
+class PollTimerTest(common.HeatTestCase):
+    def setUp(self):
+        super(PollTimerTest, self).setUp()
+        scheduler.ENABLE_SLEEP = True
+
+    def test_no_policy(self):
+        timer = scheduler.PollTimer()
+        self.assertTrue(timer.due())
+        timer.reset()
+        self.assertTrue(timer.due())
+
+    def test_policy(self):
+        st = timeutils.wallclock()
+        self.patchobject(timeutils, 'wallclock',
+                         side_effect=[st, st + 0.5, st + 1.5, st + 1.5,
+                                      st + 3.0, st + 3.6])
+        timer = scheduler.PollTimer(
+            scheduler.ExponentialBackoff(jitter_max=0))
+        self.assertTrue(timer.due())
+
+        timer.reset()
+        self.assertFalse(timer.due())
+        self.assertTrue(timer.due())
+
+        timer.reset()
+        self.assertFalse(timer.due())
+        self.assertTrue(timer.due())
+
+    def test_sleep_disabled(self):
+        scheduler.ENABLE_SLEEP = False
+        timer = scheduler.PollTimer(scheduler.PollInterval(60))
+        timer.reset()
+        self.assertTrue(timer.due())
+
+
 class DescriptionTest(common.HeatTestCase):
 
     def setUp(self):
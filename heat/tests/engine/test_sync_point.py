@@ -37,9 +37,7 @@ class SyncPointTestCase(common.HeatTestCase):
                         {sender: None})
         updated_sync_point = sync_point.get(ctx, resource.id,
                                             stack.current_traversal, True)
-        input_data = sync_point.deserialize_input_data(
-            updated_sync_point.input_data)
-        self.assertEqual({sender: None}, input_data)
+        self.assertEqual(1, updated_sync_point.atomic_key)
         self.assertFalse(mock_callback.called)
 
     def test_sync_non_waiting(self):
@@ -56,13 +54,94 @@ class SyncPointTestCase(common.HeatTestCase):
         sync_point.sync(ctx, resource.id, stack.current_traversal, True,
                         mock_callback, set(graph[(resource.id, True)]),
                         {sender: None})
+        mock_callback.assert_called_once_with(
+            resource.id, sync_point.serialize_input_data({sender: None}))
+
+    def test_sync_all_senders(self):
+        ctx = utils.dummy_context()
+        stack = tools.get_stack('test_stack', utils.dummy_context(),
+                                template=tools.string_template_five,
+                                convergence=True)
+        stack.converge_stack(stack.t, action=stack.CREATE)
+        resource = stack['C']
+        predecessors = set(stack.convergence_dependencies.graph()[
+            (resource.id, True)])
+        self.assertEqual(2, len(predecessors))
+
+        mock_callback = mock.Mock()
+        expected = {}
+        for i, sender in enumerate(predecessors):
+            self.assertFalse(mock_callback.called)
+            data = {u'attr%d' % i: {(u'nested', i): u'value'}}
+            expected[sender] = data
+            sync_point.sync(ctx, resource.id, stack.current_traversal, True,
+                            mock_callback, predecessors, {sender: data})
+        mock_callback.assert_called_once_with(
+            resource.id, sync_point.serialize_input_data(expected))
+
+    def test_sync_resend(self):
+        ctx = utils.dummy_context()
+        stack = tools.get_stack('test_stack', utils.dummy_context(),
+                                template=tools.string_template_five,
+                                convergence=True)
+        stack.converge_stack(stack.t, action=stack.CREATE)
+        resource = stack['A']
+
+        sender = (3, True)
+        mock_callback = mock.Mock()
+        for data in ({u'a': 1}, {u'a': 2}):
+            sync_point.sync(ctx, resource.id, stack.current_traversal, True,
+                            mock_callback, set([sender]), {sender: data})
+        mock_callback.assert_called_with(
+            resource.id, sync_point.serialize_input_data({sender: {u'a': 2}}))
         updated_sync_point = sync_point.get(ctx, resource.id,
                                             stack.current_traversal, True)
-        input_data = sync_point.deserialize_input_data(
-            updated_sync_point.input_data)
-        self.assertEqual({sender: None}, input_data)
-        self.assertTrue(mock_callback.called)
+        self.assertEqual(2, updated_sync_point.atomic_key)
+
+    def test_sync_legacy_input_data(self):
+        ctx = utils.dummy_context()
+        stack = tools.get_stack('test_stack', utils.dummy_context(),
+                                template=tools.string_template_five,
+                                convergence=True)
+        stack.converge_stack(stack.t, action=stack.CREATE)
+        resource = stack['C']
+        predecessors = set(stack.convergence_dependencies.graph()[
+            (resource.id, True)])
+        first, second = sorted(predecessors)
+
+        # input stored on the sync point itself by an older engine
+        sync_point.update_input_data(
+            ctx, resource.id, stack.current_traversal, True, 0,
+            sync_point.serialize_input_data({first: None}))
+
+        mock_callback = mock.Mock()
+        sync_point.sync(ctx, resource.id, stack.current_traversal, True,
+                        mock_callback, predecessors, {second: None})
+        mock_callback.assert_called_once_with(
+            resource.id,
+            sync_point.serialize_input_data({first: None, second: None}))
+
+    def test_sync_not_found(self):
+        ctx = utils.dummy_context()
+        self.assertRaises(sync_point.SyncPointNotFound, sync_point.sync,
+                          ctx, 42, 'not-a-traversal', True, mock.Mock(),
+                          set([(3, True)]), {(3, True): None})
 
     def test_serialize_input_data(self):
         res = sync_point.serialize_input_data({(3, 8): None})
-        self.assertEqual({'input_data': {u'tuple:(3, 8)': None}}, res)
+        self.assertEqual({'input_data': {u'tuple:[3,8]': None}}, res)
+
+    def test_serialize_input_data_nested(self):
+        input_data = {(3, True): {'attrs': {(u'a', u'b'): 1, u'c': 2}}}
+        res = sync_point.serialize_input_data(input_data)
+        self.assertEqual(
+            {'input_data': {u'tuple:[3,true]': {
+                'attrs': {u'tuple:["a","b"]': 1, u'c': 2}}}},
+            res)
+        self.assertEqual(input_data, sync_point.deserialize_input_data(res))
+
+    def test_deserialize_input_data_old_format(self):
+        db_input_data = {'input_data': {
+            u'tuple:(3, True)': {'attrs': {u"tuple:(u'a', u'b')": 1}}}}
+        self.assertEqual({(3, True): {'attrs': {(u'a', u'b'): 1}}},
+                         sync_point.deserialize_input_data(db_input_data))
@@ -0,0 +1,51 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from heat.common import hash_ring
+from heat.tests import common
+
+
+class HashRingTest(common.HeatTestCase):
+
+    keys = ['stack-%d' % i for i in range(200)]
+
+    def test_no_hosts(self):
+        ring = hash_ring.HashRing([])
+        self.assertIsNone(ring.get_host('stack'))
+
+    def test_single_host(self):
+        ring = hash_ring.HashRing(['host1'])
+        self.assertEqual(set(['host1']),
+                         set(ring.get_host(k) for k in self.keys))
+
+    def test_consistent(self):
+        ring1 = hash_ring.HashRing(['host1', 'host2', 'host3'])
+        ring2 = hash_ring.HashRing(['host3', 'host2', 'host1'])
+        for k in self.keys:
+            self.assertEqual(ring1.get_host(k), ring2.get_host(k))
+
+    def test_distributed(self):
+        ring = hash_ring.HashRing(['host1', 'host2', 'host3'])
+        self.assertEqual(set(['host1', 'host2', 'host3']),
+                         set(ring.get_host(k) for k in self.keys))
+
+    def test_remove_host(self):
+        ring1 = hash_ring.HashRing(['host1', 'host2', 'host3'])
+        ring2 = hash_ring.HashRing(['host1', 'host2'])
+        for k in self.keys:
+            host = ring1.get_host(k)
+            if host != 'host3':
+                # only the keys of the removed host are moved
+                self.assertEqual(host, ring2.get_host(k))
+            else:
+                self.assertIn(ring2.get_host(k), ('host1', 'host2'))
@@ -29,6 +29,11 @@ from heat.tests.engine import tools
 from heat.tests import utils
 
 
+def stored_edges(stack_db):
+    return [[list(rqr), list(rqd)] for rqr, rqd in
+            parser.deserialize_convergence_deps(stack_db.current_deps)]
+
+
 @mock.patch.object(worker_client.WorkerClient, 'check_resource')
 class StackConvergenceCreateUpdateDeleteTest(common.HeatTestCase):
     def setUp(self):
@@ -63,7 +68,11 @@ class StackConvergenceCreateUpdateDeleteTest(common.HeatTestCase):
         self.assertIsNone(stack_db.prev_raw_template_id)
 
         self.assertTrue(stack_db.convergence)
-        self.assertEqual({'edges': [[[1, True], None]]}, stack_db.current_deps)
+        self.assertEqual({'version': 2, 'graph': [3, 0]},
+                         stack_db.current_deps)
+        self.assertEqual([((1, True), None)],
+                         parser.deserialize_convergence_deps(
+                             stack_db.current_deps))
         leaves = stack.convergence_dependencies.leaves()
         expected_calls = []
         for rsrc_id, is_update in leaves:
@@ -97,7 +106,7 @@ class StackConvergenceCreateUpdateDeleteTest(common.HeatTestCase):
                                  [[3, True], [4, True]],    # C, B
                                  [[1, True], [3, True]],    # E, C
                                  [[2, True], [3, True]]]),  # D, C
-                         sorted(stack_db.current_deps['edges']))
+                         sorted(stored_edges(stack_db)))
 
         # check if needed_by is stored properly
         expected_needed_by = {'A': [3], 'B': [3],
@@ -206,7 +215,7 @@ class StackConvergenceCreateUpdateDeleteTest(common.HeatTestCase):
                                  [[5, False], [5, True]],
                                  [[4, False], [3, False]],
                                  [[4, False], [4, True]]]),
-                         sorted(stack_db.current_deps['edges']))
+                         sorted(stored_edges(stack_db)))
         '''
         To visualize:
 
@@ -317,7 +326,7 @@ class StackConvergenceCreateUpdateDeleteTest(common.HeatTestCase):
                                  [[3, False], [1, False]],
                                  [[5, False], [3, False]],
                                  [[4, False], [3, False]]]),
-                         sorted(stack_db.current_deps['edges']))
+                         sorted(stored_edges(stack_db)))
 
         expected_needed_by = {'A': [3], 'B': [3],
                               'C': [1, 2],
@@ -791,3 +800,122 @@ class TestConvgComputeDependencies(common.HeatTestCase):
                          '((4, False), (3, False)), '
                          '((5, False), (3, False))])',
                          repr(self.stack._convg_deps))
+
+
+class ConvergenceDepsSerializationTest(common.HeatTestCase):
+
+    edges = [((3, True), (5, True)), ((3, True), (4, True)),
+             ((1, True), (3, True)), ((2, True), (3, True)),
+             ((5, False), (5, True)), ((7, False), None)]
+
+    def test_serialize(self):
+        current_deps = parser.serialize_convergence_deps(self.edges)
+        self.assertEqual({'version': 2,
+                          'graph': [3, 1, 4,
+                                    2, 1, 2,
+                                    2, 2, 2, 2,
+                                    3, 1, 1,
+                                    4, 0]},
+                         current_deps)
+        self.assertEqual(sorted(self.edges, key=repr),
+                         sorted(parser.deserialize_convergence_deps(
+                             current_deps), key=repr))
+
+    def test_serialize_compressed(self):
+        edges = [((i, True), (j, False))
+                 for i in range(1, 500) for j in range(i, i + 10)]
+        current_deps = parser.serialize_convergence_deps(edges)
+        self.assertIn('zgraph', current_deps)
+        self.assertNotIn('graph', current_deps)
+        self.assertEqual(sorted(edges),
+                         sorted(parser.deserialize_convergence_deps(
+                             current_deps)))
+
+    def test_serialize_not_encodable(self):
+        edges = [(('a', True), ('b', True))]
+        current_deps = parser.serialize_convergence_deps(edges)
+        self.assertEqual({'edges': [[('a', True), ('b', True)]]},
+                         current_deps)
+        self.assertEqual(edges,
+                         parser.deserialize_convergence_deps(current_deps))
+
+    def test_deserialize_edges(self):
+        current_deps = {'edges': [[[1, True], [3, True]],
+                                  [[7, False], None]]}
+        self.assertEqual([((1, True), (3, True)), ((7, False), None)],
+                         parser.deserialize_convergence_deps(current_deps))
+
+
+class ConvergenceDepsDeltaTest(common.HeatTestCase):
+
+    def setUp(self):
+        super(ConvergenceDepsDeltaTest, self).setUp()
+        self.ctx = utils.dummy_context()
+        self.edges = set(((i, True), (i + 1, True)) for i in range(1, 20))
+        self.stack = parser.Stack(
+            self.ctx, 'test_stack',
+            templatem.Template.create_empty_template(),
+            current_deps=parser.serialize_convergence_deps(self.edges))
+
+    def stored_edges(self):
+        self.stack._convg_deps = None
+        return set(self.stack.convergence_dependencies.graph().edges())
+
+    def test_small_change(self):
+        base = self.stack.current_deps
+        edges = set(self.edges)
+        edges.remove(((1, True), (2, True)))
+        edges.add(((1, True), (3, True)))
+        edges.add(((30, False), None))
+
+        self.stack._set_stored_convergence_deps(edges)
+        self.assertIs(base, self.stack.current_deps)
+        self.assertEqual(
+            {'added': parser.serialize_convergence_deps(
+                [((1, True), (3, True)), ((30, False), None)]),
+             'removed': parser.serialize_convergence_deps(
+                 [((1, True), (2, True))])},
+            self.stack.current_deps_delta)
+        self.assertEqual(edges, self.stored_edges())
+
+    def test_no_change(self):
+        base = self.stack.current_deps
+        self.stack._set_stored_convergence_deps(self.edges)
+        self.assertIs(base, self.stack.current_deps)
+        self.assertIsNone(self.stack.current_deps_delta)
+        self.assertEqual(self.edges, self.stored_edges())
+
+    def test_large_change(self):
+        edges = set(((i, False), (i + 1, False)) for i in range(1, 20))
+        self.stack._set_stored_convergence_deps(edges)
+        self.assertEqual(parser.serialize_convergence_deps(edges),
+                         self.stack.current_deps)
+        self.assertIsNone(self.stack.current_deps_delta)
+        self.assertEqual(edges, self.stored_edges())
+
+    def test_old_format_replaced(self):
+        self.stack.current_deps = {'edges': [[list(rqr), list(rqd)]
+                                             for rqr, rqd in self.edges]}
+        self.stack._set_stored_convergence_deps(self.edges)
+        self.assertEqual(parser.serialize_convergence_deps(self.edges),
+                         self.stack.current_deps)
+        self.assertIsNone(self.stack.current_deps_delta)
+
+    @mock.patch.object(stack_object.Stack, 'update_by_id')
+    def test_store_unchanged_graph(self, mock_update):
+        self.stack.id = 'stack-id'
+        self.stack.t.id = 1
+        edges = set(self.edges)
+        edges.add(((30, False), None))
+        self.stack._set_stored_convergence_deps(edges)
+
+        self.stack.store()
+        values = mock_update.call_args[0][2]
+        self.assertNotIn('current_deps', values)
+        self.assertEqual(self.stack.current_deps_delta,
+                         values['current_deps_delta'])
+
+        self.stack.store()
+        values = mock_update.call_args[0][2]
+        self.assertNotIn('current_deps', values)
+        self.assertNotIn('current_deps_delta', values)
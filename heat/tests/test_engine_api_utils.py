@@ -27,6 +27,8 @@ from heat.engine import event
 from heat.engine import parameters
 from heat.engine import stack as parser
 from heat.engine import template
+from heat.objects import event as event_object
+from heat.objects import stack as stack_object
 from heat.rpc import api as rpc_api
 from heat.tests import common
 from heat.tests import utils
@@ -312,6 +314,21 @@ class FormatTest(common.HeatTestCase):
             event_id_formatted['path'])
         self.assertEqual(event_id, event_identifier.event_id)
 
+    def test_format_event_db_object(self):
+        stk = self._stored_stack('CREATE', 'COMPLETE')
+        ev = event.Event(stk.context, stk, 'CREATE', 'COMPLETE',
+                         'state changed', 'phys-id', {'Foo': 'bar'},
+                         'generic1', 'GenericResourceType')
+        ev.store()
+        db_event = event_object.Event.get_by_id(stk.context, ev.id)
+
+        expected = api.format_event(event.Event.load(stk.context, ev.id,
+                                                     db_event, stk))
+        formatted = api.format_event_db_object(db_event, stk.identifier())
+        self.assertEqual(expected, formatted)
+        self.assertEqual({'Foo': 'bar'},
+                         formatted[rpc_api.EVENT_RES_PROPERTIES])
+
     @mock.patch.object(api, 'format_stack_resource')
     def test_format_stack_preview(self, mock_fmt_resource):
         def mock_format_resources(res, **kwargs):
@@ -389,6 +406,42 @@ class FormatTest(common.HeatTestCase):
         info = api.format_stack(self.stack)
         self.assertEqual('1970-01-01T00:00:00', info['updated_time'])
 
+    def _stored_stack(self, action, status):
+        stk = parser.Stack(utils.dummy_context(), 'stored_stack',
+                           self.stack.t, tags=['tag1', 'tag2'])
+        stk.store()
+        stk.state_set(action, status, 'state changed')
+        return stk
+
+    def test_format_stack_db_object(self):
+        stk = self._stored_stack('CREATE', 'COMPLETE')
+        loaded = parser.Stack.load(stk.context, stk.id, resolve_data=False)
+        db_stack = stack_object.Stack.get_by_id(stk.context, stk.id)
+
+        info = api.format_stack_db_object(stk.context, db_stack)
+        self.assertEqual(api.format_stack(loaded), info)
+
+    def test_format_stack_db_object_deleted(self):
+        stk = self._stored_stack('DELETE', 'COMPLETE')
+        db_stack = stack_object.Stack.get_by_id(stk.context, stk.id)
+
+        info = api.format_stack_db_object(stk.context, db_stack)
+        self.assertNotIn(rpc_api.STACK_OUTPUTS, info)
+
+    def test_format_stack_db_object_template_data(self):
+        stk = self._stored_stack('CREATE', 'COMPLETE')
+        loaded = parser.Stack.load(stk.context, stk.id, resolve_data=False)
+        db_stack = stack_object.Stack.get_by_id(stk.context, stk.id,
+                                                load_template=False)
+        self.patchobject(template.Template, 'load',
+                         side_effect=AssertionError('Template loaded'))
+
+        info = api.format_stack_db_object(stk.context, db_stack,
+                                          stk.t.t)
+        expected = api.format_stack(loaded)
+        del expected[rpc_api.STACK_PARAMETERS]
+        self.assertEqual(expected, info)
+
     @mock.patch.object(api, 'format_stack_outputs')
     def test_format_stack_adds_outputs(self, mock_fmt_outputs):
         mock_fmt_outputs.return_value = 'foobar'
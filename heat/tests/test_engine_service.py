@@ -297,7 +297,9 @@ class StackConvergenceServiceCreateUpdateTest(common.HeatTestCase):
                      convergence=old_stack.convergence,
                      current_traversal=old_stack.current_traversal,
                      prev_raw_template_id=old_stack.prev_raw_template_id,
-                     current_deps=old_stack.current_deps).AndReturn(stack)
+                     current_deps=old_stack.current_deps,
+                     current_deps_delta=old_stack.current_deps_delta
+                     ).AndReturn(stack)
 
         self.m.StubOutWithMock(stack, 'validate')
         stack.validate().AndReturn(None)
@@ -483,13 +485,8 @@ class StackServiceTest(common.HeatTestCase):
 
     @tools.stack_context('service_list_all_test_stack')
     def test_stack_list_all(self):
-        self.m.StubOutWithMock(parser.Stack, '_from_db')
-        parser.Stack._from_db(
-            self.ctx, mox.IgnoreArg(),
-            resolve_data=False
-        ).AndReturn(self.stack)
-
-        self.m.ReplayAll()
+        self.patchobject(parser.Stack, '_from_db',
+                         side_effect=AssertionError('Stack loaded'))
         sl = self.eng.list_stacks(self.ctx)
 
         self.assertEqual(1, len(sl))
@@ -504,8 +501,25 @@ class StackServiceTest(common.HeatTestCase):
             self.assertIn('stack_status_reason', s)
             self.assertIn('description', s)
             self.assertIn('WordPress', s['description'])
+            self.assertEqual(self.stack.parameters.map(six.text_type),
+                             s['parameters'])
+            self.assertEqual([], s['outputs'])
+
+    @tools.stack_context('service_list_no_params_test_stack')
+    def test_stack_list_without_parameters(self):
+        self.patchobject(parser.Stack, '_from_db',
+                         side_effect=AssertionError('Stack loaded'))
+        self.patchobject(templatem.Template, 'load',
+                         side_effect=AssertionError('Template loaded'))
+        sl = self.eng.list_stacks(self.ctx, with_parameters=False)
 
-        self.m.VerifyAll()
+        self.assertEqual(1, len(sl))
+        s = sl[0]
+        self.assertEqual(self.stack.name, s['stack_name'])
+        self.assertIn('WordPress', s['description'])
+        self.assertEqual(s['description'], s['template_description'])
+        self.assertNotIn('parameters', s)
+        self.assertEqual(self.stack.action, s['stack_action'])
 
     @mock.patch.object(stack_object.Stack, 'get_all')
     def test_stack_list_passes_marker_info(self, mock_stack_get_all):
@@ -529,7 +543,8 @@ class StackServiceTest(common.HeatTestCase):
                                                    mock.ANY,
                                                    mock.ANY,
                                                    mock.ANY,
-                                                   )
+                                                   eager_load=True,
+                                                   load_template=True)
 
     @mock.patch.object(stack_object.Stack, 'get_all')
     def test_stack_list_passes_filtering_info(self, mock_stack_get_all):
@@ -549,7 +564,8 @@ class StackServiceTest(common.HeatTestCase):
                                                    mock.ANY,
                                                    mock.ANY,
                                                    mock.ANY,
-                                                   )
+                                                   eager_load=True,
+                                                   load_template=True)
 
     @mock.patch.object(stack_object.Stack, 'get_all')
     def test_stack_list_passes_filter_translated(self, mock_stack_get_all):
@@ -570,7 +586,8 @@ class StackServiceTest(common.HeatTestCase):
                                                    mock.ANY,
                                                    mock.ANY,
                                                    mock.ANY,
-                                                   )
+                                                   eager_load=True,
+                                                   load_template=True)
 
     @mock.patch.object(stack_object.Stack, 'get_all')
     def test_stack_list_tenant_safe_defaults_to_true(self, mock_stack_get_all):
@@ -589,7 +606,8 @@ class StackServiceTest(common.HeatTestCase):
                                                    mock.ANY,
                                                    mock.ANY,
                                                    mock.ANY,
-                                                   )
+                                                   eager_load=True,
+                                                   load_template=True)
 
     @mock.patch.object(stack_object.Stack, 'get_all')
     def test_stack_list_passes_tenant_safe_info(self, mock_stack_get_all):
@@ -608,7 +626,8 @@ class StackServiceTest(common.HeatTestCase):
                                                    mock.ANY,
                                                    mock.ANY,
                                                    mock.ANY,
-                                                   )
+                                                   eager_load=True,
+                                                   load_template=True)
 
     @mock.patch.object(stack_object.Stack, 'get_all')
     def test_stack_list_show_nested(self, mock_stack_get_all):
@@ -627,7 +646,8 @@ class StackServiceTest(common.HeatTestCase):
                                                    mock.ANY,
                                                    mock.ANY,
                                                    mock.ANY,
-                                                   )
+                                                   eager_load=True,
+                                                   load_template=True)
 
     @mock.patch.object(stack_object.Stack, 'get_all')
     def test_stack_list_show_deleted(self, mock_stack_get_all):
@@ -646,7 +666,8 @@ class StackServiceTest(common.HeatTestCase):
                                                    mock.ANY,
                                                    mock.ANY,
                                                    mock.ANY,
-                                                   )
+                                                   eager_load=True,
+                                                   load_template=True)
 
     @mock.patch.object(stack_object.Stack, 'get_all')
     def test_stack_list_show_hidden(self, mock_stack_get_all):
@@ -665,7 +686,8 @@ class StackServiceTest(common.HeatTestCase):
                                                    mock.ANY,
                                                    mock.ANY,
                                                    mock.ANY,
-                                                   )
+                                                   eager_load=True,
+                                                   load_template=True)
 
     @mock.patch.object(stack_object.Stack, 'get_all')
     def test_stack_list_tags(self, mock_stack_get_all):
@@ -684,7 +706,8 @@ class StackServiceTest(common.HeatTestCase):
                                                    mock.ANY,
                                                    mock.ANY,
                                                    mock.ANY,
-                                                   )
+                                                   eager_load=True,
+                                                   load_template=True)
 
     @mock.patch.object(stack_object.Stack, 'get_all')
     def test_stack_list_tags_any(self, mock_stack_get_all):
@@ -703,7 +726,8 @@ class StackServiceTest(common.HeatTestCase):
                                                    ['foo', 'bar'],
                                                    mock.ANY,
                                                    mock.ANY,
-                                                   )
+                                                   eager_load=True,
+                                                   load_template=True)
 
     @mock.patch.object(stack_object.Stack, 'get_all')
     def test_stack_list_not_tags(self, mock_stack_get_all):
@@ -722,7 +746,8 @@ class StackServiceTest(common.HeatTestCase):
                                                    mock.ANY,
                                                    ['foo', 'bar'],
                                                    mock.ANY,
-                                                   )
+                                                   eager_load=True,
+                                                   load_template=True)
 
     @mock.patch.object(stack_object.Stack, 'get_all')
     def test_stack_list_not_tags_any(self, mock_stack_get_all):
@@ -741,7 +766,8 @@ class StackServiceTest(common.HeatTestCase):
                                                    mock.ANY,
                                                    mock.ANY,
                                                    ['foo', 'bar'],
-                                                   )
+                                                   eager_load=True,
+                                                   load_template=True)
 
     @mock.patch.object(stack_object.Stack, 'count_all')
     def test_count_stacks_passes_filter_info(self, mock_stack_count_all):
@@ -728,6 +728,41 @@ class ChildEnvTest(common.HeatTestCase):
         self.assertEqual(u'carrots.yaml', resources[u'OS::Fruit'])
         self.assertEqual('pre-update', resources[u'hooks'])
 
+    def test_registry_shared_until_modified(self):
+        env = {u'resource_registry': {u'OS::Food': u'fruity.yaml'}}
+        penv = environment.Environment(env)
+        cenv = environment.get_child_environment(penv, None)
+        self.assertIs(penv.registry._registry, cenv.registry._registry)
+
+        cenv.load({u'resource_registry': {u'OS::Fruit': u'apples.yaml'}})
+        self.assertIsNot(penv.registry._registry, cenv.registry._registry)
+        self.assertEqual('apples.yaml',
+                         cenv.get_resource_info('OS::Fruit').value)
+        self.assertRaises(exception.EntityNotFound,
+                          penv.get_resource_info, 'OS::Fruit')
+
+    def test_parent_modified_after_child(self):
+        env = {u'resource_registry': {u'OS::Food': u'fruity.yaml'}}
+        penv = environment.Environment(env)
+        cenv = environment.get_child_environment(penv, None)
+        penv.load({u'resource_registry': {u'OS::Food': u'nutty.yaml'}})
+        self.assertEqual('nutty.yaml',
+                         penv.get_resource_info('OS::Food').value)
+        self.assertEqual('fruity.yaml',
+                         cenv.get_resource_info('OS::Food').value)
+
+    def test_shared_info_belongs_to_child(self):
+        env = {u'resource_registry': {u'OS::Food': u'fruity.yaml'}}
+        penv = environment.Environment(env)
+        cenv = environment.get_child_environment(penv, None)
+        pinfo = penv.get_resource_info('OS::Food')
+        cinfo = cenv.get_resource_info('OS::Food')
+        self.assertIs(penv.registry, pinfo.registry)
+        self.assertIs(cenv.registry, cinfo.registry)
+        self.assertEqual(pinfo, cinfo)
+        self.assertIs(cinfo, cenv.get_resource_info('OS::Food',
+                                                    resource_name='abc'))
+
 
 class ResourceRegistryTest(common.HeatTestCase):
 
@@ -860,6 +895,89 @@ class ResourceRegistryTest(common.HeatTestCase):
         self.assertEqual([], types)
 
 
+class ResourceRegistryLookupTest(common.HeatTestCase):
+
+    def setUp(self):
+        super(ResourceRegistryLookupTest, self).setUp()
+        self.g_registry = environment.ResourceRegistry(None, {})
+        self.g_registry.register_class('OS::Test::Generic',
+                                       generic_resource.GenericResource)
+        self.g_registry.register_class('OS::Test::Other',
+                                       generic_resource.ResourceWithProps)
+        self.registry = environment.ResourceRegistry(self.g_registry, {})
+
+    def test_lookup_stored(self):
+        self.registry.load({'OS::Test::Alias': 'OS::Test::Generic'})
+        info = self.registry.get_resource_info('OS::Test::Alias', 'res')
+        self.assertEqual('OS::Test::Generic', info.name)
+
+        iterable_by = self.patchobject(self.registry, 'iterable_by')
+        for i in range(2):
+            self.assertIs(info,
+                          self.registry.get_resource_info('OS::Test::Alias',
+                                                          'res'))
+        self.assertFalse(iterable_by.called)
+
+    def test_not_found_not_stored(self):
+        for i in range(2):
+            self.assertRaises(exception.EntityNotFound,
+                              self.registry.get_resource_info,
+                              'OS::Test::Missing')
+        self.g_registry.register_class('OS::Test::Missing',
+                                       generic_resource.GenericResource)
+        self.assertEqual('OS::Test::Missing',
+                         self.registry.get_resource_info(
+                             'OS::Test::Missing').name)
+
+    def test_user_registry_changed(self):
+        self.registry.load({'OS::Test::Alias': 'OS::Test::Generic'})
+        self.assertEqual('OS::Test::Generic',
+                         self.registry.get_resource_info(
+                             'OS::Test::Alias').name)
+        self.registry.load({'OS::Test::Alias': 'OS::Test::Other'})
+        self.assertEqual('OS::Test::Other',
+                         self.registry.get_resource_info(
+                             'OS::Test::Alias').name)
+
+    def test_resource_mapping_changed(self):
+        self.assertEqual('OS::Test::Generic',
+                         self.registry.get_resource_info(
+                             'OS::Test::Generic', 'res').name)
+        self.registry.load({'resources': {
+            'res': {'OS::Test::Generic': 'OS::Test::Other'}}})
+        self.assertEqual('OS::Test::Other',
+                         self.registry.get_resource_info(
+                             'OS::Test::Generic', 'res').name)
+
+    def test_global_registry_changed(self):
+        self.assertEqual(generic_resource.GenericResource,
+                         self.registry.get_class('OS::Test::Generic'))
+        self.g_registry.register_class('OS::Test::Generic',
+                                       generic_resource.ResourceWithProps)
+        self.assertEqual(generic_resource.ResourceWithProps,
+                         self.registry.get_class('OS::Test::Generic'))
+
+    def test_glob_added(self):
+        self.assertRaises(exception.EntityNotFound,
+                          self.registry.get_resource_info, 'OS::Foo::Bar')
+        self.registry.load({'OS::Foo::*': 'OS::Test::Generic'})
+        self.assertEqual('OS::Test::Generic',
+                         self.registry.get_resource_info(
+                             'OS::Foo::Bar').name)
+        self.registry.load({'OS::Foo::*': None})
+        self.assertRaises(exception.EntityNotFound,
+                          self.registry.get_resource_info, 'OS::Foo::Bar')
+
+    def test_removed(self):
+        self.registry.load({'OS::Test::Alias': 'OS::Test::Generic'})
+        info = self.registry.get_resource_info(
+            'OS::Test::Alias', registry_type=environment.ClassResourceInfo)
+        self.assertEqual('OS::Test::Generic', info.name)
+        self.registry.load({'OS::Test::Alias': None})
+        self.assertRaises(exception.EntityNotFound,
+                          self.registry.get_resource_info, 'OS::Test::Alias')
+
+
 class HookMatchTest(common.HeatTestCase):
 
     scenarios = [(hook_type, {'hook': hook_type}) for hook_type in
@@ -191,6 +191,41 @@ class EventTest(EventCommon):
         self.assertEqual(1, len(events))
         self.assertEqual('arizona', events[0].physical_resource_id)
 
+    def test_store_all(self):
+        events = [event.Event(self.ctx, self.stack, 'TEST', 'IN_PROGRESS',
+                              'Testing', name, self.resource.properties,
+                              self.resource.name, self.resource.type())
+                  for name in ('alabama', 'arizona', 'arkansas')]
+        create = self.patchobject(event_object.Event, 'create')
+
+        event.Event.store_all(self.ctx, events)
+
+        self.assertFalse(create.called)
+        stored = sorted(event_object.Event.get_all_by_stack(self.ctx,
+                                                            self.stack.id),
+                        key=lambda e: e.id)
+        self.assertEqual(['alabama', 'arizona', 'arkansas'],
+                         [e.physical_resource_id for e in stored])
+        self.assertEqual([e.id for e in stored], [e.id for e in events])
+        self.assertEqual([e.uuid for e in stored], [e.uuid for e in events])
+        for e in events:
+            self.assertIsNotNone(e.timestamp)
+
+    def test_store_all_db_error(self):
+        events = [event.Event(self.ctx, self.stack, 'TEST', 'IN_PROGRESS',
+                              'Testing', name, self.resource.properties,
+                              self.resource.name, self.resource.type())
+                  for name in ('alabama', 'arizona')]
+        self.patchobject(event_object.Event, 'create_many',
+                         side_effect=oslo_db.exception.DBError)
+
+        event.Event.store_all(self.ctx, events)
+
+        for e in events:
+            self.assertIsNotNone(e.id)
+        self.assertEqual(2, len(event_object.Event.get_all_by_stack(
+            self.ctx, self.stack.id)))
+
     def test_identifier(self):
         event_uuid = 'abc123yc-9f88-404d-a85b-531529456xyz'
         e = event.Event(self.ctx, self.stack, 'TEST', 'IN_PROGRESS', 'Testing',
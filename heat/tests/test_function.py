@@ -56,6 +56,18 @@ class TestFunctionResult(function.Function):
         return super(TestFunctionResult, self).result()
 
 
+class TestPureFunction(function.Function):
+    pure = True
+
+    def __init__(self, stack, fn_name, args):
+        super(TestPureFunction, self).__init__(stack, fn_name, args)
+        self.calls = 0
+
+    def result(self):
+        self.calls += 1
+        return {'result': function.resolve(self.args)}
+
+
 class FunctionTest(common.HeatTestCase):
     def test_equal(self):
         func = TestFunction(None, 'foo', ['bar', 'baz'])
@@ -170,6 +182,77 @@ class ResolveTest(common.HeatTestCase):
         self.assertIsNot(result, snippet)
 
 
+class ConstantTest(common.HeatTestCase):
+    def test_literal_args(self):
+        func = TestPureFunction(None, 'foo', ['bar', {'baz': 'quux'}])
+        self.assertTrue(function.is_constant(func))
+        self.assertTrue(function.is_constant({'foo': [func]}))
+
+    def test_nested_pure_function(self):
+        inner = TestPureFunction(None, 'foo', 'bar')
+        func = TestPureFunction(None, 'foo', ['baz', inner])
+        self.assertTrue(function.is_constant(func))
+
+    def test_impure_function(self):
+        func = TestFunction(None, 'foo', ['bar', 'baz'])
+        self.assertFalse(function.is_constant(func))
+        self.assertFalse(function.is_constant(['foo', {'bar': func}]))
+
+    def test_pure_function_of_impure_function(self):
+        inner = TestFunction(None, 'foo', ['bar', 'baz'])
+        func = TestPureFunction(None, 'foo', {'wibble': inner})
+        self.assertFalse(function.is_constant(func))
+
+        self.assertEqual({'result': {'wibble': 'wibble'}},
+                         function.resolve(func))
+        self.assertEqual({'result': {'wibble': 'wibble'}},
+                         function.resolve(func))
+        self.assertEqual(2, func.calls)
+
+    def test_resolve_once(self):
+        inner = TestPureFunction(None, 'foo', 'bar')
+        func = TestPureFunction(None, 'foo', ['baz', inner])
+        expected = {'result': ['baz', {'result': 'bar'}]}
+
+        self.assertEqual(expected, function.resolve(func))
+        self.assertEqual({'wibble': expected},
+                         function.resolve({'wibble': func}))
+        self.assertEqual(1, func.calls)
+        self.assertEqual(1, inner.calls)
+
+    def test_constant_result_not_constant(self):
+        func = TestPureFunction(None, 'foo',
+                                [TestFunction(None, 'foo', ['bar', 'baz'])])
+        self.assertRaises(TypeError, func.constant_result)
+        self.assertEqual(0, func.calls)
+
+    def test_resolve_copies_result(self):
+        func = TestPureFunction(None, 'foo', ['bar'])
+
+        result = function.resolve(func)
+        result['result'].append('baz')
+
+        self.assertEqual({'result': ['bar']}, function.resolve(func))
+
+    def test_live_results(self):
+        live = TestFunction(None, 'foo', ['bar', 'baz'])
+        inner = TestPureFunction(None, 'foo', 'bar')
+        func = TestPureFunction(None, 'foo', [inner, {'wibble': live}])
+        self.assertEqual([], list(function.live_results(inner)))
+        self.assertEqual(['wibble'], list(function.live_results(func)))
+        self.assertEqual(['wibble', 'wibble'],
+                         list(function.live_results(['foo', live,
+                                                     {'bar': func}])))
+
+    def test_error_not_stored(self):
+        func = TestPureFunction(None, 'foo', 'bar')
+        self.patchobject(func, 'result', side_effect=ValueError)
+
+        self.assertRaises(ValueError, function.resolve, func)
+        self.assertRaises(ValueError, function.resolve, func)
+        self.assertEqual(2, func.result.call_count)
+
+
 class ValidateTest(common.HeatTestCase):
     def setUp(self):
         super(ValidateTest, self).setUp()
@@ -1344,6 +1344,46 @@ class HotStackTest(common.HeatTestCase):
         self.assertEqual(stack_id,
                          self.stack['AResource'].metadata_get()['Bar'])
 
+    def test_constant_functions_resolved_once(self):
+        tmpl = template.Template(
+            {'heat_template_version': '2015-10-15',
+             'parameters': {'p': {'type': 'string', 'default': 'foo'}}})
+        self.stack = parser.Stack(self.ctx, 'constant_test', tmpl)
+        replace = self.stack.t.parse(self.stack, {
+            'str_replace': {
+                'template': 'x-var-y',
+                'params': {'var': {'list_join': [
+                    '-', [{'get_param': 'p'}, 'bar']]}}}})
+        self.assertTrue(replace.is_constant())
+
+        self.patchobject(hot_functions.JoinMultiple, 'result',
+                         return_value='foo-bar')
+        self.assertEqual('x-foo-bar-y', function.resolve(replace))
+        self.assertEqual('x-foo-bar-y', function.resolve(replace))
+        self.assertEqual(1, hot_functions.JoinMultiple.result.call_count)
+
+    def test_live_functions_not_constant(self):
+        tmpl = template.Template(hot_tpl_complex_attrs_all_attrs)
+        self.stack = parser.Stack(self.ctx, 'live_test', tmpl)
+        for snippet in ({'get_resource': 'resource1'},
+                        {'get_attr': ['resource1', 'list']},
+                        {'get_param': 'OS::stack_id'},
+                        {'list_join': [',', [{'get_param': 'OS::stack_id'}]]},
+                        {'str_replace': {
+                            'template': 'x',
+                            'params': {'x': {'get_resource': 'resource1'}}}}):
+            func = self.stack.t.parse(self.stack, snippet)
+            self.assertFalse(func.is_constant(), snippet)
+
+    def test_stack_id_param_not_stored(self):
+        tmpl = template.Template(hot_tpl_empty)
+        self.stack = parser.Stack(self.ctx, 'param_id_test', tmpl)
+        stack_id = self.stack.t.parse(self.stack,
+                                      {'get_param': 'OS::stack_id'})
+        self.assertEqual('None', function.resolve(stack_id))
+        self.stack.store()
+        self.assertEqual(self.stack.id, function.resolve(stack_id))
+
     def test_load_param_id(self):
         tmpl = template.Template(hot_tpl_empty)
         self.stack = parser.Stack(self.ctx, 'param_load_id_test', tmpl)
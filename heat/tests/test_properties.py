@@ -17,6 +17,7 @@ import six
 from heat.common import exception
 from heat.engine.cfn import functions as cfn_funcs
 from heat.engine import constraints
+from heat.engine import function
 from heat.engine.hot import parameters as hot_param
 from heat.engine import parameters
 from heat.engine import plugin_manager
@@ -1597,6 +1598,86 @@ class PropertiesTest(common.HeatTestCase):
         self.assertTrue(props_a != props_b)
 
 
+class LiveFunction(function.Function):
+    def result(self):
+        return self.args['value']
+
+
+class PropertiesCacheTest(common.HeatTestCase):
+    def setUp(self):
+        super(PropertiesCacheTest, self).setUp()
+        self.schema = {
+            'string': {'Type': 'String'},
+            'list': {'Type': 'List'},
+            'map': {'Type': 'Map'},
+        }
+        self.live = LiveFunction(None, 'live', {'value': 'foo'})
+        self.data = {
+            'string': cfn_funcs.Join(None, 'Fn::Join',
+                                     ['-', ['x', self.live]]),
+            'list': cfn_funcs.Split(None, 'Fn::Split', [',', 'a,b']),
+            'map': {'foo': 'bar'},
+        }
+        self.props = properties.Properties(self.schema, self.data,
+                                           function.resolve)
+
+    def test_constant_value_stored(self):
+        self.patchobject(cfn_funcs.Split, 'result', return_value=['a', 'b'])
+        self.assertEqual(['a', 'b'], self.props['list'])
+        self.assertEqual(['a', 'b'], self.props['list'])
+        self.assertEqual(1, cfn_funcs.Split.result.call_count)
+        self.assertEqual((1, 1, 0), self.props.cache_info())
+
+    def test_stored_value_copied(self):
+        self.props['map']['foo'] = 'baz'
+        self.props['list'].append('c')
+        self.assertEqual({'foo': 'bar'}, self.props['map'])
+        self.assertEqual(['a', 'b'], self.props['list'])
+        self.assertEqual({'foo': 'bar'}, self.data['map'])
+
+    def test_live_value_unchanged(self):
+        self.patchobject(cfn_funcs.Join, 'result', return_value='x-foo')
+        self.assertEqual('x-foo', self.props['string'])
+        self.assertEqual('x-foo', self.props['string'])
+        self.assertEqual(1, cfn_funcs.Join.result.call_count)
+        self.assertEqual((1, 1, 0), self.props.cache_info())
+
+    def test_live_value_changed(self):
+        self.assertEqual('x-foo', self.props['string'])
+        self.live.args['value'] = 'bar'
+        self.assertEqual('x-bar', self.props['string'])
+        self.assertEqual('x-bar', self.props['string'])
+        self.assertEqual((1, 1, 1), self.props.cache_info())
+
+    def test_data_replaced(self):
+        self.assertEqual({'foo': 'bar'}, self.props['map'])
+        self.data['map'] = {'foo': 'baz'}
+        self.assertEqual({'foo': 'baz'}, self.props['map'])
+        self.assertEqual((0, 1, 1), self.props.cache_info())
+
+    def test_clear_cache(self):
+        self.assertEqual({'foo': 'bar'}, self.props['map'])
+        self.data['map']['foo'] = 'baz'
+        self.props.clear_cache()
+        self.assertEqual({'foo': 'baz'}, self.props['map'])
+        self.assertEqual((0, 2, 0), self.props.cache_info())
+
+    def test_validate_not_stored(self):
+        self.props.validate()
+        self.assertEqual((0, 0, 0), self.props.cache_info())
+
+    def test_error_not_stored(self):
+        self.live.args['value'] = 42
+        self.assertRaises(ValueError, self.props.get, 'string')
+        self.live.args['value'] = 'foo'
+        self.assertEqual('x-foo', self.props['string'])
+
+    def test_other_resolver_not_stored(self):
+        props = properties.Properties(self.schema, self.data)
+        self.assertEqual({'foo': 'bar'}, props['map'])
+        self.assertEqual((0, 0, 0), props.cache_info())
+
+
 class PropertiesValidationTest(common.HeatTestCase):
     def test_required(self):
         schema = {'foo': {'Type': 'String', 'Required': True}}
@@ -767,6 +767,28 @@ class ResourceTest(common.HeatTestCase):
         scheduler.TaskRunner(res.create)()
         self.assertEqual((res.CREATE, res.COMPLETE), res.state)
 
+    def test_check_complete_interval(self):
+        tmpl = rsrc_defn.ResourceDefinition('test_resource', 'Foo')
+        res = generic_rsrc.GenericResource('test_resource', tmpl, self.stack)
+        res.check_complete_interval = scheduler.PollInterval(10)
+        res.check_create_complete = mock.Mock(side_effect=[False, True])
+        due = self.patchobject(scheduler.PollTimer, 'due',
+                               side_effect=[False, False, True])
+
+        runner = scheduler.TaskRunner(res.action_handler_task, res.CREATE)
+        runner.start()
+        self.assertFalse(runner.step())
+        self.assertEqual(1, res.check_create_complete.call_count)
+
+        # check_create_complete() is not called again until the poll is due
+        self.assertFalse(runner.step())
+        self.assertFalse(runner.step())
+        self.assertEqual(1, res.check_create_complete.call_count)
+
+        self.assertTrue(runner.step())
+        self.assertEqual(2, res.check_create_complete.call_count)
+        self.assertEqual(3, due.call_count)
+
     def test_create_fail_retry(self):
         tmpl = rsrc_defn.ResourceDefinition('test_resource', 'Foo',
                                             {'Foo': 'abc'})
@@ -2191,7 +2213,9 @@ class ResourceTest(common.HeatTestCase):
         self.assertTrue(mock_stack_load.called)
         mock_stack_load.assert_called_with(stack.context,
                                            stack_id=stack.id,
-                                           cache_data=data)
+                                           cache_data=data,
+                                           templates=None,
+                                           dep_attrs_indexes=None)
         self.assertTrue(mock_load_data.called)
 
 
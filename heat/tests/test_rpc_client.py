@@ -120,6 +120,7 @@ class EngineRpcAPITestCase(common.HeatTestCase):
             'tags_any': mock.ANY,
             'not_tags': mock.ANY,
             'not_tags_any': mock.ANY,
+            'with_parameters': mock.ANY,
         }
         self._test_engine_api('list_stacks', 'call', **default_args)
 
@@ -231,7 +232,8 @@ class EngineRpcAPITestCase(common.HeatTestCase):
                   'marker': None,
                   'sort_keys': None,
                   'sort_dir': None,
-                  'filters': None}
+                  'filters': None,
+                  'include_rsrc_prop_data': True}
         self._test_engine_api('list_events', 'call', **kwargs)
 
     def test_describe_stack_resource(self):
@@ -14,6 +14,7 @@
 # limitations under the License.
 
 import mock
+from oslo_config import cfg
 
 from heat.rpc import worker_api as rpc_api
 from heat.rpc import worker_client as rpc_client
@@ -44,7 +45,8 @@ class WorkerClientTest(common.HeatTestCase):
         worker_client = rpc_client.WorkerClient()
         rpc_client_method.assert_called_once_with(
             version=rpc_client.WorkerClient.BASE_RPC_API_VERSION,
-            topic=rpc_api.TOPIC
+            topic=rpc_api.TOPIC,
+            version_cap=None
         )
         self.assertEqual(mock_rpc_client,
                          worker_client._client,
@@ -72,3 +74,48 @@ class WorkerClientTest(common.HeatTestCase):
         mock_rpc_client.cast.assert_called_once_with(mock_cnxt,
                                                      method,
                                                      **kwargs)
+
+    @mock.patch('heat.common.messaging.get_rpc_client',
+                return_value=mock.Mock())
+    def test_check_resources(self, rpc_client_method):
+        mock_rpc_client = rpc_client_method.return_value
+        mock_rpc_client.can_send_version.return_value = True
+        worker_client = rpc_client.WorkerClient()
+        mock_cnxt = mock.Mock()
+        resources = [(1, {}, True), (2, {}, False)]
+
+        worker_client.check_resources(mock_cnxt, 'stack-id', resources,
+                                      'traversal', None, server='host1')
+        mock_rpc_client.can_send_version.assert_called_once_with('1.3')
+        mock_rpc_client.prepare.assert_called_once_with(version='1.3',
+                                                        server='host1')
+        mock_rpc_client.prepare.return_value.cast.assert_called_once_with(
+            mock_cnxt, 'check_resources', stack_id='stack-id',
+            resources=resources, current_traversal='traversal',
+            adopt_stack_data=None)
+
+    def test_version_cap(self):
+        worker_client = rpc_client.WorkerClient()
+        self.assertTrue(worker_client._client.can_send_version('1.3'))
+
+        cfg.CONF.set_override('worker', '1.2', group='upgrade_levels')
+        worker_client = rpc_client.WorkerClient()
+        self.assertTrue(worker_client._client.can_send_version('1.2'))
+        self.assertFalse(worker_client._client.can_send_version('1.3'))
+
+    def test_check_resources_version_capped(self):
+        cfg.CONF.set_override('worker', '1.2', group='upgrade_levels')
+        worker_client = rpc_client.WorkerClient()
+        mock_check_resource = self.patchobject(worker_client,
+                                               'check_resource')
+        mock_cast = self.patchobject(worker_client, 'cast')
+        mock_cnxt = mock.Mock()
+        resources = [(1, {}, True), (2, {}, False)]
+
+        worker_client.check_resources(mock_cnxt, 'stack-id', resources,
+                                      'traversal', None, server='host1')
+        mock_check_resource.assert_has_calls([
+            mock.call(mock_cnxt, 1, 'traversal', {}, True, None),
+            mock.call(mock_cnxt, 2, 'traversal', {}, False, None)])
+        self.assertEqual(2, mock_check_resource.call_count)
+        self.assertFalse(mock_cast.called)
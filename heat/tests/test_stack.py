@@ -23,6 +23,7 @@ import mox
 from oslo_config import cfg
 import six
 
+from heat.common import config
 from heat.common import context
 from heat.common import exception
 from heat.common import template_format
@@ -33,10 +34,12 @@ from heat.engine.clients.os import nova
 from heat.engine import environment
 from heat.engine import function
 from heat.engine import resource
+from heat.engine.resources import stack_resource
 from heat.engine import scheduler
 from heat.engine import service
 from heat.engine import stack
 from heat.engine import template
+from heat.objects import event as event_object
 from heat.objects import raw_template as raw_template_object
 from heat.objects import resource as resource_objects
 from heat.objects import stack as stack_object
@@ -64,6 +67,58 @@ class StackTest(common.HeatTestCase):
                                  tenant_id='bar')
         self.assertEqual('bar', self.stack.tenant_id)
 
+    def test_resource_action_limits(self):
+        cfg.CONF.set_override('max_concurrent_resource_actions', 10)
+        cfg.CONF.set_override('max_concurrent_resource_actions_per_stack', 5)
+        cfg.CONF.set_override('max_concurrent_resource_actions_per_type',
+                              {'GenericResourceType': 2, 'OS::Heat::None': 3})
+        tmpl = {'HeatTemplateFormatVersion': '2012-12-12',
+                'Resources': {
+                    'A': {'Type': 'GenericResourceType'},
+                    'B': {'Type': 'ResourceWithPropsType'}}}
+        self.stack = stack.Stack(self.ctx, 'test_stack',
+                                 template.Template(tmpl))
+        limits = self.stack.resource_action_limits()
+
+        a_limits = limits(self.stack['A'])
+        b_limits = limits(self.stack['B'])
+        self.assertEqual([10, 5, 2], [lim.limit for lim in a_limits])
+        self.assertEqual([10, 5], [lim.limit for lim in b_limits])
+        self.assertIs(a_limits[1], b_limits[1])
+
+        # only the engine and resource type limits are shared between stacks
+        other_stack = stack.Stack(self.ctx, 'other_stack',
+                                  template.Template(tmpl))
+        other_limits = other_stack.resource_action_limits()(other_stack['A'])
+        self.assertIs(a_limits[0], other_limits[0])
+        self.assertIsNot(a_limits[1], other_limits[1])
+        self.assertIs(a_limits[2], other_limits[2])
+
+    def test_resource_action_limits_per_type_option(self):
+        name = 'max_concurrent_resource_actions_per_type'
+        opt_type = [opt.type for opt in config.engine_opts
+                    if opt.name == name][0]
+        self.assertEqual({'OS::Nova::Server': 10, 'OS::Heat::None': 0},
+                         opt_type('OS::Nova::Server:10, OS::Heat::None:0'))
+        for value in ('GenericResourceType:two', 'GenericResourceType:-1',
+                      'GenericResourceType'):
+            self.assertRaises(ValueError, opt_type, value)
+
+    def test_resource_action_limits_nested(self):
+        cfg.CONF.set_override('max_concurrent_resource_actions', 10)
+        self.stack = stack.Stack(self.ctx, 'test_stack', self.tmpl)
+        limits = self.stack.resource_action_limits()
+        nested = mock.Mock(spec=stack_resource.StackResource)
+        self.assertEqual([], limits(nested))
+
+    def test_resource_action_limits_waits_for_signal(self):
+        cfg.CONF.set_override('max_concurrent_resource_actions', 10)
+        self.stack = stack.Stack(self.ctx, 'test_stack', self.tmpl)
+        limits = self.stack.resource_action_limits()
+        waiting = mock.Mock(spec=resource.Resource)
+        waiting.waits_for_signal.return_value = True
+        self.assertEqual([], limits(waiting))
+
     def test_stack_reads_tenant_from_context_if_empty(self):
         self.ctx.tenant_id = 'foo'
         self.stack = stack.Stack(self.ctx, 'test_stack', self.tmpl,
@@ -345,7 +400,8 @@ class StackTest(common.HeatTestCase):
                              current_traversal=self.stack.current_traversal,
                              tags=mox.IgnoreArg(),
                              prev_raw_template_id=None,
-                             current_deps=None, cache_data=None)
+                             current_deps=None, current_deps_delta=None,
+                             cache_data=None)
 
         self.m.ReplayAll()
         stack.Stack.load(self.ctx, stack_id=self.stack.id)
@@ -473,6 +529,40 @@ class StackTest(common.HeatTestCase):
         stk = stack.Stack.load(self.ctx, stack_id=stack_id)
         self.assertEqual('foobar', stk.username)
 
+    def test_load_with_templates(self):
+        self.stack = stack.Stack(self.ctx, 'stack_name', self.tmpl)
+        self.stack.store()
+        templates = {}
+
+        stk1 = stack.Stack.load(self.ctx, stack_id=self.stack.id,
+                                templates=templates)
+        self.assertEqual([self.stack.t.id], list(templates))
+        self.assertEqual(self.stack.t.t, templates[self.stack.t.id].template)
+
+        with mock.patch.object(raw_template_object.RawTemplate,
+                               'get_by_id') as get_by_id:
+            stk2 = stack.Stack.load(self.ctx, stack_id=self.stack.id,
+                                    templates=templates)
+            self.assertFalse(get_by_id.called)
+        self.assertIsNot(stk1.t, stk2.t)
+        self.assertIsNot(stk1.t.t, stk2.t.t)
+        self.assertIsNot(stk1.t.env, stk2.t.env)
+        self.assertEqual(stk1.t.t, stk2.t.t)
+        self.assertEqual(stk1.t.id, stk2.t.id)
+        self.assertEqual(self.stack.parameters['AWS::StackId'],
+                         stk2.parameters['AWS::StackId'])
+
+    def test_load_with_dep_attrs_indexes(self):
+        self.stack = stack.Stack(self.ctx, 'stack_name', self.tmpl)
+        self.stack.store()
+        indexes = {}
+
+        stk = stack.Stack.load(self.ctx, stack_id=self.stack.id,
+                               templates={}, dep_attrs_indexes=indexes)
+        self.assertIs(indexes, stk.dep_attrs_indexes)
+        stk = stack.Stack.load(self.ctx, stack_id=self.stack.id)
+        self.assertIsNone(stk.dep_attrs_indexes)
+
     def test_load_all(self):
         stack1 = stack.Stack(self.ctx, 'stack1', self.tmpl)
         stack1.store()
@@ -1069,6 +1159,95 @@ class StackTest(common.HeatTestCase):
 
         self.m.VerifyAll()
 
+    def test_create_stores_resource_events_together(self):
+        tmpl = {'HeatTemplateFormatVersion': '2012-12-12',
+                'Resources': {
+                    'AResource': {'Type': 'GenericResourceType'},
+                    'BResource': {'Type': 'GenericResourceType'}}}
+        self.stack = stack.Stack(self.ctx, 'event_store_test_stack',
+                                 template.Template(tmpl))
+        self.stack.store()
+
+        create_many = self.patchobject(event_object.Event, 'create_many',
+                                       wraps=event_object.Event.create_many)
+        create = self.patchobject(event_object.Event, 'create',
+                                  wraps=event_object.Event.create)
+
+        self.stack.create()
+
+        self.assertEqual((stack.Stack.CREATE, stack.Stack.COMPLETE),
+                         self.stack.state)
+        self.assertTrue(create_many.called)
+        stack_events = [c[0][1]['resource_name']
+                        for c in create.call_args_list]
+        self.assertEqual([self.stack.name], stack_events)
+        self.assertIsNone(self.stack._pending_events)
+
+        events = sorted(event_object.Event.get_all_by_stack(self.ctx,
+                                                            self.stack.id),
+                        key=lambda e: e.id)
+        states = [(e.resource_name, e.resource_status) for e in events]
+        self.assertEqual((self.stack.name, 'IN_PROGRESS'), states[0])
+        self.assertEqual(5, len(states))
+        for name in ('AResource', 'BResource'):
+            self.assertLess(states.index((name, 'IN_PROGRESS')),
+                            states.index((name, 'COMPLETE')))
+
+    def test_delete_stores_resource_events_together(self):
+        tmpl = {'HeatTemplateFormatVersion': '2012-12-12',
+                'Resources': {
+                    'AResource': {'Type': 'GenericResourceType'},
+                    'BResource': {'Type': 'GenericResourceType'}}}
+        self.stack = stack.Stack(self.ctx, 'event_store_test_stack',
+                                 template.Template(tmpl))
+        self.stack.store()
+        self.stack.create()
+
+        create_many = self.patchobject(event_object.Event, 'create_many',
+                                       wraps=event_object.Event.create_many)
+        create = self.patchobject(event_object.Event, 'create',
+                                  wraps=event_object.Event.create)
+
+        self.stack.delete()
+
+        self.assertEqual((stack.Stack.DELETE, stack.Stack.COMPLETE),
+                         self.stack.state)
+        self.assertTrue(create_many.called)
+        stack_events = [c[0][1]['resource_name']
+                        for c in create.call_args_list]
+        self.assertEqual({self.stack.name}, set(stack_events))
+        self.assertIsNone(self.stack._pending_events)
+
+    def test_create_stores_resources_together(self):
+        tmpl = {'HeatTemplateFormatVersion': '2012-12-12',
+                'Resources': {
+                    'AResource': {'Type': 'GenericResourceType'},
+                    'BResource': {'Type': 'GenericResourceType'},
+                    'CResource': {'Type': 'ResourceWithPropsType',
+                                  'Properties': {
+                                      'Foo': {'Ref': 'AResource'}}}}}
+        self.stack = stack.Stack(self.ctx, 'bulk_store_test_stack',
+                                 template.Template(tmpl))
+        self.stack.store()
+
+        create_many = self.patchobject(resource_objects.Resource,
+                                       'create_many',
+                                       wraps=resource_objects.Resource.
+                                       create_many)
+        create = self.patchobject(resource_objects.Resource, 'create')
+
+        self.stack.create()
+
+        self.assertEqual((stack.Stack.CREATE, stack.Stack.COMPLETE),
+                         self.stack.state)
+        self.assertEqual(1, create_many.call_count)
+        self.assertFalse(create.called)
+        for res in self.stack.resources.values():
+            self.assertIsNotNone(res.id)
+            db_res = resource_objects.Resource.get_obj(self.ctx, res.id)
+            self.assertEqual(res.name, db_res.name)
+            self.assertEqual(self.stack.id, db_res.stack_id)
+
     def test_create_bad_attribute(self):
         tmpl = {'HeatTemplateFormatVersion': '2012-12-12',
                 'Resources': {
@@ -14,6 +14,8 @@
 import six
 
 from heat.common import template_format
+from heat.engine import environment
+from heat.engine import rsrc_defn
 from heat.engine import stack
 from heat.engine import template
 from heat.tests import common
@@ -239,3 +241,99 @@ class DepAttrsTest(common.HeatTestCase):
             self.assertEqual(self.expected[res.name],
                              self.stack.get_dep_attrs(resources, outputs,
                                                       res.name))
+
+    def test_dep_attrs_index(self):
+        parsed_tmpl = template_format.parse(self.tmpl)
+        self.stack = stack.Stack(self.ctx, 'test_stack',
+                                 template.Template(parsed_tmpl))
+
+        for res in six.itervalues(self.stack):
+            self.assertEqual(self.expected[res.name],
+                             self.stack.dep_attrs(res.name))
+
+
+class DepAttrsIndexTest(common.HeatTestCase):
+
+    def setUp(self):
+        super(DepAttrsIndexTest, self).setUp()
+        self.ctx = utils.dummy_context()
+
+    def test_dep_attrs_cached(self):
+        tmpl = template.Template(template_format.parse(tmpl5))
+        self.stack = stack.Stack(self.ctx, 'test_stack', tmpl)
+        self.assertEqual(3, len(self.stack.resources))
+        res_defns = self.patchobject(tmpl, 'resource_definitions',
+                                     wraps=tmpl.resource_definitions)
+
+        self.assertEqual({'attr_A1', 'attr_A2', 'meta_A1', 'attr_A3',
+                          'attr_A4'}, self.stack.dep_attrs('AResource'))
+        self.assertEqual({'attr_B1', 'attr_B2', 'meta_B2', 'attr_B3'},
+                         self.stack.dep_attrs('BResource'))
+        self.assertEqual(set(), self.stack.dep_attrs('CResource'))
+        self.assertEqual(1, res_defns.call_count)
+
+        # the index is shared by the stacks loaded with the template
+        index = tmpl.dep_attrs_index
+        other_stack = stack.Stack(self.ctx, 'test_stack', tmpl)
+        self.assertEqual(set(), other_stack.dep_attrs('CResource'))
+        self.assertIs(index, tmpl.dep_attrs_index)
+
+    def test_dep_attrs_shared_indexes(self):
+        tmpl = template.Template(template_format.parse(tmpl5))
+        tmpl.store(self.ctx)
+        indexes = {}
+        self.stack = stack.Stack(self.ctx, 'test_stack', tmpl)
+        self.stack.dep_attrs_indexes = indexes
+        self.assertEqual({'attr_B1', 'attr_B2', 'meta_B2', 'attr_B3'},
+                         self.stack.dep_attrs('BResource'))
+        self.assertEqual([tmpl.id], list(indexes))
+        self.assertIs(tmpl.dep_attrs_index, indexes[tmpl.id])
+
+        # another stack with its own copy of the template uses the index
+        other_tmpl = template.Template(template_format.parse(tmpl5),
+                                       template_id=tmpl.id)
+        other_stack = stack.Stack(self.ctx, 'test_stack', other_tmpl)
+        other_stack.dep_attrs_indexes = indexes
+        res_defns = self.patchobject(other_tmpl, 'resource_definitions')
+        self.assertEqual({'attr_B1', 'attr_B2', 'meta_B2', 'attr_B3'},
+                         other_stack.dep_attrs('BResource'))
+        self.assertFalse(res_defns.called)
+
+    def test_dep_attrs_resource_changed(self):
+        tmpl = template.Template(template_format.parse(tmpl5))
+        self.stack = stack.Stack(self.ctx, 'test_stack', tmpl)
+        self.assertEqual(set(), self.stack.dep_attrs('CResource'))
+
+        defn = rsrc_defn.ResourceDefinition(
+            'DResource', 'ResourceWithPropsType',
+            properties={'Foo': {'get_attr': ['CResource', 'attr_C1']}})
+        tmpl.add_resource(defn)
+        self.assertEqual({'attr_C1'}, self.stack.dep_attrs('CResource'))
+
+        tmpl.remove_resource('DResource')
+        self.assertEqual(set(), self.stack.dep_attrs('CResource'))
+
+    def test_dep_attrs_env_changed(self):
+        tmpl = template.Template(template_format.parse(tmpl5))
+        self.stack = stack.Stack(self.ctx, 'test_stack', tmpl)
+        self.stack.dep_attrs('CResource')
+        self.assertIsNotNone(tmpl.dep_attrs_index)
+
+        tmpl.env = environment.Environment({})
+        self.assertIsNone(tmpl.dep_attrs_index)
+
+    def test_dep_attrs_cfn(self):
+        tmpl = template.Template({
+            'HeatTemplateFormatVersion': '2012-12-12',
+            'Resources': {
+                'AResource': {'Type': 'ResourceWithPropsType'},
+                'BResource': {
+                    'Type': 'ResourceWithPropsType',
+                    'Properties': {
+                        'Foo': {'Fn::GetAtt': ['AResource', 'attr_A1']}}}},
+            'Outputs': {
+                'out1': {'Value': {'Fn::GetAtt': ['AResource', 'out_A1']}}}})
+        self.stack = stack.Stack(self.ctx, 'test_stack', tmpl)
+        self.assertEqual({'attr_A1', 'out_A1'},
+                         self.stack.dep_attrs('AResource'))
+        self.assertEqual(set(), self.stack.dep_attrs('BResource'))
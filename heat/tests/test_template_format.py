@@ -147,6 +147,122 @@ Outputs: {}
         self.assertEqual(expected, template_format.parse(tmpl_str))
 
 
+class ParseCacheTest(common.HeatTestCase):
+
+    tmpl_str = '''
+heat_template_version: 2015-10-15
+resources:
+  server:
+    type: OS::Nova::Server
+    properties:
+      networks: [{network: private}]
+'''
+
+    def setUp(self):
+        super(ParseCacheTest, self).setUp()
+        template_format.clear_parse_cache()
+        self.addCleanup(template_format.clear_parse_cache)
+
+    def test_parse_cached(self):
+        with mock.patch.object(template_format, 'simple_parse',
+                               wraps=template_format.simple_parse) as sp:
+            tpl1 = template_format.parse(self.tmpl_str)
+            tpl2 = template_format.parse(self.tmpl_str)
+        self.assertEqual(1, sp.call_count)
+        self.assertEqual(tpl1, tpl2)
+        self.assertEqual((1, 1, 64, 1), template_format.parse_cache_info())
+
+    def test_parse_cached_copy(self):
+        tpl1 = template_format.parse(self.tmpl_str)
+        tpl1['resources']['server']['properties']['networks'].append('foo')
+        tpl1['resources']['other'] = {}
+
+        tpl2 = template_format.parse(self.tmpl_str)
+        self.assertEqual([{'network': 'private'}],
+                         tpl2['resources']['server']['properties'][
+                             'networks'])
+        self.assertNotIn('other', tpl2['resources'])
+        self.assertIsNot(tpl1, tpl2)
+
+    def test_parse_cache_lru(self):
+        config.cfg.CONF.set_override('template_parse_cache_size', 2)
+        tmpls = ['heat_template_version: 2015-10-15\ndescription: %d' % i
+                 for i in range(3)]
+        template_format.parse(tmpls[0])
+        template_format.parse(tmpls[1])
+        template_format.parse(tmpls[0])
+        template_format.parse(tmpls[2])
+        self.assertEqual((1, 3, 2, 2), template_format.parse_cache_info())
+
+        # the least recently used template was evicted
+        template_format.parse(tmpls[0])
+        template_format.parse(tmpls[1])
+        self.assertEqual((2, 4, 2, 2), template_format.parse_cache_info())
+
+    def test_parse_cache_disabled(self):
+        config.cfg.CONF.set_override('template_parse_cache_size', 0)
+        template_format.parse(self.tmpl_str)
+        template_format.parse(self.tmpl_str)
+        self.assertEqual((0, 0, 0, 0), template_format.parse_cache_info())
+
+    def test_parse_errors_not_cached(self):
+        for i in range(2):
+            self.assertRaises(ValueError, template_format.parse,
+                              'description: no version')
+        self.assertEqual((0, 2, 64, 0), template_format.parse_cache_info())
+
+    def test_parse_cache_size_limit_checked(self):
+        template_format.parse(self.tmpl_str)
+        config.cfg.CONF.set_override('max_template_size', 10)
+        self.assertRaises(exception.RequestLimitExceeded,
+                          template_format.parse, self.tmpl_str)
+
+
+class SimpleParseTest(common.HeatTestCase):
+
+    invalid_yaml = 'heat_template_version: 2015-10-15\n  foo: bar: baz\n'
+
+    def test_json_parsed_as_json(self):
+        tmpl_str = ' {"heat_template_version": "2015-10-15"}'
+        with mock.patch.object(yaml, 'load') as yaml_load:
+            tpl = template_format.simple_parse(tmpl_str)
+        self.assertEqual({'heat_template_version': '2015-10-15'}, tpl)
+        self.assertFalse(yaml_load.called)
+
+    def test_yaml_not_parsed_as_json(self):
+        tmpl_str = 'heat_template_version: 2015-10-15'
+        with mock.patch.object(template_format.jsonutils, 'loads') as loads:
+            tpl = template_format.simple_parse(tmpl_str)
+        self.assertEqual({'heat_template_version': '2015-10-15'}, tpl)
+        self.assertFalse(loads.called)
+
+    def test_flow_yaml(self):
+        tmpl_str = '{heat_template_version: 2015-10-15}'
+        self.assertEqual({'heat_template_version': '2015-10-15'},
+                         template_format.simple_parse(tmpl_str))
+
+    def test_yaml_error_snippet(self):
+        with mock.patch.object(yaml, 'load', wraps=yaml.load) as yaml_load:
+            err = self.assertRaises(ValueError, template_format.simple_parse,
+                                    self.invalid_yaml)
+        self.assertEqual(1, yaml_load.call_count)
+        self.assertIn('line 2, column 6:\n', six.text_type(err))
+        self.assertIn('\n      foo: bar: baz\n', six.text_type(err))
+
+    def test_yaml_error_debug(self):
+        if template_format.yaml_loader is yaml.SafeLoader:
+            self.skipTest('The C YAML loader is not available')
+        self.patchobject(template_format.LOG, 'isEnabledFor',
+                         return_value=True)
+        with mock.patch.object(yaml, 'load', wraps=yaml.load) as yaml_load:
+            err = self.assertRaises(ValueError, template_format.simple_parse,
+                                    self.invalid_yaml)
+        self.assertEqual(2, yaml_load.call_count)
+        self.assertEqual(yaml.SafeLoader,
+                         yaml_load.call_args[1]['Loader'])
+        self.assertIn('\n      foo: bar: baz\n', six.text_type(err))
+
+
 class YamlParseExceptions(common.HeatTestCase):
 
     scenarios = [